@@ -2,9 +2,32 @@ import gradio as gr
 import os
 import json, re
 import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from dotenv import load_dotenv
-from crew import HaileiCrew
+
+# Before the utils imports: they create loggers at import time, and logging reads
+# its HAILEI_LOG_* settings once, when the first logger is created.
+load_dotenv()
+
 from models.models import CoordinatorState, CourseRequest
+from utils.intent_parser import COURSE_LEVELS, apply_edit, parse_edit
+from utils.log import fields, get_logger, recent_logs
+from utils.design_ledger import DesignLedger
+from utils.memory_budget import (
+    MemoryBudget, SessionUsage, deep_sizeof, process_rss_mb, spill, start_tracing, top_allocators, unspill, usage_rows,
+)
+from utils.design_events import RUN_FAILED, DesignEvent, ProgressFeed, design_event_sink, render_progress
+from utils.rate_limiter import limiter_metrics
+from utils.run_budget import run_metrics
+from utils.async_tools import warm_tool_processes
+from utils.session_store import SessionStore
+from utils.speculation import Speculator, speculation_stats
+from utils.tail_latency import deadline_metrics, hedge_metrics
+from utils.single_flight import SingleFlight, flight_key
+from utils.settings import env_flag, env_float, env_int, env_str
 
 # Set UTF-8 encoding for stdout/stderr to handle emojis in CrewAI logs
 if sys.platform == 'win32':
@@ -14,15 +37,189 @@ if sys.platform == 'win32':
 # ------------------------------------------
 # Setup
 # ------------------------------------------
-load_dotenv()
-hailei_crew = HaileiCrew()
-coordinator_state = CoordinatorState()
+start_tracing()  # only with HAILEI_TRACEMALLOC=1
+session_store = SessionStore(env_str("HAILEI_SESSION_DB", "data/hailei_sessions.db"))
+sessions = {}  # session_id -> CoordinatorState (in-process cache over session_store)
+CHAT_PAGE_SIZE = env_int("HAILEI_CHAT_PAGE_SIZE", 20)  # messages rendered per chat page
+kickoffs = SingleFlight()  # coalesces duplicate submits/approvals while one is running
+_session_locks = {}
+_session_locks_guard = threading.Lock()
+coordinator_turns = {"local": 0, "llm": 0}  # chat turns answered by the local edit parser vs the LLM
+design_feeds = {}  # session_id -> ProgressFeed of the latest design run
+_design_feeds_guard = threading.Lock()
+design_ledgers = {}  # session_id -> DesignLedger: task outputs of the last design, for incremental re-runs
+session_seen = {}  # session_id -> monotonic time of the last request, for idle eviction
+memory_budget = MemoryBudget()
+SPILL_DIR = env_str("HAILEI_SPILL_DIR", "data/spill")  # design ledgers of evicted sessions
+speculator = Speculator()  # instructional planning started before approval (HAILEI_SPECULATIVE_PLANNING)
+
+log = get_logger("app")
+
+_hailei_crew = None
+_hailei_crew_lock = threading.Lock()
+
+
+def get_crew():
+    """Build the HaileiCrew on first use; importing crewai/litellm dominates cold start."""
+    global _hailei_crew
+    with _hailei_crew_lock:
+        if _hailei_crew is None:
+            from crew import HaileiCrew
+            _hailei_crew = HaileiCrew()
+    return _hailei_crew
+
+
+def get_session(session_id):
+    """Return the CoordinatorState for a session, resuming it from the store if needed."""
+    if not session_id:
+        return None
+    coordinator_state = sessions.get(session_id)
+    if coordinator_state is None:
+        coordinator_state = session_store.load_state(session_id)
+        if coordinator_state is None:
+            return None  # unknown IDs leave no bookkeeping behind
+        sessions[session_id] = coordinator_state
+    session_seen[session_id] = time.monotonic()
+    return coordinator_state
+
+
+def design_ledger(session_id):
+    """The session's design ledger, reloaded from disk if the session was evicted."""
+    ledger = design_ledgers.get(session_id)
+    if ledger is None:
+        ledger = unspill(SPILL_DIR, session_id, "ledger") or DesignLedger()
+        design_ledgers[session_id] = ledger
+    return ledger
+
+
+def session_lock(session_id):
+    """Serialize turns within one session; different sessions run concurrently."""
+    with _session_locks_guard:
+        return _session_locks.setdefault(session_id, threading.Lock())
+
+
+@contextmanager
+def locked_session(session_id):
+    """Hold the session's lock and yield its current state.
+
+    A state fetched before the lock may have been evicted in between; editing it
+    would be lost, so the state is looked up again under the lock. Eviction
+    also drops the lock itself, so a caller that waited on a dropped lock
+    retries with the session's new one.
+    """
+    while True:
+        lock = session_lock(session_id)
+        with lock:
+            with _session_locks_guard:
+                current = _session_locks.get(session_id) is lock
+            if current:
+                yield get_session(session_id)
+                return
+
+
+def chat_window(coordinator_state, start=None):
+    """Render messages[start:] for the chatbot; defaults to the most recent page."""
+    total = len(coordinator_state.conversation_history)
+    if start is None:
+        start = max(0, total - CHAT_PAGE_SIZE)
+    history = [(m.role, m.content) for m in coordinator_state.conversation_history[start:]]
+    return history, start
+
+
+# ------------------------------------------
+# Memory: per-session footprint, budgets and eviction
+# ------------------------------------------
+def session_usage():
+    """Estimated footprint of every in-memory session (state, design ledger, progress feed)."""
+    now = time.monotonic()
+    usage = []
+    for session_id in list(sessions):
+        feed = design_feeds.get(session_id)
+        busy = session_lock(session_id).locked() or (feed is not None and not feed.closed)
+        owned = (sessions.get(session_id), design_ledgers.get(session_id), feed)
+        usage.append(SessionUsage(session_id, deep_sizeof(owned), now - session_seen.get(session_id, now), busy))
+    return usage
+
+
+def evict_session(session_id, reason):
+    """Drop a session from memory; its state is in the session store and its ledger is spilled to disk."""
+    lock = session_lock(session_id)
+    if not lock.acquire(blocking=False):
+        return False
+    try:
+        with _design_feeds_guard:
+            feed = design_feeds.get(session_id)
+            if feed is not None and not feed.closed:
+                return False
+            design_feeds.pop(session_id, None)
+        ledger = design_ledgers.pop(session_id, None)
+        if ledger is not None and ledger.runs:
+            spill(SPILL_DIR, session_id, "ledger", ledger)
+        sessions.pop(session_id, None)
+        session_seen.pop(session_id, None)
+        speculator.forget(session_id)
+        session_store.forget(session_id)
+        with _session_locks_guard:
+            _session_locks.pop(session_id, None)
+    finally:
+        lock.release()
+    memory_budget.evictions[reason] += 1
+    log.info("Evicted session from memory", extra=fields(session=session_id, reason=reason))
+    return True
+
+
+def enforce_memory_budget():
+    """Evict idle and over-budget sessions; returns how many were evicted."""
+    plan = memory_budget.plan(session_usage())
+    return sum(evict_session(session_id, reason) for session_id, reason in plan.items())
+
+
+def memory_watchdog():
+    interval = env_float("HAILEI_MEMORY_CHECK_SECONDS", 60.0)
+    while True:
+        time.sleep(interval)
+        try:
+            enforce_memory_budget()
+        except Exception:
+            log.exception("Memory budget check failed")
+
+
+def session_banner(session_id):
+    return f"🔖 Session ID: `{session_id}` — use it to resume this conversation later."
 
 # ------------------------------------------
 # Step 1: Form submission → Coordinator kickoff
 # ------------------------------------------
-def run_coordinator_agent(course_title, description, credits, duration_weeks, level, expectations):
-    """Validate input and start Coordinator Agent conversation."""
+def run_coordinator_agent(course_title, description, credits, duration_weeks, level, expectations,
+                          lms_platforms=None, request: gr.Request = None):
+    """Validate input and start Coordinator Agent conversation in a new session.
+
+    ``lms_platforms`` (comma-separated, primary first; empty: HAILEI_LMS_PLATFORMS)
+    are the LMSs the course will be designed for.
+
+    Identical submissions from the same browser session that arrive while one is
+    running (double-clicks, client retries) share its result instead of starting
+    another session; other educators submitting the same form get their own.
+    """
+    key = flight_key(
+        "submit", getattr(request, "session_hash", None),
+        course_title, description, credits, duration_weeks, level, expectations, lms_platforms,
+    )
+    return kickoffs.do(
+        key,
+        lambda: _run_coordinator_agent(
+            course_title, description, credits, duration_weeks, level, expectations, lms_platforms
+        ),
+    )
+
+
+def parse_platforms(text):
+    """LMS names from a comma-separated field, primary first, without duplicates."""
+    return list(dict.fromkeys(name.strip() for name in (text or "").split(",") if name.strip()))
+
+
+def _run_coordinator_agent(course_title, description, credits, duration_weeks, level, expectations,
+                           lms_platforms=None):
     errors = []
 
     # --- Validation ---
@@ -46,6 +243,10 @@ def run_coordinator_agent(course_title, description, credits, duration_weeks, le
             gr.update(visible=False),
             gr.update(visible=True),
             gr.update(visible=False),
+            None,
+            0,
+            "",
+            gr.update(visible=False),
         )
 
     # --- Build CourseRequest ---
@@ -58,12 +259,19 @@ def run_coordinator_agent(course_title, description, credits, duration_weeks, le
         "course_expectations": expectations.strip(),
     }
 
-    coordinator_state.reset()
+    session_id = uuid.uuid4().hex
+    coordinator_state = CoordinatorState()
+    sessions[session_id] = coordinator_state
+    session_seen[session_id] = time.monotonic()
     coordinator_state.course_request = CourseRequest(**course_request_data)
-    print("[DEBUG] Initial course_request:", coordinator_state.course_request.dict())
+    coordinator_state.lms_platforms = parse_platforms(lms_platforms)
+    log.info("Course request submitted", extra=fields(
+        session=session_id, lms_platforms=coordinator_state.lms_platforms,
+        **request_summary(coordinator_state.course_request),
+    ))
 
     # --- Kick off Coordinator ---
-    response = hailei_crew.kickoff_coordination(coordinator_state)
+    response = get_crew().kickoff_coordination(coordinator_state)
     raw_reply = getattr(response, "raw_output", str(response))
 
     # --- Extract JSON updates (if any) ---
@@ -72,17 +280,19 @@ def run_coordinator_agent(course_title, description, credits, duration_weeks, le
         try:
             updates = json.loads(json_match.group(1))
             coordinator_state.course_request = coordinator_state.course_request.copy(update=updates)
-            print("[DEBUG] Updated CourseRequest:", coordinator_state.course_request.dict())
+            log.debug("Coordinator updated the course request", extra=fields(session=session_id, updated=sorted(updates)))
             display_reply = raw_reply.replace(json_match.group(0), "").strip()
         except Exception as e:
-            print("[WARN] Could not parse JSON:", e)
+            log.warning("Could not parse coordinator JSON", extra=fields(session=session_id, error=str(e)))
             display_reply = raw_reply
     else:
         display_reply = raw_reply
 
     # --- Initialize chat history ---
     coordinator_state.add_assistant_message(display_reply)
-    history = [("assistant", display_reply)]
+    session_store.save(session_id, coordinator_state)
+    speculate_planning(session_id, coordinator_state)
+    history, chat_start = chat_window(coordinator_state)
 
     # Hide form, show chat + approve button
     return (
@@ -93,21 +303,72 @@ def run_coordinator_agent(course_title, description, credits, duration_weeks, le
         gr.update(visible=True),   # show send_btn
         gr.update(visible=False),  # hide form
         gr.update(visible=True),   # show approve button
+        session_id,
+        chat_start,
+        session_banner(session_id),
+        gr.update(visible=True),   # show load_older_btn
     )
 
 # ------------------------------------------
 # Step 2: Continue conversation
 # ------------------------------------------
-def coordinator_chat(message, history):
-    """Continue Coordinator conversation after form submission."""
-    global coordinator_state
+def coordinator_chat(message, session_id):
+    """Continue Coordinator conversation after form submission.
+
+    Only the most recent page of the conversation is sent back to the chat view.
+    A duplicate of a message that is still being answered joins that turn.
+    Direct field edits ("make it 12 weeks") are applied locally without an LLM call.
+    """
+    coordinator_state = get_session(session_id)
+    if coordinator_state is None or not coordinator_state.course_request:
+        return "", [("assistant", "⚠️ Please submit the form first.")], 0
+
+    key = flight_key("chat", session_id, message, coordinator_state.course_request.model_dump())
+    return kickoffs.do(key, lambda: _coordinator_chat(message, session_id))
+
+
+def _coordinator_chat(message, session_id):
+    with locked_session(session_id) as coordinator_state:
+        return _coordinator_turn(message, session_id, coordinator_state)
 
-    if not coordinator_state.course_request:
-        history.append(("assistant", "⚠️ Please submit the form first."))
-        return "", history
+
+def _coordinator_turn(message, session_id, coordinator_state):
 
     coordinator_state.add_user_message(message)
-    response = hailei_crew.kickoff_coordination(coordinator_state)
+
+    # --- Fast path: direct field edits are applied locally, without the LLM ---
+    edit = parse_edit(message) if env_flag("HAILEI_LOCAL_EDITS", True) else None
+    if edit is not None:
+        updated, display_reply = apply_edit(coordinator_state.course_request, edit)
+        if updated is not None:
+            coordinator_state.course_request = updated
+            log.debug("Applied a local field edit", extra=fields(session=session_id, field=edit.field))
+        coordinator_turns["local"] += 1
+    else:
+        coordinator_turns["llm"] += 1
+        display_reply = _coordinator_llm_reply(coordinator_state)
+
+    coordinator_state.add_assistant_message(display_reply)
+    session_store.save(session_id, coordinator_state)
+    speculate_planning(session_id, coordinator_state)
+    history, chat_start = chat_window(coordinator_state)
+    return "", history, chat_start
+
+
+def speculate_planning(session_id, coordinator_state):
+    """Start instructional planning in the background once the request stops changing between turns."""
+    if not env_flag("HAILEI_SPECULATIVE_PLANNING") or coordinator_state.approved:
+        return
+    request_key = flight_key(coordinator_state.course_request.model_dump())
+    if not speculator.observe(session_id, request_key):
+        return
+    speculation = get_crew().planning_speculation(coordinator_state, design_ledger(session_id))
+    if speculation is not None:
+        key, run = speculation
+        speculator.start(session_id, request_key, "instructional_planning_task", key, run)
+
+def _coordinator_llm_reply(coordinator_state):
+    response = get_crew().kickoff_coordination(coordinator_state)
     raw_reply = getattr(response, "raw_output", str(response))
 
     # --- Split Markdown vs JSON ---
@@ -116,33 +377,181 @@ def coordinator_chat(message, history):
         try:
             updates = json.loads(json_match.group(1))
             coordinator_state.course_request = coordinator_state.course_request.copy(update=updates)
-            print("[DEBUG] Updated course_request:", coordinator_state.course_request.dict())
-            display_reply = raw_reply.replace(json_match.group(0), "").strip()
+            log.debug("Coordinator updated the course request", extra=fields(updated=sorted(updates)))
+            return raw_reply.replace(json_match.group(0), "").strip()
         except Exception as e:
-            print("[WARN] Could not parse JSON:", e)
-            display_reply = raw_reply
-    else:
-        display_reply = raw_reply
-
-    coordinator_state.add_assistant_message(display_reply)
-    history.append(("user", message))
-    history.append(("assistant", display_reply))
-    return "", history
+            log.warning("Could not parse coordinator JSON", extra=fields(error=str(e)))
+    return raw_reply
 
 # ------------------------------------------
 # Step 3: Approve button → trigger IPDAi
 # ------------------------------------------
-def approve_course_design(history):
-    """Triggered when user clicks Approve button."""
-    history.append(("assistant", "✅ Approved! Delegating your finalized course request to IPDAi for instructional design..."))
+def approve_course_design(session_id):
+    """Triggered when user clicks Approve button.
+
+    Streams the chat while the design run is in progress: each task's section
+    appears as soon as that task finishes, and the final summary replaces the
+    progress message. Repeated approvals while the run is in progress follow
+    that run instead of starting a second pipeline.
+    """
+    coordinator_state = get_session(session_id)
+    if coordinator_state is None or not coordinator_state.course_request:
+        yield [("assistant", "⚠️ Please submit the form first.")], 0
+        return
 
+    feed = design_feed(session_id, coordinator_state)
+    # The run re-reads the state under the session lock; render that object, in case
+    # the one read above was evicted before the run started.
+    def current():
+        return get_session(session_id) or coordinator_state
+
+    events = []
+    history, chat_start = chat_window(current())
+    yield history + [("assistant", render_progress(events))], chat_start
+    for events in feed.follow():
+        history, chat_start = chat_window(current())
+        yield history + [("assistant", render_progress(events))], chat_start
+
+    history, chat_start = chat_window(current())
+    if any(event.kind == RUN_FAILED for event in events):
+        history = history + [("assistant", render_progress(events))]
+    yield history, chat_start
+
+
+def design_feed(session_id, coordinator_state):
+    """Return the progress feed of the session's running design, starting the run if there is none."""
+    with _design_feeds_guard:
+        feed = design_feeds.get(session_id)
+        if feed is not None and not feed.closed:
+            return feed
+        feed = design_feeds[session_id] = ProgressFeed()
+
+    key = flight_key("approve", session_id, coordinator_state.course_request.model_dump())
+
+    def run():
+        try:
+            with design_event_sink(feed.publish):
+                kickoffs.do(key, lambda: _approve_course_design(session_id))
+        except Exception as e:
+            log.exception("Design run failed", extra=fields(session=session_id))
+            feed.publish(DesignEvent(RUN_FAILED, message=f"Design run failed: {e}"))
+        finally:
+            feed.close()
+
+    threading.Thread(target=run, name=f"hailei-design-{session_id}", daemon=True).start()
+    return feed
+
+
+def _approve_course_design(session_id):
+    with locked_session(session_id) as coordinator_state:
+        return _design_turn(session_id, coordinator_state)
+
+
+def _design_turn(session_id, coordinator_state):
+    coordinator_state.add_assistant_message("✅ Approved! Delegating your finalized course request to IPDAi for instructional design...")
     coordinator_state.approved = True
-    design_response = hailei_crew.kickoff_design_phase(coordinator_state)
-    design_reply = getattr(design_response, "raw_output", str(design_response))
+    session_store.save(session_id, coordinator_state)
+    ledger = design_ledger(session_id)
+    design_reply = get_crew().kickoff_design_phase(
+        coordinator_state, ledger=ledger, speculation=speculator.take(session_id)
+    )
 
     coordinator_state.add_assistant_message(design_reply)
-    history.append(("assistant", design_reply))
-    return history
+    session_store.save(session_id, coordinator_state)
+    return chat_window(coordinator_state)
+
+# ------------------------------------------
+# Sessions: resume by ID and page in older turns
+# ------------------------------------------
+def resume_session(session_id):
+    """Restore a saved session by ID and show its most recent messages."""
+    session_id = (session_id or "").strip()
+    coordinator_state = get_session(session_id)
+    if coordinator_state is None:
+        return (
+            "⚠️ No saved session found for that ID.",
+            None,
+            gr.update(visible=False),
+            gr.update(visible=False),
+            gr.update(visible=False),
+            gr.update(visible=True),
+            gr.update(visible=False),
+            None,
+            0,
+            "",
+            gr.update(visible=False),
+        )
+
+    history, chat_start = chat_window(coordinator_state)
+    return (
+        "",
+        history,
+        gr.update(visible=True),
+        gr.update(visible=True),
+        gr.update(visible=True),
+        gr.update(visible=False),
+        gr.update(visible=not coordinator_state.approved),
+        session_id,
+        chat_start,
+        session_banner(session_id),
+        gr.update(visible=True),
+    )
+
+
+def load_older_messages(session_id, chat_start):
+    """Extend the chat view by one page of older messages."""
+    coordinator_state = get_session(session_id)
+    if coordinator_state is None:
+        return [], 0
+    return chat_window(coordinator_state, max(0, (chat_start or 0) - CHAT_PAGE_SIZE))
+
+
+def request_summary(course_request):
+    """Short, log-friendly view of a CourseRequest (free-text fields are reported by length)."""
+    return {
+        "title": course_request.course_title,
+        "course_level": course_request.course_level,
+        "weeks": course_request.course_duration_weeks,
+        "credits": course_request.course_credits,
+        "description_chars": len(course_request.course_description or ""),
+        "expectations_chars": len(course_request.course_expectations or ""),
+    }
+
+
+def llm_metrics():
+    """Limiter queues, hedging costs/savings, task deadline misses, local chat turns, speculation and
+    recent design runs (budget, tool calls, context tokens) for the operations API."""
+    return {
+        "limiters": limiter_metrics(),
+        "hedging": hedge_metrics(),
+        "task_deadlines": deadline_metrics(),
+        "coordinator_turns": dict(coordinator_turns),
+        "speculation": speculation_stats(),
+        "design_runs": run_metrics(),
+    }
+
+
+def memory_report(limit=20):
+    """Process RSS, per-session footprints, evictions and top allocators, for the operations API."""
+    usage = session_usage()
+    return {
+        "rss_mb": process_rss_mb(),
+        "sessions_in_memory": len(usage),
+        "sessions_kb": round(sum(row.bytes for row in usage) / 1024, 1),
+        "largest_sessions": usage_rows(usage, int(limit or 20)),
+        "budgets_mb": {
+            "per_session": memory_budget.session_budget / 2 ** 20,
+            "total": memory_budget.total_budget / 2 ** 20,
+        },
+        "idle_eviction_s": memory_budget.idle_seconds,
+        "evictions": dict(memory_budget.evictions),
+        "allocations": top_allocators(int(limit or 20)),
+    }
+
+
+def logs_tail(limit=200, level="DEBUG", component=""):
+    """Most recent structured log records from the in-memory ring buffer, for the operations API."""
+    return recent_logs(int(limit or 200), level or "DEBUG", component or "")
 
 # ------------------------------------------
 # Build Gradio UI
@@ -167,29 +576,35 @@ with gr.Blocks(title="🎓 HAILEI 3.0 - Coordinator Agent") as demo:
         with gr.Row():
             course_level = gr.Dropdown(
                 label="Course Level",
-                choices=[
-                    "Undergraduate - Introductory",
-                    "Undergraduate - Advanced",
-                    "Graduate - Introductory",
-                    "Graduate - Advanced",
-                    "Professional Certificate",
-                ],
+                choices=COURSE_LEVELS,
                 value="Undergraduate - Introductory"
             )
             course_expectations = gr.Textbox(label="Course Expectations", lines=2)
+            lms_platforms = gr.Textbox(
+                label="LMS Platforms (comma-separated, primary first)",
+                value=env_str("HAILEI_LMS_PLATFORMS", "Canvas"),
+            )
 
         submit_btn = gr.Button("🚀 Submit to Coordinator")
+        with gr.Row():
+            resume_id = gr.Textbox(label="Resume a saved session", placeholder="Session ID")
+            resume_btn = gr.Button("↩️ Resume Session")
         validation_msg = gr.Markdown()
 
+    session_id = gr.State(None)
+    chat_start = gr.State(0)
+    session_info = gr.Markdown()
+
     # ---------- CHAT ----------
     gr.Markdown("### 💬 Coordinator Chat Mode")
+    load_older_btn = gr.Button("⬆️ Load older messages", size="sm", visible=False)
     chatbot = gr.Chatbot(label="🧩 Coordinator Conversation", height=450, visible=False)
     user_input = gr.Textbox(placeholder="Ask or clarify details...", show_label=False, visible=False)
     send_btn = gr.Button("💬 Send Message", visible=False)
     approve_btn = gr.Button("✅ Approve & Generate Course Design", visible=False)
 
     # ---------- Interactions ----------
-    send_btn.click(coordinator_chat, inputs=[user_input, chatbot], outputs=[user_input, chatbot])
+    send_btn.click(coordinator_chat, inputs=[user_input, session_id], outputs=[user_input, chatbot, chat_start])
 
     submit_btn.click(
         run_coordinator_agent,
@@ -200,6 +615,7 @@ with gr.Blocks(title="🎓 HAILEI 3.0 - Coordinator Agent") as demo:
             course_duration_weeks,
             course_level,
             course_expectations,
+            lms_platforms,
         ],
         outputs=[
             validation_msg,
@@ -209,9 +625,57 @@ with gr.Blocks(title="🎓 HAILEI 3.0 - Coordinator Agent") as demo:
             send_btn,
             form_section,
             approve_btn,
+            session_id,
+            chat_start,
+            session_info,
+            load_older_btn,
         ],
     )
 
-    approve_btn.click(approve_course_design, inputs=[chatbot], outputs=[chatbot])
+    resume_btn.click(
+        resume_session,
+        inputs=[resume_id],
+        outputs=[
+            validation_msg,
+            chatbot,
+            chatbot,
+            user_input,
+            send_btn,
+            form_section,
+            approve_btn,
+            session_id,
+            chat_start,
+            session_info,
+            load_older_btn,
+        ],
+    )
+
+    load_older_btn.click(load_older_messages, inputs=[session_id, chat_start], outputs=[chatbot, chat_start])
+
+    approve_btn.click(approve_course_design, inputs=[session_id], outputs=[chatbot, chat_start])
+
+    # ---------- Operations API (not shown in the UI) ----------
+    metrics_btn = gr.Button(visible=False)
+    metrics_out = gr.JSON(visible=False)
+    metrics_btn.click(llm_metrics, outputs=[metrics_out], api_name="llm_metrics")
+    memory_limit = gr.Number(value=20, precision=0, visible=False)
+    memory_btn = gr.Button(visible=False)
+    memory_out = gr.JSON(visible=False)
+    memory_btn.click(memory_report, inputs=[memory_limit], outputs=[memory_out], api_name="memory_report")
+    logs_limit = gr.Number(value=200, precision=0, visible=False)
+    logs_level = gr.Textbox(value="DEBUG", visible=False)
+    logs_component = gr.Textbox(value="", visible=False)
+    logs_btn = gr.Button(visible=False)
+    logs_out = gr.JSON(visible=False)
+    logs_btn.click(logs_tail, inputs=[logs_limit, logs_level, logs_component], outputs=[logs_out],
+                   api_name="recent_logs")
 
-demo.launch()
+if __name__ == "__main__":
+    # Warm the crew in the background so the UI is up immediately.
+    threading.Thread(target=get_crew, name="crew-warmup", daemon=True).start()
+    threading.Thread(target=warm_tool_processes, name="tool-pool-warmup", daemon=True).start()  # HAILEI_TOOL_POOL=process
+    threading.Thread(target=memory_watchdog, name="memory-watchdog", daemon=True).start()
+    # Let events run concurrently so sessions don't queue behind each other and
+    # duplicate clicks reach the single-flight guard while the first is running.
+    demo.queue(default_concurrency_limit=env_int("HAILEI_UI_CONCURRENCY", 16))
+    demo.launch()
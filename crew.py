@@ -1,9 +1,34 @@
+import contextvars
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, task
 from frameworks import KDKA_FRAMEWORK, PRRR_FRAMEWORK, EXAMPLE_COURSE_DESIGN_SUMMARY
 from tools.blooms_taxonomy_tool import blooms_taxonomy_tool
 from tools.accessibility_checker_tool import accessibility_checker_tool
 from tools.resource_search_tool import resource_search_tool
+from utils.alignment_graph import alignment_report
+from utils.async_tools import design_tools
+from utils.config_cache import load_yaml_snapshot
+from utils.design_archive import DesignArchive, warm_start_inputs, warm_start_week
+from utils.context_projection import context_report_scope, projected_inputs
+from utils.content_fanout import fallback_week, merge_course_content, week_inputs, week_plans
+from utils.link_checker import LinkCache, LinkChecker, design_urls, link_report
+from utils.design_ledger import DesignLedger, current_ledger, design_ledger_scope, input_hash
+from utils.design_events import TASK_FAILED, TASK_FINISHED, TASK_STARTED, WEEK_FINISHED, emit
+from utils.design_summary import NOT_AVAILABLE, render_course_design_summary
+from utils.log import fields, get_logger, verbose
+from utils.remediation import failing_checks, remediation_brief, tasks_to_recheck
+from utils.rate_limiter import INTERACTIVE, llm_priority, rate_limited
+from utils.run_budget import (
+    COMPACT_CONTEXT, EXHAUSTED, SKIP_OPTIONAL, BudgetExceeded, RunBudget, budgeted, current_budget, degraded,
+    record_run, run_budget_scope,
+)
+from utils.tail_latency import DeadlineExceeded, call_with_deadline, hedged
+from utils.speculation import claim, speculating, speculation_scope
+from utils.tool_cache import tool_run_scope
+from utils.settings import env_flag, env_float, env_int, env_str
 
 from models.models import (
     CoordinatorState,
@@ -13,8 +38,65 @@ from models.models import (
     CourseTechnicalDesign,
     CourseContentReview,
     CourseSearchReport,
+    CourseOutcomes,
+    LMSIntegration,
+    WeeklyModule,
 )
 
+# Repeated tool calls with the same arguments are answered from a per-run cache;
+# async callers run tools off the event loop, CPU-bound analyses optionally in a process pool.
+design_tools()
+
+log = get_logger("crew")
+
+# Design tasks in pipeline order, mapped to the input key under which their
+# output is handed to the descriptions of downstream tasks.
+DESIGN_TASKS = {
+    "instructional_planning_task": "course_foundation",
+    "content_authoring_task": "course_content",
+    "technical_design_task": "technical_design",
+    "content_review_task": "content_review",
+    "ethical_audit_task": "ethical_audit",
+    "searchai_task": "search_report",
+}
+
+
+_design_archive = None
+
+
+def lms_platforms_setting() -> List[str]:
+    """LMS platforms to design for, from HAILEI_LMS_PLATFORMS (comma-separated, primary first)."""
+    platforms = [name.strip() for name in env_str("HAILEI_LMS_PLATFORMS", "Canvas").split(",") if name.strip()]
+    return list(dict.fromkeys(platforms)) or ["Canvas"]
+
+
+_link_checker = None
+
+
+def link_checker() -> LinkChecker:
+    """Shared checker for resource URLs, with its on-disk result cache."""
+    global _link_checker
+    if _link_checker is None:
+        _link_checker = LinkChecker(LinkCache(env_str("HAILEI_LINK_CACHE", "data/hailei_links.db")))
+    return _link_checker
+
+
+def design_archive() -> DesignArchive:
+    """The local archive of completed designs, opened on first use."""
+    global _design_archive
+    if _design_archive is None:
+        _design_archive = DesignArchive(env_str("HAILEI_DESIGN_ARCHIVE", "data/hailei_designs.db"))
+    return _design_archive
+
+
+def limited(agent: Agent) -> Agent:
+    """Route the agent's LLM calls through the shared per-model rate limiter, hedging slow ones.
+
+    Calls are also charged to the design run's budget, if any (utils/run_budget.py).
+    """
+    budgeted(hedged(rate_limited(agent.llm)))
+    return agent
+
 
 # ---------------------
 # Define HAILEI Crew
@@ -29,70 +111,70 @@ class HaileiCrew():
     # ---------- AGENTS ----------
     @agent
     def coordinator_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['hailei4t_coordinator_agent'],
-            verbose=True,
-        )
+            verbose=verbose("crew.agents"),
+        ))
 
     @agent
     def ipdai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['ipdai_agent'],
-            verbose=True,
+            verbose=verbose("crew.agents"),
             tools=[blooms_taxonomy_tool],
             
-        )
+        ))
 
     @agent
     def cauthai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['cauthai_agent'],
-            verbose=True,
-        )
+            verbose=verbose("crew.agents"),
+        ))
 
     @agent
     def tfdai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['tfdai_agent'],
-            verbose=True,
-        )
+            verbose=verbose("crew.agents"),
+        ))
 
     @agent
     def editorai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['editorai_agent'],
-            verbose=True,
+            verbose=verbose("crew.agents"),
             tools=[accessibility_checker_tool],
-        )
+        ))
 
     @agent
     def ethosai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['ethosai_agent'],
-            verbose=True,
-        )
+            verbose=verbose("crew.agents"),
+        ))
 
     @agent
     def searchai_agent(self) -> Agent:
-        return Agent(
+        return limited(Agent(
             config=self.agents_config['searchai_agent'],
-            verbose=True,
+            verbose=verbose("crew.agents"),
             tools=[resource_search_tool],
-        )
+        ))
 
     # ---------- TASKS ----------
     @task
     def coordination_task(self) -> Task:
         return Task(
             config=self.tasks_config['coordination_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
         )
 
     @task
     def instructional_planning_task(self) -> Task:
         return Task(
             config=self.tasks_config['instructional_planning_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseFoundation,
         )
     
@@ -100,21 +182,46 @@ class HaileiCrew():
     def content_authoring_task(self) -> Task:
         return Task(
             config=self.tasks_config['content_authoring_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
+            output_pydantic=CourseContent,
+        )
+
+    @task
+    def course_outcomes_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['course_outcomes_task'],
+            verbose=verbose("crew.tasks"),
+            output_pydantic=CourseOutcomes,
+        )
+
+    @task
+    def weekly_module_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['weekly_module_task'],
+            verbose=verbose("crew.tasks"),
+            output_pydantic=WeeklyModule,
+        )
+
+    @task
+    def content_revision_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['content_revision_task'],
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseContent,
         )
+
     @task
     def technical_design_task(self) -> Task:
         return Task(
             config=self.tasks_config['technical_design_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseTechnicalDesign,
         )
     @task
     def content_review_task(self) -> Task:
         return Task(
             config=self.tasks_config['content_review_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseContentReview,
         )
 
@@ -122,7 +229,7 @@ class HaileiCrew():
     def ethical_audit_task(self) -> Task:
         return Task(
             config=self.tasks_config['ethical_audit_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseAuditReport,
         )
     
@@ -130,7 +237,7 @@ class HaileiCrew():
     def searchai_task(self) -> Task:
         return Task(
             config=self.tasks_config['searchai_task'],
-            verbose=True,
+            verbose=verbose("crew.tasks"),
             output_pydantic=CourseSearchReport,
         )
 
@@ -141,106 +248,482 @@ class HaileiCrew():
     #         verbose=True,
     #     )
 
-    # add this alongside other @task defs
-    @task
-    def design_summary_task(self) -> Task:
-        return Task(
-            config=self.tasks_config['design_summary_task'],
-            verbose=True
-        )
-
-
-
 
     # ==================================================
     # PHASE 1: Coordinator Crew (before approval)
     # ==================================================
-    @crew
+    def task_copy(self, task_name: str) -> Task:
+        """A private copy of a task and its agent, safe to kick off alongside other sessions.
+
+        CrewBase memoizes the ``@task``/``@agent`` methods, so every caller would
+        otherwise share one Task and Agent: kicking them off concurrently collides
+        on the agent executor and interpolates one session's inputs into another's
+        prompt. The copies keep the agent's wrapped (rate-limited, hedged) LLM.
+        """
+        task = getattr(self, task_name)()
+        return task.copy(agents=[task.agent.copy()], task_mapping={})
+
     def coordination_crew(self) -> Crew:
-        """Crew responsible for course request refinement only."""
+        """Crew responsible for course request refinement only.
+
+        Built fresh for every turn: CrewAI's ``@crew`` decorator would memoize the
+        Crew, and with it the agent executor, across sessions.
+        """
+        task = self.task_copy("coordination_task")
         return Crew(
-            agents=[self.coordinator_agent()],
-            tasks=[self.coordination_task()],
+            agents=[task.agent],
+            tasks=[task],
             # process=Process.hierarchical,
             # manager_agent=self.coordinator_agent(),
-            verbose=True,
+            verbose=verbose("crew.crews"),
             memory=True,
         )
 
     # ==================================================
-    # PHASE 2: Design Crew (after approval)
+    # PHASE 2: Design Pipeline (after approval)
     # ==================================================
-    @crew
-    def design_crew(self) -> Crew:
-        """Crew responsible for completing the course design after approval."""
+    def design_task_crew(self, task_name: str) -> Crew:
+        """Single-task crew used to run one design task of the pipeline.
+
+        The crew runs a copy of the task and agent (see task_copy), so crews for the
+        same task can run in parallel threads and sessions without sharing mutable state.
+        """
+        task = self.task_copy(task_name)
         return Crew(
-            agents=[
-                self.ipdai_agent(),
-                self.cauthai_agent(),
-                self.tfdai_agent(),
-                self.editorai_agent(),
-                self.ethosai_agent(),
-                self.searchai_agent(),
-            
-            ],
-            tasks=[
-                self.instructional_planning_task(),
-                self.content_authoring_task(),
-                self.technical_design_task(),
-                self.content_review_task(),
-                self.ethical_audit_task(),
-                self.searchai_task(),
-                # self.design_orchestration_task(),
-                self.design_summary_task(),
-            ],
-            process=Process.hierarchical,
-            manager_agent=self.coordinator_agent(),
-            verbose=True,
-            memory=True,
+            agents=[task.agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=verbose("crew.crews"),
         )
 
     # ==================================================
     # Kickoff Methods
     # ==================================================
     def kickoff_coordination(self, coordinator_state: CoordinatorState):
-        """Run the Coordinator refinement phase."""
+        """Run the Coordinator refinement phase.
+
+        Coordinator turns are interactive, so their LLM calls are queued ahead of
+        batch design tasks by the shared rate limiter.
+        """
+        with llm_priority(INTERACTIVE):
+            return self.coordination_crew().kickoff(inputs=self.coordination_inputs(coordinator_state))
+
+    @staticmethod
+    def coordination_inputs(coordinator_state: CoordinatorState) -> dict:
+        """Inputs of a coordinator turn."""
+        course_request = coordinator_state.course_request
+        return {
+            "course_request": course_request.dict(),
+            "course_title": course_request.course_title,
+            "course_description": course_request.course_description,
+            "course_credits": course_request.course_credits,
+            "course_duration_weeks": course_request.course_duration_weeks,
+            "course_level": course_request.course_level,
+            "course_expectations": course_request.course_expectations,
+            "conversation_history": coordinator_state.formatted_history(),
+            "last_user_message": coordinator_state.last_user_message,
+            "kdka_framework": KDKA_FRAMEWORK,
+            "prrr_framework": PRRR_FRAMEWORK,
+            "approved": coordinator_state.approved,
+            "example_course_design_summary": EXAMPLE_COURSE_DESIGN_SUMMARY,
+        }
+
+    def design_inputs(self, coordinator_state: CoordinatorState, lms_platform: str, warm_start=None) -> dict:
+        """Task inputs of a design run for the current course request."""
         course_request = coordinator_state.course_request
-        return self.coordination_crew().kickoff(
-            inputs={
-                "course_request": course_request.dict(),
-                "course_title": course_request.course_title,
-                "course_description": course_request.course_description,
-                "course_credits": course_request.course_credits,
-                "course_duration_weeks": course_request.course_duration_weeks,
-                "course_level": course_request.course_level,
-                "course_expectations": course_request.course_expectations,
-                "conversation_history": coordinator_state.formatted_history(),
-                "last_user_message": coordinator_state.last_user_message,
-                "kdka_framework": KDKA_FRAMEWORK,
-                "prrr_framework": PRRR_FRAMEWORK,
-                "approved": coordinator_state.approved,
-                "example_course_design_summary": EXAMPLE_COURSE_DESIGN_SUMMARY,
-            }
+        inputs = {
+            "course_request": course_request.dict(),
+            "course_title": course_request.course_title,
+            "course_description": course_request.course_description,
+            "course_credits": course_request.course_credits,
+            "course_duration_weeks": course_request.course_duration_weeks,
+            "course_level": course_request.course_level,
+            "course_expectations": course_request.course_expectations,
+            "conversation_history": coordinator_state.formatted_history(),
+            "last_user_message": coordinator_state.last_user_message,
+            "kdka_framework": KDKA_FRAMEWORK,
+            "prrr_framework": PRRR_FRAMEWORK,
+            "lms_platform": lms_platform,
+            "approved": coordinator_state.approved,
+            "alignment_gaps": alignment_report(None),
+        }
+        inputs.update(warm_start_inputs(warm_start))
+        return inputs
+
+    @staticmethod
+    def select_warm_start(course_request, ledger: Optional[DesignLedger] = None):
+        """The closest previously designed course, offered to the agents as a draft to adapt."""
+        if ledger is not None and ledger.runs:
+            return ledger.warm_start  # a new match would change every task's inputs
+        if not env_flag("HAILEI_WARM_START", True):
+            return None
+        warm_start = design_archive().find_similar(
+            course_request, threshold=env_float("HAILEI_WARM_START_THRESHOLD", 0.6)
         )
+        if warm_start is not None:
+            log.info("Warm start from a previous design", extra=fields(
+                course_title=warm_start.course_title, similarity=round(warm_start.similarity, 2)
+            ))
+        return warm_start
+
+    def planning_speculation(self, coordinator_state: CoordinatorState, ledger: Optional[DesignLedger] = None):
+        """``(input hash, runner)`` of instructional_planning_task for the current request, to start before approval.
+
+        Returns None when the ledger already holds the output for these inputs.
+        """
+        task_name = "instructional_planning_task"
+        warm_start = self.select_warm_start(coordinator_state.course_request, ledger)
+        platforms = coordinator_state.lms_platforms or lms_platforms_setting()
+        inputs = self.design_inputs(coordinator_state, platforms[0], warm_start)
+        task_inputs = self.task_inputs(task_name, inputs, {})
+        key = self.task_hash(task_name, task_inputs)
+        if ledger is not None and ledger.has(key):
+            return None
+        return key, lambda: self.kickoff_task(task_name, task_inputs)
+
+    def kickoff_design_phase(
+        self,
+        coordinator_state: CoordinatorState,
+        ledger: Optional[DesignLedger] = None,
+        lms_platforms: Optional[List[str]] = None,
+        speculation=None,
+    ) -> str:
+        """Run the instructional design phase after approval.
+
+        Tasks run in a fixed order, each in its own single-task crew, so no manager
+        LLM is involved. After the review and audit, CAuthAi is re-engaged in code
+        only if a compliance flag failed. When a similar course was designed before,
+        its foundation and content are handed to the agents as warm-start drafts;
+        every completed design is archived for later runs. Returns the educator-facing HAILEI Course
+        Design Summary, rendered locally from the typed task outputs.
 
-    def kickoff_design_phase(self, coordinator_state: CoordinatorState):
-        """Run the instructional design phase after approval."""
+        With the course's ``ledger`` of a previous run, only tasks whose inputs
+        changed since then are recomputed; the rest replay their recorded outputs.
+
+        The run is held to a token/cost budget (HAILEI_RUN_TOKEN_BUDGET,
+        HAILEI_RUN_COST_BUDGET_USD): as it runs low, calls move to smaller models,
+        context is compacted and optional work is skipped before the run stops early.
+
+        ``lms_platforms`` (default: the session's ``lms_platforms``, else
+        HAILEI_LMS_PLATFORMS, "Canvas") lists the LMSs to design for; the first one
+        is the primary platform reviewed downstream. The LMSIntegration of each
+        platform designed is stored in ``coordinator_state.lms_integrations``.
+
+        A ``speculation`` started during the chat (utils/speculation.py) stands in
+        for its task if that task's inputs are still the same.
+        """
         course_request = coordinator_state.course_request
-        return self.design_crew().kickoff(
-            inputs={
-                "course_request": course_request.dict(),
-                "course_title": course_request.course_title,
-                "course_description": course_request.course_description,
-                "course_credits": course_request.course_credits,
-                "course_duration_weeks": course_request.course_duration_weeks,
-                "course_level": course_request.course_level,
-                "course_expectations": course_request.course_expectations,
-                "conversation_history": coordinator_state.formatted_history(),
-                "last_user_message": coordinator_state.last_user_message,
-                "kdka_framework": KDKA_FRAMEWORK,
-                "prrr_framework": PRRR_FRAMEWORK,
-                "lms_platform": "Canvas", # can be changed to Edx, Moodle, etc.
-                "approved": coordinator_state.approved,
-                "example_course_design_summary": EXAMPLE_COURSE_DESIGN_SUMMARY,
-            }
+        platforms = lms_platforms or coordinator_state.lms_platforms or lms_platforms_setting()
+        warm_start = self.select_warm_start(course_request, ledger)
+        if ledger is not None:
+            ledger.warm_start = warm_start
+        inputs = self.design_inputs(coordinator_state, platforms[0], warm_start)
+
+        outputs = {}
+        lms_designs = {}
+        lms_integrations = {}
+        budget = RunBudget()
+        with tool_run_scope() as tool_cache, context_report_scope() as context_report, \
+                design_ledger_scope(ledger), run_budget_scope(budget), speculation_scope(speculation):
+            for task_name in DESIGN_TASKS:
+                budget.note_task(task_name)
+                if budget.at_least(EXHAUSTED):
+                    self.skip_design_task(task_name, inputs, outputs, budget, "the run's budget is used up")
+                    continue
+                if self.tasks_config[task_name].get("optional") and budget.at_least(SKIP_OPTIONAL):
+                    self.skip_design_task(task_name, inputs, outputs, budget, "optional; the run's budget is running low")
+                    continue
+                if task_name == "content_authoring_task" and env_flag("HAILEI_CONTENT_FANOUT"):
+                    self.author_content_fanout(course_request, inputs, outputs, warm_start)
+                elif task_name == "technical_design_task" and len(platforms) > 1 and not budget.at_least(SKIP_OPTIONAL):
+                    lms_integrations = self.design_for_platforms(platforms, inputs, outputs, lms_designs)
+                else:
+                    if task_name == "technical_design_task" and len(platforms) > 1:
+                        budget.skip(f"technical_design_task for {', '.join(platforms[1:])}")
+                    self.run_design_task(task_name, inputs, outputs)
+                if task_name == "ethical_audit_task":
+                    self.remediate_content(inputs, outputs)
+        budget_stats = budget.stats()
+        log.info("Run budget", extra=fields(budget_stats=budget_stats))
+        tool_stats = tool_cache.stats()
+        log.info("Tool calls this run", extra=fields(tool_stats=tool_stats))
+        context_stats = context_report.rows()
+        log.info("Context tokens per task (before -> after pruning)", extra=fields(context_stats=context_stats))
+        ledger_stats = ledger.stats() if ledger is not None else None
+        if ledger_stats is not None:
+            log.info("Incremental design run", extra=fields(**ledger_stats))
+        record_run(course_title=course_request.course_title, budget=budget_stats, tool_calls=tool_stats,
+                   context_tokens=context_stats)
+
+        technical_design = outputs.get("technical_design_task")
+        if not lms_integrations and technical_design is not None:
+            lms_integrations = {platforms[0]: technical_design.lms}
+        coordinator_state.lms_integrations = lms_integrations
+
+        foundation = outputs.get("instructional_planning_task")
+        content = outputs.get("content_authoring_task")
+        link_status = None
+        if env_flag("HAILEI_CHECK_LINKS", True):
+            try:  # advisory: a failing check must not cost the design the run has already paid for
+                link_status = link_checker().check(design_urls(content, outputs.get("searchai_task")))
+            except Exception:
+                log.exception("Resource link check failed; the summary is rendered without link status")
+            else:
+                report = link_report(link_status)
+                log.info("Checked resource links", extra=fields(checked=report["checked"], broken=report["broken"]))
+        if (foundation is not None or content is not None) and (ledger_stats is None or ledger_stats["recomputed"]):
+            design_archive().add(course_request, foundation, content)
+
+        summary = render_course_design_summary(
+            course_request=course_request,
+            foundation=foundation,
+            content=content,
+            technical_design=technical_design,
+            review=outputs.get("content_review_task"),
+            audit=outputs.get("ethical_audit_task"),
+            search=outputs.get("searchai_task"),
+            polish=env_flag("HAILEI_POLISH_OVERVIEW"),
+            lms_designs=lms_designs,
+            link_status=link_status,
+        )
+        if warm_start is not None:
+            summary += (
+                f"\n\n_Adapted from a previous design, \"{warm_start.course_title}\" "
+                f"({warm_start.similarity:.0%} similar request)._\n"
+            )
+        if budget_stats["skipped"]:
+            summary += (
+                f"\n\n_This run ran low on its token/cost budget; skipped to stay within it: "
+                f"{', '.join(budget_stats['skipped'])}._\n"
+            )
+        if ledger_stats is not None and ledger_stats["reused"]:
+            reused = len(ledger_stats["reused"])
+            summary += (
+                f"\n\n_Updated incrementally: {reused} of {reused + len(ledger_stats['recomputed'])} "
+                f"task outputs were unaffected by your changes and kept from the previous design._\n"
+            )
+        if tool_stats:
+            hit_rates = ", ".join(
+                f"{name} {stats['hits']}/{stats['calls']} ({stats['hit_rate']:.0%})" for name, stats in tool_stats.items()
+            )
+            summary += f"\n\n_Tool calls answered from this run's cache: {hit_rates}._\n"
+        return summary
+
+    def task_inputs(self, task_name: str, inputs: dict, outputs: dict) -> dict:
+        """Inputs of one design task, with upstream artifacts pruned to its ``context_projection``."""
+        artifacts = {DESIGN_TASKS[name]: artifact for name, artifact in outputs.items() if name in DESIGN_TASKS}
+        task_inputs = projected_inputs(
+            task_name, self.tasks_config[task_name].get("context_projection"), inputs, artifacts
         )
+        if degraded(COMPACT_CONTEXT):
+            task_inputs.update(warm_start_inputs(None))  # drafts are the largest optional context
+        return task_inputs
+
+    def run_design_task(self, task_name: str, inputs: dict, outputs: dict, output_name: str = None):
+        """Run one design task, store its typed output and publish it to downstream inputs.
+
+        Upstream artifacts are pruned to the fields the task declares in its
+        ``context_projection`` (config/tasks.yaml) before prompting.
+
+        ``output_name`` lets a task stand in for another one (e.g. a content
+        revision replaces the content_authoring_task output).
+        """
+        output_name = output_name or task_name
+        task_inputs = self.task_inputs(task_name, inputs, outputs)
+        emit(TASK_STARTED, task_name)
+        try:
+            result = self.kickoff_task(task_name, task_inputs)
+        except (DeadlineExceeded, BudgetExceeded) as e:
+            log.warning("Task did not complete", extra=fields(task=task_name, error=str(e)))
+            emit(TASK_FAILED, task_name, message=str(e), output_name=output_name)
+            if output_name != task_name:
+                return outputs.get(output_name)  # keep the output this task would have replaced
+            self.publish_output(output_name, None, inputs, outputs, raw=NOT_AVAILABLE)
+            return None
+        artifact = getattr(result, "pydantic", None)
+        self.publish_output(output_name, artifact, inputs, outputs, raw=getattr(result, "raw", str(result)))
+        emit(TASK_FINISHED, task_name, artifact, output_name=output_name)
+        return artifact
+
+    def skip_design_task(self, task_name: str, inputs: dict, outputs: dict, budget: RunBudget, reason: str):
+        """Leave a task's output unavailable without running it, and record why."""
+        log.warning("Task skipped", extra=fields(task=task_name, reason=reason))
+        budget.skip(task_name)
+        emit(TASK_FAILED, task_name, message=f"Skipped: {reason}")
+        self.publish_output(task_name, None, inputs, outputs, raw=NOT_AVAILABLE)
+
+    def design_for_platforms(
+        self, platforms: List[str], inputs: dict, outputs: dict, designs: Optional[dict] = None
+    ) -> Dict[str, LMSIntegration]:
+        """Run technical_design_task once per LMS platform, in parallel, on the same upstream outputs.
+
+        The primary (first) platform's design is published as the technical_design_task
+        output for the downstream review; all designs are stored in ``designs``.
+        Returns the LMSIntegration of each platform whose design completed.
+        """
+        task_name = "technical_design_task"
+        designs = {} if designs is None else designs
+        task_inputs = self.task_inputs(task_name, inputs, outputs)
+        emit(TASK_STARTED, task_name)
+
+        def design_platform(platform: str):
+            try:
+                result = self.kickoff_task(task_name, {**task_inputs, "lms_platform": platform})
+            except (DeadlineExceeded, BudgetExceeded) as e:
+                log.warning("Task did not complete", extra=fields(task=task_name, platform=platform, error=str(e)))
+                return None, NOT_AVAILABLE
+            artifact = getattr(result, "pydantic", None)
+            if artifact is not None and artifact.lms.lms_platform != platform:
+                artifact = artifact.model_copy(update={"lms": artifact.lms.model_copy(update={"lms_platform": platform})})
+            return artifact, getattr(result, "raw", str(result))
+
+        workers = min(len(platforms), env_int("HAILEI_LMS_WORKERS", 4))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {platform: pool.submit(contextvars.copy_context().run, design_platform, platform) for platform in platforms}
+            results = {platform: future.result() for platform, future in futures.items()}
+
+        designs.update({platform: artifact for platform, (artifact, _) in results.items() if artifact is not None})
+        primary, raw = results[platforms[0]]
+        self.publish_output(task_name, primary, inputs, outputs, raw=raw)
+        emit(TASK_FINISHED, task_name, primary)
+        return {platform: design.lms for platform, design in designs.items()}
+
+    def kickoff_task(self, task_name: str, inputs: dict):
+        """Kick off a single-task crew within the task's ``deadline_seconds`` from tasks.yaml.
+
+        Inside a design_ledger_scope(), a task whose templates and referenced
+        inputs hash the same as in the previous run replays its recorded output;
+        inside a speculation_scope(), a task started speculatively on the same
+        inputs hands over its result.
+        """
+        task_config = self.tasks_config[task_name]
+        ledger = current_ledger()
+        key = self.task_hash(task_name, inputs) if ledger is not None or speculating() else None
+        if ledger is not None:
+            record = ledger.lookup(task_name, key)
+            if record is not None:
+                log.debug("Replayed task output from the previous run", extra=fields(task=task_name))
+                return record
+
+        result = claim(task_name, key)
+        if result is None:
+            result = call_with_deadline(
+                task_name,
+                lambda: self.design_task_crew(task_name).kickoff(inputs=inputs),
+                task_config.get("deadline_seconds"),
+            )
+        if ledger is not None and getattr(result, "pydantic", None) is not None:
+            ledger.record(task_name, key, result.pydantic, getattr(result, "raw", str(result)))
+        return result
+
+    def task_hash(self, task_name: str, inputs: dict) -> str:
+        return input_hash(task_name, self.tasks_config[task_name], self.agent_templates(task_name), inputs)
+
+    def agent_templates(self, task_name: str) -> dict:
+        """Role, goal and backstory templates and model of the agent assigned to ``task_name``."""
+        agent = self.tasks_config[task_name].get("agent")
+        if isinstance(agent, str):  # not wired to an Agent by CrewBase
+            return self.agents_config.get(agent, {})
+        return {
+            "role": getattr(agent, "_original_role", None) or agent.role,
+            "goal": getattr(agent, "_original_goal", None) or agent.goal,
+            "backstory": getattr(agent, "_original_backstory", None) or agent.backstory,
+            "llm": getattr(agent.llm, "model", None),
+        }
+
+    @staticmethod
+    def publish_output(output_name: str, artifact, inputs: dict, outputs: dict, raw: str = ""):
+        """Store a design artifact and expose it to downstream task descriptions.
+
+        Course content also publishes its alignment gaps (utils/alignment_graph.py),
+        computed locally for EditorAi.
+        """
+        outputs[output_name] = artifact
+        inputs[DESIGN_TASKS[output_name]] = artifact.model_dump_json(indent=2) if artifact is not None else raw
+        if output_name == "content_authoring_task":
+            inputs["alignment_gaps"] = alignment_report(artifact)
+
+    def author_content_fanout(self, course_request, inputs: dict, outputs: dict, warm_start=None):
+        """Author CourseContent as course-level outcomes plus one parallel task per week.
+
+        Weeks run with bounded concurrency (HAILEI_CONTENT_FANOUT_WORKERS), so
+        latency follows the slowest week instead of the sum of all weeks, and one
+        failing week is retried on its own instead of failing the whole course.
+        """
+        emit(TASK_STARTED, "content_authoring_task")
+        foundation = outputs.get("instructional_planning_task")
+        try:
+            outcomes = getattr(self.kickoff_task("course_outcomes_task", inputs), "pydantic", None)
+        except (DeadlineExceeded, BudgetExceeded) as e:
+            log.warning("Task did not complete", extra=fields(task="course_outcomes_task", error=str(e)))
+            outcomes = None
+
+        if degraded(COMPACT_CONTEXT):
+            warm_start = None
+        plans = week_plans(foundation, course_request.course_duration_weeks)
+        workers = max(1, min(env_int("HAILEI_CONTENT_FANOUT_WORKERS", 4), len(plans)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each week runs in a copy of this context so it shares the run's tool cache.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    self.author_week, plan, inputs, outcomes, warm_start_week(warm_start, plan["week_number"]),
+                )
+                for plan in plans
+            ]
+            modules = [future.result() for future in futures]
+
+        content = merge_course_content(course_request, foundation, outcomes, modules)
+        self.publish_output("content_authoring_task", content, inputs, outputs)
+        emit(TASK_FINISHED, "content_authoring_task", content)
+        return content
+
+    def author_week(self, plan: dict, inputs: dict, outcomes, draft: str, attempts: int = 2) -> WeeklyModule:
+        """Author one WeeklyModule in its own crew, retrying just this week on failure."""
+        for attempt in range(1, attempts + 1):
+            try:
+                result = self.kickoff_task("weekly_module_task", week_inputs(inputs, plan, outcomes, draft))
+                module = getattr(result, "pydantic", None)
+                if module is not None:
+                    module = module.model_copy(update={"week_number": plan["week_number"]})
+                    emit(WEEK_FINISHED, "weekly_module_task", module)
+                    return module
+            except Exception as e:
+                log.warning("Week authoring attempt failed", extra=fields(
+                    week=plan["week_number"], attempt=attempt, error=str(e)
+                ))
+        log.warning("Using the foundation plan for a week", extra=fields(week=plan["week_number"]))
+        module = fallback_week(plan)
+        emit(WEEK_FINISHED, "weekly_module_task", module)
+        return module
+
+    def remediate_content(self, inputs: dict, outputs: dict):
+        """Re-engage CAuthAi only for failing compliance checks, up to a bounded number of revisions."""
+        max_revisions = env_int("HAILEI_MAX_CONTENT_REVISIONS", 2)
+        for revision in range(1, max_revisions + 1):
+            review = outputs.get("content_review_task")
+            audit = outputs.get("ethical_audit_task")
+            failing = failing_checks(review, audit)
+            if not failing:
+                return
+            if degraded(SKIP_OPTIONAL):
+                log.warning("Content revision skipped to stay within the run's budget", extra=fields(failing=failing))
+                current_budget().skip("content_revision_task")
+                return
+
+            log.info("Content revision for failing checks", extra=fields(
+                revision=revision, max_revisions=max_revisions, failing=failing
+            ))
+            inputs["remediation_findings"] = remediation_brief(failing, review, audit)
+            self.run_design_task("content_revision_task", inputs, outputs, output_name="content_authoring_task")
+            for task_name in tasks_to_recheck(failing):
+                self.run_design_task(task_name, inputs, outputs)
+
+        failing = failing_checks(outputs.get("content_review_task"), outputs.get("ethical_audit_task"))
+        if failing:
+            log.warning("Compliance checks still failing after revisions", extra=fields(failing=failing))
+
+
+# Serve agents.yaml/tasks.yaml from the pre-parsed, mtime-checked snapshot.
+# Assigned after class creation because CrewBase injects its own load_yaml.
+HaileiCrew.load_yaml = staticmethod(load_yaml_snapshot)
@@ -1,7 +1,7 @@
 """Utility module that stores an example HAILEI course design summary template.
 
-This template mirrors the educator-facing summary that the design_summary_task
-should produce after all specialist agents (IPDAi, CAuthAi, TFDAi, EditorAi,
+This template mirrors the educator-facing summary that utils.design_summary
+renders after all specialist agents (IPDAi, CAuthAi, TFDAi, EditorAi,
 EthosAi, SearchAi) have completed their work. It is intended purely as a
 reference/example and is not programmatically consumed elsewhere.
 """
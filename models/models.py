@@ -20,6 +20,8 @@ class CoordinatorState(BaseModel):
     conversation_history: List[Message] = Field(default_factory=list)
     last_user_message: Optional[str] = None
     approved: bool = False
+    lms_platforms: List[str] = Field(default_factory=list, description="LMSs to design for, primary first (empty: HAILEI_LMS_PLATFORMS)")
+    lms_integrations: Dict[str, 'LMSIntegration'] = Field(default_factory=dict, description="LMS integration per platform from the last design run")
 
     def reset(self):
         """Reset state for a new session."""
@@ -27,6 +29,8 @@ class CoordinatorState(BaseModel):
         self.conversation_history = []
         self.last_user_message = None
         self.approved = False
+        self.lms_platforms = []
+        self.lms_integrations = {}
 
     def add_user_message(self, message: str):
         """Record a user message."""
@@ -154,6 +158,14 @@ class CourseContent(BaseModel):
     prrr_overview: Optional[str] = Field(None, description="Global notes on PRRR infusion across the course")
 
 
+class CourseOutcomes(BaseModel):
+    """Course-level outcomes from CAuthAi (course_outcomes_task), authored once before the per-week fan-out."""
+    tlos: List[LearningObjective] = Field(default_factory=list, description="Terminal Learning Objectives for the course")
+    elos_by_tlo: Dict[str, List[LearningObjective]] = Field(default_factory=dict, description="Enabling Learning Objectives keyed by TLO")
+    kdka_overview: Optional[str] = Field(None, description="Global notes on KDKA alignment across the course")
+    prrr_overview: Optional[str] = Field(None, description="Global notes on PRRR infusion across the course")
+
+
 class LMSIntegration(BaseModel):
     """LMS integration details."""
     lms_platform: Optional[str] = None
@@ -10,10 +10,17 @@ if (-not (Test-Path -Path ".\logs")) {
     New-Item -ItemType Directory -Path ".\logs" | Out-Null
 }
 
-$logFile = ".\logs\crewai_logs_$(Get-Date -Format 'yyyy-MM-dd_HH-mm-ss').log"
+$stamp = Get-Date -Format 'yyyy-MM-dd_HH-mm-ss'
+$logFile = ".\logs\crewai_logs_$stamp.log"
+
+# Structured app logs (JSON lines). CrewAI's own agent/task console output is off
+# unless enabled per component, e.g. $env:HAILEI_LOG_LEVELS = "crew.agents=DEBUG,crew.tasks=DEBUG"
+$env:HAILEI_LOG_FILE = ".\logs\hailei_$stamp.jsonl"
+$env:HAILEI_LOG_FORMAT = "json"
 
 Write-Host "Starting app with uv and logging..." -ForegroundColor Green
 Write-Host "Log file: $logFile" -ForegroundColor Yellow
+Write-Host "Structured log: $env:HAILEI_LOG_FILE" -ForegroundColor Yellow
 Write-Host "Encoding set to UTF-8 to handle emojis" -ForegroundColor Cyan
 
 # Run app with uv and capture both stdout and stderr
@@ -0,0 +1,87 @@
+"""Drive the shared LLM rate limiter with a local stub backend.
+
+Starts batch (design) and interactive (coordinator) callers against one
+StubLLM wrapped by utils.rate_limiter and reports per-priority latency and the
+limiter's queue metrics, so limits in config/llm_limits.yaml can be checked
+without calling a provider.
+
+Usage:
+    python scripts/limiter_bench.py [--batch 40] [--interactive 10] [--rpm 120] [--tpm 60000]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.rate_limiter import BATCH, INTERACTIVE, ModelLimiter, estimate_tokens, llm_priority  # noqa: E402
+from utils.stub_llm import StubLLM  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=40, help="Number of batch (design) calls")
+    parser.add_argument("--interactive", type=int, default=10, help="Number of interactive (coordinator) calls")
+    parser.add_argument("--rpm", type=float, default=120)
+    parser.add_argument("--tpm", type=float, default=60000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub LLM latency in seconds")
+    parser.add_argument("--prompt-chars", type=int, default=4000)
+    args = parser.parse_args(argv)
+
+    limiter = ModelLimiter("stub", rpm=args.rpm, tpm=args.tpm,
+                           max_concurrency=args.concurrency, max_queue=args.max_queue)
+    backend = StubLLM(latency=args.latency)
+    prompt = [{"role": "user", "content": "x" * args.prompt_chars}]
+    latencies = {"interactive": [], "batch": []}
+    rejected = {"interactive": 0, "batch": 0}
+    lock = threading.Lock()
+
+    def caller(kind, priority, delay):
+        time.sleep(delay)
+        started = time.perf_counter()
+        try:
+            with llm_priority(priority), limiter.limit(estimate_tokens(prompt) + 500):
+                backend.call(prompt)
+        except Exception:
+            with lock:
+                rejected[kind] += 1
+            return
+        with lock:
+            latencies[kind].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=caller, args=("batch", BATCH, 0.0)) for _ in range(args.batch)]
+    # Interactive turns arrive while the batch backlog is already queued.
+    threads += [threading.Thread(target=caller, args=("interactive", INTERACTIVE, 0.05 + i * 0.02))
+                for i in range(args.interactive)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"{'kind':<12} {'calls':>6} {'rejected':>9} {'p50 s':>7} {'p95 s':>7} {'max s':>7}")
+    for kind, values in latencies.items():
+        print(f"{kind:<12} {len(values):>6} {rejected[kind]:>9} {percentile(values, 50):>7.2f} "
+              f"{percentile(values, 95):>7.2f} {max(values, default=0):>7.2f}")
+    print(f"\nwall time {elapsed:.2f}s, stub calls {backend.calls}, "
+          f"mean batch {statistics.mean(latencies['batch'] or [0]):.2f}s")
+    print("limiter:", limiter.metrics())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
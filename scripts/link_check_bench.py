@@ -0,0 +1,124 @@
+"""Check utils.link_checker against a local HTTP stub server.
+
+Starts a threaded HTTP server on localhost with routes that answer 200, 404,
+redirect, reject HEAD with 405, drop HEAD connections, or respond slowly, then
+validates a course design's worth of URLs on several hosts (127.0.0.1 and
+localhost) in one pass. Prints each verdict, the peak concurrency the server
+saw per host, and the timing of a cold and a cached (on-disk TTL cache) pass.
+
+Usage:
+    python scripts/link_check_bench.py [--links 60] [--per-host 4] [--delay 0.2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.link_checker import LinkCache, LinkChecker  # noqa: E402
+
+EXPECTED = {"ok": True, "missing": False, "moved": True, "nohead": True, "drophead": True, "slow": True}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.2
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _track(self, step):
+        host = self.headers.get("Host", "").split(":")[0]
+        with self.lock:
+            type(self).active[host] = self.active.get(host, 0) + step
+            type(self).peak[host] = max(self.peak.get(host, 0), self.active[host])
+            if step > 0:
+                type(self).requests += 1
+
+    def _answer(self, head):
+        route = self.path.strip("/").split("/")[0]
+        self._track(+1)
+        try:
+            time.sleep(self.delay * (5 if route == "slow" else 1))
+            if route == "drophead" and head:
+                self.connection.close()
+                return
+            if route == "nohead" and head:
+                status = 405
+            elif route == "moved":
+                self.send_response(301)
+                self.send_header("Location", "/ok/redirected")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            else:
+                status = 404 if route == "missing" else 200
+            body = b"" if head else b"stub resource page"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            self._track(-1)
+
+    def do_HEAD(self):
+        self._answer(head=True)
+
+    def do_GET(self):
+        self._answer(head=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=60, help="URLs to check")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument("--delay", type=float, default=0.2, help="Stub server response delay in seconds")
+    args = parser.parse_args(argv)
+
+    StubHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    routes = list(EXPECTED)
+    hosts = ["127.0.0.1", "localhost"]
+    urls = [f"http://{hosts[i % 2]}:{port}/{routes[i % len(routes)]}/{i}" for i in range(args.links)]
+    urls.append("ftp://example.org/not-http")
+
+    cache = LinkCache(os.path.join(tempfile.mkdtemp(prefix="hailei-links-"), "links.db"))
+    # The stub runs on localhost, which the checker refuses by default.
+    checker = LinkChecker(cache, timeout=args.delay * 10, per_host=args.per_host, allow_private=True)
+
+    started = time.perf_counter()
+    results = checker.check(urls)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    checker.check(urls)
+    cached = time.perf_counter() - started
+    server.shutdown()
+
+    wrong = 0
+    for url, status in results.items():
+        route = url.split("/")[3] if url.startswith("http") else None
+        expected = EXPECTED.get(route, False)
+        wrong += status.ok != expected
+        if url.endswith(f"/{len(routes) - 1}") or route is None or status.ok != expected:
+            print(f"{'ok ' if status.ok else 'BAD'} {status.status or '-':>4} {url} {status.error or ''}")
+    print(f"\n{len(results)} links, {wrong} unexpected verdicts, {StubHandler.requests} requests served")
+    print(f"peak concurrency per host: {StubHandler.peak} (limit {args.per_host})")
+    print(f"cold pass {cold:.2f}s, cached pass {cached * 1000:.1f}ms "
+          f"(sequential would take ~{args.links * args.delay:.1f}s)")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Load-test the app's handlers with N simulated educators against a stub LLM.
+
+Each simulated session submits the course form (run_coordinator_agent), chats
+with the coordinator (coordinator_chat: a mix of direct field edits answered
+locally and questions that go to the LLM) and approves the design
+(approve_course_design, streamed to the end). The real handlers, session
+store, single-flight guard, fan-out, summary rendering and CrewAI crews, tasks
+and agent executors run as in production; only the provider is replaced:
+every agent's LLM answers from utils.stub_llm.StubLLM (placeholder typed
+outputs for tasks with an output model), still wrapped by crew.limited(), so
+calls go through the shared rate limiter with the limits config/llm_limits.yaml
+sets for the agent's model.
+
+Handler calls first wait for one of --ui-concurrency slots, like Gradio's
+queue (HAILEI_UI_CONCURRENCY); that wait is reported as queueing delay, the
+limiter's own wait separately. Reports throughput, p50/p95/p99 and error rate
+per handler.
+
+Usage:
+    python scripts/load_test.py [--sessions 20] [--latency 1.0] [--jitter 0.5] [--chat-turns 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+CHAT_MESSAGES = [
+    "make it 10 weeks",
+    "Can you suggest a stronger focus on hands-on projects?",
+    "change the level to Graduate - Introductory",
+    "What assessments would you recommend?",
+    "set credits to 4",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def install_stub_llm(stub):
+    """Give every agent an LLM answered by ``stub``; must run before the crew is built."""
+    import crew
+    from utils.stub_llm import agent_llm
+
+    wrap = crew.limited
+
+    def limited(agent):
+        agent.llm = agent_llm(stub, getattr(agent.llm, "model", "default"))
+        return wrap(agent)
+
+    crew.limited = limited
+
+
+class Recorder:
+    """Latency, queueing delay and errors per handler."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.queued = {}
+        self.errors = {}
+
+    def record(self, handler, seconds, queued, error):
+        with self.lock:
+            self.latency.setdefault(handler, []).append(seconds)
+            self.queued.setdefault(handler, []).append(queued)
+            self.errors[handler] = self.errors.get(handler, 0) + bool(error)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="Simulated educators")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which sessions start")
+    parser.add_argument("--chat-turns", type=int, default=3, help="Coordinator messages per session")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean think time between steps, seconds")
+    parser.add_argument("--latency", type=float, default=1.0, help="Stub LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of stub LLM calls that fail")
+    parser.add_argument("--ui-concurrency", type=int, default=16, help="Concurrent handler calls, like HAILEI_UI_CONCURRENCY")
+    parser.add_argument("--fanout", action="store_true", help="Author content with the per-week fan-out")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="hailei-load-")
+    os.environ["HAILEI_SESSION_DB"] = os.path.join(workdir, "sessions.db")
+    os.environ["HAILEI_DESIGN_ARCHIVE"] = os.path.join(workdir, "designs.db")
+    os.environ["HAILEI_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ.setdefault("HAILEI_LOG_LEVEL", "WARNING")
+    os.environ["HAILEI_HEDGE_LLM_CALLS"] = "0"  # a hedge would call a real provider
+    os.environ["HAILEI_CONTENT_FANOUT"] = "1" if args.fanout else "0"
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-load-test")  # never used: no call reaches a provider
+    from utils.rate_limiter import limiter_metrics
+    from utils.stub_llm import StubLLM
+
+    import app
+
+    llm = StubLLM(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate, seed=args.seed,
+                  reply="Thought: I now know the final answer\nFinal Answer: Hi! Here is my refinement of your course.")
+    install_stub_llm(llm)
+    app.get_crew()  # build the crew before the clock starts, as the app's warm-up thread does
+
+    recorder = Recorder()
+    ui_slots = threading.Semaphore(args.ui_concurrency)
+    rng = random.Random(args.seed)
+    completed = []
+
+    def handler_call(name, fn, failed=lambda result: False):
+        enqueued = time.perf_counter()
+        with ui_slots:
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                result = fn()
+                error = failed(result)
+            except Exception as e:  # counted, the session goes on where it can
+                error = e
+            recorder.record(name, time.perf_counter() - started, started - enqueued, error)
+        return result, error
+
+    def session(index, start_delay, think_times, messages):
+        time.sleep(start_delay)
+        result, error = handler_call("run_coordinator_agent", lambda: app.run_coordinator_agent(
+            f"Load Test Course {index}", "An introduction to the topics covered in this load test.",
+            3, 8, "Undergraduate - Introductory", "Students complete weekly projects.",
+        ))
+        if error:
+            return
+        session_id = result[7]
+        for message, think in zip(messages, think_times):
+            time.sleep(think)
+            handler_call("coordinator_chat", lambda: app.coordinator_chat(message, session_id))
+        time.sleep(think_times[-1])
+
+        def approve():
+            updates = list(app.approve_course_design(session_id))
+            feed = app.design_feeds.get(session_id)
+            return updates, feed
+
+        _, error = handler_call(
+            "approve_course_design", approve,
+            failed=lambda result: any(event.kind == "run_failed" for event in result[1].events),
+        )
+        if not error:
+            completed.append(index)
+
+    plans = [
+        (
+            i,
+            args.ramp * i / max(1, args.sessions),
+            [rng.expovariate(1 / args.think) if args.think > 0 else 0.0 for _ in range(args.chat_turns + 1)],
+            [rng.choice(CHAT_MESSAGES) for _ in range(args.chat_turns)],
+        )
+        for i in range(args.sessions)
+    ]
+    threads = [threading.Thread(target=session, args=plan, name=f"load-session-{plan[0]}") for plan in plans]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    handlers = {}
+    for name, values in recorder.latency.items():
+        queued = recorder.queued[name]
+        handlers[name] = {
+            "calls": len(values),
+            "errors": recorder.errors[name],
+            "error_rate": round(recorder.errors[name] / len(values), 3),
+            "throughput_per_s": round(len(values) / elapsed, 3),
+            "p50_s": round(percentile(values, 50), 3),
+            "p95_s": round(percentile(values, 95), 3),
+            "p99_s": round(percentile(values, 99), 3),
+            "queue_p50_s": round(percentile(queued, 50), 3),
+            "queue_p95_s": round(percentile(queued, 95), 3),
+        }
+    report = {
+        "sessions": args.sessions,
+        "completed_designs": len(completed),
+        "wall_time_s": round(elapsed, 2),
+        "designs_per_min": round(len(completed) / elapsed * 60, 2),
+        "stub_llm_calls": llm.calls,
+        "handlers": handlers,
+        "limiters": limiter_metrics(),
+        "coordinator_turns": dict(app.coordinator_turns),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{'handler':<24} {'calls':>6} {'err%':>6} {'rps':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'queue p50':>10} {'queue p95':>10}")
+    for name, row in handlers.items():
+        print(f"{name:<24} {row['calls']:>6} {row['error_rate']:>6.1%} {row['throughput_per_s']:>7.2f} "
+              f"{row['p50_s']:>7.2f} {row['p95_s']:>7.2f} {row['p99_s']:>7.2f} "
+              f"{row['queue_p50_s']:>10.2f} {row['queue_p95_s']:>10.2f}")
+    print(f"\n{len(completed)}/{args.sessions} designs completed in {elapsed:.1f}s "
+          f"({report['designs_per_min']} designs/min), stub LLM calls {llm.calls}")
+    print("coordinator turns:", report["coordinator_turns"])
+    for model, row in report["limiters"].items():
+        print(f"limiter {model}:", row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Import-time profile of the HAILEI app, checked against a startup budget.
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter, summarizes
+the slowest top-level imports and fails when the total exceeds the budget.
+
+Usage:
+    python scripts/profile_startup.py [--module app] [--budget-ms 6000] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+# Heavy dependencies that must stay out of the startup path.
+LAZY_MODULES = ("crewai", "litellm", "crew")
+
+
+def profile_imports(module: str):
+    """Return (wall_ms, entries) where entries are (self_us, cumulative_us, depth, name)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"Importing {module!r} failed with exit code {proc.returncode}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent), name))
+    return wall_ms, entries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("HAILEI_STARTUP_BUDGET_MS", 6000)),
+                        help="Fail when total import time exceeds this many milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to show")
+    args = parser.parse_args(argv)
+
+    wall_ms, entries = profile_imports(args.module)
+    if not entries:
+        print("No -X importtime output captured.")
+        return 1
+
+    top_depth = min(depth for _, _, depth, _ in entries)
+    top_level = [entry for entry in entries if entry[2] == top_depth]
+    total_ms = sum(cumulative for _, cumulative, _, _ in top_level) / 1000
+    imported = {name.split(".")[0] for _, _, _, name in entries} | {name for _, _, _, name in entries}
+
+    # -X importtime prints children before their parent, so the module's direct
+    # imports are the shallowest entries between the previous top-level line and it.
+    end = max(i for i, entry in enumerate(entries) if entry[2] == top_depth and entry[3] == args.module)
+    start = max([i for i in range(end) if entries[i][2] == top_depth], default=-1) + 1
+    descendants = entries[start:end]
+    child_depth = min((depth for _, _, depth, _ in descendants), default=top_depth)
+    children = [entry for entry in descendants if entry[2] == child_depth] + [entries[end]]
+
+    print(f"Import-time profile for '{args.module}' (direct imports)")
+    print(f"{'cumulative ms':>14}  {'self ms':>9}  module")
+    for self_us, cumulative_us, _, name in sorted(children, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>9.1f}  {name}")
+
+    print()
+    print(f"Total import time: {total_ms:.0f} ms (process wall time {wall_ms:.0f} ms)")
+    print(f"Budget:            {args.budget_ms:.0f} ms")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        print(f"FAIL: modules that should load lazily were imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: startup import time exceeds the budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("OK: startup within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
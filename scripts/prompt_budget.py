@@ -0,0 +1,215 @@
+"""Offline token profile of the agent and task prompts in config/*.yaml, checked against budgets.
+
+Renders every task's description and expected output, and its agent's role,
+goal and backstory, the way CrewAI interpolates them, with representative
+inputs: the KDKA/PRRR frameworks, the example design summary, conversation
+histories of several lengths, and upstream artifacts and warm-start drafts
+sized like a --weeks course. Tokens are counted per section and per inserted
+input with litellm's local tokenizer for the agent's model; the largest
+contributors are listed, and the run fails when a task's largest rendering
+exceeds its budget (``prompt_budget_tokens`` in config/tasks.yaml, else
+--budget). The scaffolding CrewAI adds around the prompt (tool descriptions,
+output format instructions) is not counted.
+
+Usage:
+    python scripts/prompt_budget.py [--weeks 12] [--histories 0,8,40] [--budget 12000] [--top 15] [--json]
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")  # never fetch the price map
+
+PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+AGENT_SECTIONS = ("role", "goal", "backstory")
+TASK_SECTIONS = ("description", "expected_output")
+HISTORY_TURN = (
+    "Could we make the weekly labs more hands-on and add a short reflection at the end of each module? "
+    "I would also like the final project to build on the earlier assignments."
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(model: str, text: str) -> int:
+    from litellm import token_counter
+
+    return token_counter(model=model, text=text) if text else 0
+
+
+def sample_state(weeks: int, turns: int):
+    from models.models import CoordinatorState, CourseRequest
+
+    state = CoordinatorState(course_request=CourseRequest(
+        course_title="Foundations of Applied Machine Learning",
+        course_description="An introduction to supervised and unsupervised learning with hands-on labs, "
+                           "model evaluation and the responsible use of machine learning in practice.",
+        course_credits=3,
+        course_duration_weeks=weeks,
+        course_level="Undergraduate - Intermediate",
+        course_expectations="Students build, evaluate and explain models on real datasets and complete a team project.",
+    ))
+    for turn in range(turns):
+        if turn % 2 == 0:
+            state.add_user_message(HISTORY_TURN)
+        else:
+            state.add_assistant_message(f"Here is the refined course summary with your changes applied. {HISTORY_TURN}")
+    return state
+
+
+def sample_artifacts(crew, weeks: int, items: int, words: int):
+    """Representative typed output of every design task, sized like a ``weeks``-week course."""
+    from models.models import CourseContent, CourseFoundation, WeeklyModule
+    from utils.stub_llm import representative_output
+
+    modules = [representative_output(WeeklyModule, items, words, week_number=week) for week in range(1, weeks + 1)]
+    artifacts = {}
+    for task_name in ("instructional_planning_task", "content_authoring_task", "technical_design_task",
+                      "content_review_task", "ethical_audit_task", "searchai_task", "course_outcomes_task"):
+        model = getattr(crew, task_name)().output_pydantic
+        if model is CourseContent:
+            artifacts[task_name] = representative_output(model, items, words, weekly_modules=modules)
+        elif model is CourseFoundation:
+            foundation = representative_output(model, items, words)
+            artifacts[task_name] = foundation.model_copy(update={"modules": foundation.modules[:1] * weeks})
+        else:
+            artifacts[task_name] = representative_output(model, items, words)
+    return artifacts
+
+
+def task_inputs_by_task(crew, state, artifacts, warm_start: bool):
+    """Inputs each task is prompted with in a design run (or a coordinator turn) for ``state``."""
+    from crew import DESIGN_TASKS, lms_platforms_setting
+    from utils.content_fanout import week_inputs, week_plans
+    from utils.design_archive import SimilarDesign, warm_start_week
+    from utils.remediation import COMPLIANCE_CHECKS, remediation_brief
+
+    foundation = artifacts["instructional_planning_task"]
+    content = artifacts["content_authoring_task"]
+    match = SimilarDesign("sample", "A similar course", 1.0, foundation, content) if warm_start else None
+    inputs = crew.design_inputs(state, lms_platforms_setting()[0], match)
+    outputs = {}
+    for task_name in DESIGN_TASKS:
+        crew.publish_output(task_name, artifacts[task_name], inputs, outputs)
+    review, audit = artifacts["content_review_task"], artifacts["ethical_audit_task"]
+    # Profile the largest revision prompt: every compliance check failing, with all its findings.
+    inputs["remediation_findings"] = remediation_brief(list(COMPLIANCE_CHECKS), review, audit)
+
+    by_task = {}
+    for task_name in crew.tasks_config:
+        if task_name == "coordination_task":
+            by_task[task_name] = crew.coordination_inputs(state)
+        elif task_name == "weekly_module_task":
+            plan = week_plans(foundation, state.course_request.course_duration_weeks)[0]
+            by_task[task_name] = week_inputs(
+                crew.task_inputs(task_name, inputs, outputs), plan, artifacts["course_outcomes_task"],
+                warm_start_week(match, plan["week_number"]),
+            )
+        else:
+            by_task[task_name] = crew.task_inputs(task_name, inputs, outputs)
+    return by_task
+
+
+def profile_prompt(model: str, sections, inputs: dict) -> dict:
+    """Tokens of each rendered section and of each input inserted into it."""
+    from crewai.utilities.string_utils import interpolate_only
+
+    profile = {"total": 0, "sections": {}, "inputs": {}, "missing": []}
+    for section, template in sections:
+        template = str(template or "")
+        try:
+            rendered = interpolate_only(template, inputs)
+        except (KeyError, ValueError) as e:
+            profile["missing"].append(f"{section}: {e}")
+            rendered = template
+        tokens = count_tokens(model, rendered)
+        profile["sections"][section] = tokens
+        profile["total"] += tokens
+        for name in PLACEHOLDER.findall(template):
+            if name in inputs:
+                key = f"{section}:{{{name}}}"
+                profile["inputs"][key] = profile["inputs"].get(key, 0) + count_tokens(model, str(inputs[name]))
+    return profile
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=12, help="Course length the sample artifacts are sized for")
+    parser.add_argument("--histories", default="0,8,40", help="Conversation lengths (messages) to render with")
+    parser.add_argument("--items", type=int, default=3, help="Items per list in the sample artifacts")
+    parser.add_argument("--words", type=int, default=15, help="Words per text field in the sample artifacts")
+    parser.add_argument("--no-warm-start", action="store_true", help="Render without warm-start drafts")
+    parser.add_argument("--budget", type=int, default=int(os.getenv("HAILEI_PROMPT_BUDGET_TOKENS", 12000)),
+                        help="Token budget for tasks without prompt_budget_tokens in config/tasks.yaml")
+    parser.add_argument("--top", type=int, default=15, help="Number of largest inputs to list")
+    parser.add_argument("--json", action="store_true", help="Print the profile as JSON")
+    args = parser.parse_args(argv)
+
+    from crew import HaileiCrew
+
+    crew = HaileiCrew()
+    artifacts = sample_artifacts(crew, args.weeks, args.items, args.words)
+    histories = [int(value) for value in args.histories.split(",")]
+
+    report = {}
+    for turns in histories:
+        state = sample_state(args.weeks, turns)
+        for task_name, inputs in task_inputs_by_task(crew, state, artifacts, not args.no_warm_start).items():
+            task_config = crew.tasks_config[task_name]
+            agent_config = crew.agent_templates(task_name)
+            model = agent_config.get("llm") or "gpt-4o-mini"
+            sections = [(f"agent.{key}", agent_config.get(key)) for key in AGENT_SECTIONS]
+            sections += [(f"task.{key}", task_config.get(key)) for key in TASK_SECTIONS]
+            profile = profile_prompt(model, sections, inputs)
+            worst = report.get(task_name)
+            if worst is None or profile["total"] > worst["total"]:
+                report[task_name] = {
+                    **profile, "model": model, "history_messages": turns,
+                    "budget": task_config.get("prompt_budget_tokens", args.budget),
+                }
+
+    contributors = sorted(
+        ((tokens, task_name, key) for task_name, row in report.items() for key, tokens in row["inputs"].items()),
+        reverse=True,
+    )[:args.top]
+    over = {task_name: row for task_name, row in report.items() if row["total"] > row["budget"]}
+    missing = {task_name: row["missing"] for task_name, row in report.items() if row["missing"]}
+
+    if args.json:
+        print(json.dumps({"tasks": report, "over_budget": sorted(over), "missing_inputs": missing}, indent=2))
+        return 1 if over or missing else 0
+
+    print(f"Prompt tokens per task (largest of histories {args.histories}; {args.weeks}-week course, "
+          f"{'no ' if args.no_warm_start else ''}warm start)")
+    print(f"{'task':<28} {'model':<12} {'agent':>7} {'task':>7} {'total':>7} {'budget':>7}  history")
+    for task_name, row in report.items():
+        agent_tokens = sum(tokens for section, tokens in row["sections"].items() if section.startswith("agent."))
+        flag = "  OVER" if task_name in over else ""
+        print(f"{task_name:<28} {row['model']:<12} {agent_tokens:>7} {row['total'] - agent_tokens:>7} "
+              f"{row['total']:>7} {row['budget']:>7}  {row['history_messages']:>7}{flag}")
+
+    print()
+    print("Largest inserted inputs")
+    print(f"{'tokens':>7}  {'task':<28} section:input")
+    for tokens, task_name, key in contributors:
+        print(f"{tokens:>7}  {task_name:<28} {key}")
+
+    print()
+    for task_name, errors in missing.items():
+        for error in errors:
+            print(f"FAIL: {task_name} cannot be rendered: {error}")
+    for task_name, row in over.items():
+        print(f"FAIL: {task_name} prompt is {row['total']} tokens, {row['total'] - row['budget']} over its "
+              f"budget of {row['budget']}")
+    if not (over or missing):
+        print("OK: every prompt within budget")
+    return 1 if over or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
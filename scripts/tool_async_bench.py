@@ -0,0 +1,126 @@
+"""Concurrent tool throughput and event-loop lag: sync tools vs their async variants.
+
+Simulates --sessions concurrent sessions on one asyncio event loop, each making
+--calls rounds of accessibility_checker_tool and blooms_taxonomy_tool on
+--kb of course content plus a resource_search_tool lookup, while a heartbeat
+task measures how late the loop wakes up. Modes:
+
+    sync     tool.run() called on the event loop (every call blocks all sessions)
+    thread   await tool.arun(): calls run in the shared tool thread pool
+    process  await tool.arun() with HAILEI_TOOL_POOL=process: CPU-bound tool
+             bodies run in the shared process pool (warmed up before timing)
+
+Usage:
+    python scripts/tool_async_bench.py [--sessions 16] [--calls 4] [--kb 256] [--modes sync,thread,process]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PARAGRAPH = (
+    "## Week {week}: Supervised Learning\n\n"
+    "Students will analyze how a classification algorithm learns from labeled data and evaluate the framework "
+    "used to compare models. For example, discuss why the optimization converges? See the red regions in the "
+    "chart for misclassified examples, then reflect with a partner and share your explanation.\n\n"
+    "![](decision-boundary-{week}.png)\n\n"
+)
+HEARTBEAT_S = 0.005
+
+
+def course_content(kb: int, session: int) -> str:
+    text, week = [], 1
+    while sum(map(len, text)) < kb * 1024:
+        text.append(PARAGRAPH.format(week=f"{session}.{week}"))
+        week += 1
+    return "".join(text)
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_S
+        await asyncio.sleep(HEARTBEAT_S)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def session(tools, content: str, calls: int, mode: str) -> int:
+    blooms, accessibility, search = tools
+    done = 0
+    for _ in range(calls):
+        requests = [
+            (accessibility, {"content": content, "check_level": "AA"}),
+            (blooms, {"content": content, "course_level": "undergraduate"}),
+            (search, {"topic": "machine learning", "resource_type": "all"}),
+        ]
+        for tool, kwargs in requests:
+            if mode == "sync":
+                tool.run(**kwargs)
+                await asyncio.sleep(0)  # the only point where other sessions get to run
+            else:
+                await tool.arun(**kwargs)
+            done += 1
+    return done
+
+
+async def run_mode(tools, mode: str, sessions: int, calls: int, kb: int) -> dict:
+    contents = [course_content(kb, i) for i in range(sessions)]
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    started = time.perf_counter()
+    counts = await asyncio.gather(*(session(tools, contents[i], calls, mode) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    lags = sorted(lags) or [0.0]
+    return {
+        "mode": mode,
+        "calls": sum(counts),
+        "seconds": elapsed,
+        "calls_per_s": sum(counts) / elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1 if len(lags) > 1 else 0] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent sessions on the event loop")
+    parser.add_argument("--calls", type=int, default=4, help="Rounds of tool calls per session")
+    parser.add_argument("--kb", type=int, default=256, help="Size of the content each session analyzes")
+    parser.add_argument("--modes", default="sync,thread,process", help="Comma-separated modes to run")
+    parser.add_argument("--workers", type=int, default=None, help="Tool pool workers (HAILEI_TOOL_WORKERS)")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        os.environ["HAILEI_TOOL_WORKERS"] = str(args.workers)
+
+    from utils.async_tools import design_tools, shutdown_tool_pools, warm_tool_processes
+
+    tools = design_tools()  # wrapped as in crew.py: memoization, offloading, async variants
+    rows = []
+    for mode in args.modes.split(","):
+        os.environ["HAILEI_TOOL_POOL"] = "process" if mode == "process" else "thread"
+        shutdown_tool_pools()
+        warm_tool_processes()  # worker start-up is paid once per process, not per call
+        rows.append(asyncio.run(run_mode(tools, mode, args.sessions, args.calls, args.kb)))
+    shutdown_tool_pools()
+
+    print(f"{args.sessions} sessions x {args.calls} rounds x 3 tools on {args.kb} KB of content each "
+          f"({os.cpu_count()} CPUs)")
+    print(f"{'mode':<8} {'calls':>6} {'seconds':>8} {'calls/s':>8} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for row in rows:
+        print(f"{row['mode']:<8} {row['calls']:>6} {row['seconds']:>8.2f} {row['calls_per_s']:>8.1f} "
+              f"{row['lag_p50_ms']:>11.1f} {row['lag_p99_ms']:>11.1f} {row['lag_max_ms']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
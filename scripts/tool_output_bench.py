@@ -0,0 +1,72 @@
+"""Measure the tokens each tool adds to an agent's context, Markdown vs compact JSON.
+
+Runs blooms_taxonomy_tool, accessibility_checker_tool and resource_search_tool
+on representative inputs in both output modes (HAILEI_COMPACT_TOOL_OUTPUT) and
+prints the tokens per call, counted with litellm's bundled tokenizer for the
+agents' model (no network access needed).
+
+Usage:
+    python scripts/tool_output_bench.py [--model gpt-4o-mini]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+SAMPLE_CONTENT = """## Week 3: Supervised Learning
+
+Students will analyze how classification algorithms learn from labeled data.
+In this activity, choose a dataset, train a model and explain why it works.
+See the red regions in the chart for misclassified examples.
+
+![](decision-boundary.png)
+"""
+
+CALLS = [
+    ("blooms_taxonomy_tool", {"content": "Students will analyze classification algorithms",
+                              "target_level": "Evaluate", "course_level": "Undergraduate - Introductory"}),
+    ("blooms_taxonomy_tool", {"content": "Understand the basics of neural networks"}),
+    ("accessibility_checker_tool", {"content": SAMPLE_CONTENT}),
+    ("resource_search_tool", {"topic": "artificial intelligence", "academic_level": "introductory"}),
+    ("resource_search_tool", {"topic": "machine learning ethics", "resource_type": "article"}),
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="gpt-4o-mini", help="Model whose tokenizer counts the tokens")
+    args = parser.parse_args(argv)
+
+    from litellm import token_counter
+
+    from tools.accessibility_checker_tool import accessibility_checker_tool
+    from tools.blooms_taxonomy_tool import blooms_taxonomy_tool
+    from tools.resource_search_tool import resource_search_tool
+
+    tools = {
+        "blooms_taxonomy_tool": blooms_taxonomy_tool,
+        "accessibility_checker_tool": accessibility_checker_tool,
+        "resource_search_tool": resource_search_tool,
+    }
+
+    def tokens(compact, name, kwargs):
+        os.environ["HAILEI_COMPACT_TOOL_OUTPUT"] = "1" if compact else "0"
+        return token_counter(model=args.model, text=tools[name].run(**kwargs))
+
+    print(f"{'tool':<28} {'markdown':>9} {'compact':>8} {'saved':>6}")
+    totals = [0, 0]
+    for name, kwargs in CALLS:
+        markdown, compact = tokens(False, name, kwargs), tokens(True, name, kwargs)
+        totals[0] += markdown
+        totals[1] += compact
+        print(f"{name:<28} {markdown:>9} {compact:>8} {1 - compact / markdown:>6.0%}")
+    print(f"{'total':<28} {totals[0]:>9} {totals[1]:>8} {1 - totals[1] / totals[0]:>6.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
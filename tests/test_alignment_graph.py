@@ -0,0 +1,125 @@
+import pytest
+
+from models.models import CourseContent, KDKAAlignment, LearningObjective, PRRRSignals, WeeklyModule
+from utils.alignment_graph import NOT_AVAILABLE, AlignmentGraph, alignment_report, bloom_rank
+
+FULL_PRRR = PRRRSignals(personal="p", relatable="r", relative="r", real_world="w")
+FULL_KDKA = KDKAAlignment(knowledge=["k"], delivery=["d"], context=["c"], assessment=[])
+
+
+def objective(statement, level):
+    return LearningObjective(statement=statement, bloom_level=level)
+
+
+def course(**changes):
+    weeks = [
+        WeeklyModule(
+            week_number=1, title="Wrangling",
+            learning_objectives=[objective("Clean raw datasets with pandas", "Apply")],
+            activities=["Lab: clean the census data (ELO 1.1)"], assessments=["Quiz on ELO 1.1"],
+            prrr=FULL_PRRR, kdka=FULL_KDKA,
+        ),
+        WeeklyModule(
+            week_number=2, title="Evaluation",
+            learning_objectives=[objective("ELO 1.2: judge how accurate a model is", "Evaluate")],
+        ),
+        WeeklyModule(
+            week_number=3, title="Modeling",
+            learning_objectives=[
+                objective("Build predictive models with Python", "Remember"),
+                objective("Appreciate jazz history", "Understand"),
+            ],
+            activities=["Project work on TLO 1"],
+            prrr=PRRRSignals(personal="Your own data"), kdka=KDKAAlignment(knowledge=["regression"]),
+        ),
+    ]
+    fields = dict(
+        course_title="Data Science", course_description="Intro", duration_weeks=3, level="Undergraduate",
+        tlos=[objective("Build predictive models with Python", "Create"),
+              objective("Communicate findings to stakeholders", "Apply")],
+        elos_by_tlo={
+            "TLO 1": [objective("Clean raw datasets with pandas", "Apply"),
+                      objective("Evaluate model accuracy", "Evaluate")],
+            "TLO 2": [objective("Design interactive dashboards", "Create")],
+        },
+        weekly_modules=weeks,
+    )
+    fields.update(changes)
+    return CourseContent(**fields)
+
+
+@pytest.mark.parametrize("level, rank", [
+    ("Apply", 3), ("applying", 3), ("Analysis", 4), ("Synthesis", 6), ("Creates", 6), ("", 0), (None, 0), ("Vibes", 0),
+])
+def test_bloom_rank(level, rank):
+    assert bloom_rank(level) == rank
+
+
+def test_week_objectives_link_by_reference_statement_or_not_at_all():
+    graph = AlignmentGraph(course(), match_threshold=0.5)
+    assert [item.target for item in graph.week_objectives] == ["ELO 1.1", "ELO 1.2", "TLO 1", None]
+    assert graph.weeks_teaching("TLO 1") == [1, 2, 3]
+    assert graph.weeks_teaching("TLO 2") == []
+
+
+def test_unassessed_objectives():
+    # The week 1 quiz assesses ELO 1.1 and so TLO 1; nothing assesses the rest
+    gaps = AlignmentGraph(course()).unassessed_objectives()
+    assert gaps == {"TLO 2": [], "ELO 1.2": [2], "ELO 2.1": []}
+
+
+def test_unpracticed_objectives_skip_untaught_ones():
+    assert AlignmentGraph(course()).unpracticed_objectives() == {"ELO 1.2": [2]}
+
+
+def test_an_item_naming_no_objective_covers_its_week():
+    content = course()
+    content.weekly_modules[1].activities = ["Group discussion"]
+    content.weekly_modules[1].kdka.assessment = ["Peer review"]
+    graph = AlignmentGraph(content)
+    assert graph.activities[2][0].targets == ()
+    assert graph.unpracticed_objectives() == {}
+    assert "ELO 1.2" not in graph.unassessed_objectives()
+
+
+def test_prrr_and_kdka_gaps():
+    graph = AlignmentGraph(course())
+    assert graph.prrr_gaps() == {2: ["personal", "relatable", "relative", "real_world"],
+                                 3: ["relatable", "relative", "real_world"]}
+    assert graph.weeks_without_prrr() == [2]
+    assert graph.kdka_gaps() == {1: ["assessment"], 2: ["knowledge", "delivery", "context", "assessment"],
+                                 3: ["delivery", "context", "assessment"]}
+
+
+def test_bloom_violations():
+    messages = [violation.message for violation in AlignmentGraph(course()).bloom_violations(tolerance=1)]
+    assert messages == [
+        "ELO 2.1 (Create) is above TLO 2 (Apply)",
+        "TLO 1: week 3 is at Remember after week 2 reached Evaluate",
+    ]
+    assert len(AlignmentGraph(course()).bloom_violations(tolerance=4)) == 1
+
+
+def test_unlinked_week_objectives():
+    unlinked = AlignmentGraph(course()).unlinked_week_objectives()
+    assert [(item.week, item.statement) for item in unlinked] == [(3, "Appreciate jazz history")]
+
+
+def test_report_lists_each_kind_of_gap():
+    report = alignment_report(course(), limit=1)
+    assert report.splitlines()[0] == (
+        "Alignment graph: 2 TLOs, 3 ELOs, 3 weeks, 4 week objectives, 2 activities, 1 assessments."
+    )
+    assert 'Unassessed objectives (3):\n- TLO 2 "Communicate findings to stakeholders": not taught in any week' in report
+    assert "- ... and 2 more" in report
+    assert 'Objectives without activities (1):\n- ELO 1.2 "Evaluate model accuracy": taught in week 2' in report
+    assert "Bloom progression violations (2):" in report
+    assert "Weeks with PRRR gaps (2):\n- week 2: no PRRR signals" in report
+    assert "Weeks with KDKA gaps (3):" in report
+    assert 'Week objectives not linked to any TLO/ELO (1):\n- week 3: "Appreciate jazz history"' in report
+
+
+def test_report_without_content_or_gaps():
+    assert alignment_report(None) == NOT_AVAILABLE
+    content = CourseContent(course_title="T", course_description="D", duration_weeks=0, level="L")
+    assert alignment_report(content).endswith("No alignment gaps found.")
@@ -0,0 +1,66 @@
+import json
+
+from models.models import CourseFoundation, CourseModule, CourseOutcomes, CourseRequest, LearningObjective, WeeklyModule
+from utils.content_fanout import fallback_week, merge_course_content, week_inputs, week_plans
+
+REQUEST = CourseRequest(
+    course_title="Introduction to Data Science",
+    course_description="Data wrangling, visualization and modeling with Python.",
+    course_credits=3,
+    course_duration_weeks=4,
+    course_level="Undergraduate - Introductory",
+    course_expectations="Weekly labs and a final project.",
+)
+
+
+def foundation(modules):
+    return CourseFoundation(
+        course_title="Data Science Foundations", course_description="Foundation description", credits=3,
+        duration_weeks=4, level="Undergraduate", expectations="Labs",
+        modules=[CourseModule(title=title, description=f"About {title}", learning_objectives=[]) for title in modules],
+    )
+
+
+def test_week_plans_spread_modules_over_the_weeks():
+    plans = week_plans(foundation(["Wrangling", "Modeling"]), 4)
+    assert [plan["week_number"] for plan in plans] == [1, 2, 3, 4]
+    assert [plan["module"]["title"] for plan in plans] == ["Wrangling", "Wrangling", "Modeling", "Modeling"]
+    assert week_plans(None, 2) == [{"week_number": 1, "duration_weeks": 2}, {"week_number": 2, "duration_weeks": 2}]
+
+
+def test_week_inputs_add_the_week_to_shared_inputs():
+    plan = week_plans(None, 4)[2]
+    inputs = week_inputs({"course_title": "DS"}, plan, None)
+    assert inputs["course_title"] == "DS" and inputs["week_number"] == 3
+    assert json.loads(inputs["week_plan"]) == plan
+    assert inputs["course_outcomes"] == "Not available." and inputs["warm_start_week"] == "Not available."
+
+
+def test_fallback_week_uses_the_plan():
+    plan = week_plans(foundation(["Wrangling"]), 4)[1]
+    module = fallback_week(plan)
+    assert (module.week_number, module.title, module.overview) == (2, "Wrangling", "About Wrangling")
+    assert fallback_week({"week_number": 3}).title == "Week 3"
+
+
+def test_merge_orders_weeks_and_takes_outcomes():
+    outcomes = CourseOutcomes(
+        tlos=[LearningObjective(statement="Build models", bloom_level="Create")],
+        elos_by_tlo={"TLO 1": [LearningObjective(statement="Clean data", bloom_level="Apply")]},
+        kdka_overview="KDKA notes",
+    )
+    modules = [WeeklyModule(week_number=week, title=f"Week {week}") for week in (3, 1, 4, 2)]
+    content = merge_course_content(REQUEST, foundation(["Wrangling"]), outcomes, modules)
+
+    assert [module.week_number for module in content.weekly_modules] == [1, 2, 3, 4]
+    assert content.course_title == "Data Science Foundations"
+    assert content.duration_weeks == 4
+    assert content.tlos == outcomes.tlos and content.elos_by_tlo == outcomes.elos_by_tlo
+    assert content.kdka_overview == "KDKA notes" and content.prrr_overview is None
+
+
+def test_merge_without_foundation_or_outcomes_falls_back_to_the_request():
+    content = merge_course_content(REQUEST, None, None, [WeeklyModule(week_number=1, title="Week 1")])
+    assert content.course_title == REQUEST.course_title
+    assert content.level == REQUEST.course_level
+    assert content.tlos == [] and content.elos_by_tlo == {}
@@ -0,0 +1,65 @@
+import json
+
+from models.models import CourseFoundation
+from utils.context_projection import context_report_scope, project, projected_inputs
+from utils.stub_llm import representative_output
+
+DATA = {
+    "course_title": "Data Science",
+    "level": "Graduate",
+    "weekly_modules": [
+        {"week_number": 1, "title": "Intro", "activities": ["Lab"], "kdka": {"knowledge": ["a"], "delivery": ["b"]}},
+        {"week_number": 2, "title": "Models", "activities": [], "kdka": {"knowledge": ["c"], "delivery": ["d"]}},
+    ],
+}
+
+
+def test_project_keeps_only_the_named_fields():
+    assert project(DATA, ["course_title"]) == {"course_title": "Data Science"}
+
+
+def test_project_applies_paths_to_every_list_element():
+    assert project(DATA, ["weekly_modules.title", "weekly_modules.kdka.knowledge"]) == {
+        "weekly_modules": [
+            {"title": "Intro", "kdka": {"knowledge": ["a"]}},
+            {"title": "Models", "kdka": {"knowledge": ["c"]}},
+        ]
+    }
+
+
+def test_a_whole_field_wins_over_its_sub_paths():
+    expected = {"weekly_modules": DATA["weekly_modules"]}
+    assert project(DATA, ["weekly_modules.title", "weekly_modules"]) == expected
+    assert project(DATA, ["weekly_modules", "weekly_modules.title"]) == expected
+
+
+def test_unknown_paths_are_ignored():
+    assert project(DATA, ["missing", "weekly_modules.missing", "level"]) == {
+        "level": "Graduate", "weekly_modules": [{}, {}],
+    }
+
+
+def test_projected_inputs_prunes_artifacts_and_reports_tokens():
+    foundation = representative_output(CourseFoundation)
+    full = foundation.model_dump_json(indent=2)
+    inputs = {"course_foundation": full, "course_title": "Data Science", "search_report": "raw text"}
+
+    with context_report_scope() as report:
+        pruned = projected_inputs(
+            "review", {"course_foundation": ["course_title"], "search_report": ["resources"]},
+            inputs, {"course_foundation": foundation},
+        )
+    assert json.loads(pruned["course_foundation"]) == {"course_title": foundation.course_title}
+    assert pruned["search_report"] == "raw text"  # no typed artifact: passed through
+    assert pruned["course_title"] == "Data Science"
+    assert inputs["course_foundation"] == full  # the shared inputs are not modified
+
+    row = report.rows()["review"]
+    assert row["runs"] == 1 and row["after"] < row["before"]
+
+
+def test_projected_inputs_without_a_projection_is_a_copy():
+    inputs = {"course_foundation": "{}"}
+    with context_report_scope() as report:
+        assert projected_inputs("review", None, inputs, {}) == inputs
+    assert report.rows() == {}
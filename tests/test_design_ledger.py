@@ -0,0 +1,73 @@
+import pickle
+
+from utils.design_ledger import DesignLedger, current_ledger, design_ledger_scope, input_hash
+
+TASK = {"description": "Plan {course_title} over {weeks} weeks", "expected_output": "A plan"}
+AGENT = {"role": "Planner for {course_level}", "goal": "Plan well", "backstory": "Experienced"}
+INPUTS = {"course_title": "Data Science", "weeks": 12, "course_level": "Graduate", "unused": "x"}
+
+
+def test_input_hash_is_stable():
+    assert input_hash("plan", TASK, AGENT, INPUTS) == input_hash("plan", TASK, AGENT, dict(reversed(INPUTS.items())))
+
+
+def test_input_hash_ignores_inputs_the_templates_do_not_reference():
+    assert input_hash("plan", TASK, AGENT, {**INPUTS, "unused": "changed"}) == input_hash("plan", TASK, AGENT, INPUTS)
+
+
+def test_input_hash_changes_with_referenced_inputs_and_templates():
+    base = input_hash("plan", TASK, AGENT, INPUTS)
+    assert input_hash("plan", TASK, AGENT, {**INPUTS, "weeks": 10}) != base
+    assert input_hash("plan", TASK, AGENT, {**INPUTS, "course_level": "Undergraduate"}) != base  # agent template
+    assert input_hash("plan", {**TASK, "expected_output": "A weekly plan"}, AGENT, INPUTS) != base
+    assert input_hash("plan", TASK, {**AGENT, "backstory": "New"}, INPUTS) != base
+    assert input_hash("other", TASK, AGENT, INPUTS) != base
+
+
+def test_unchanged_inputs_replay_and_changed_ones_recompute():
+    ledger = DesignLedger()
+    with design_ledger_scope(ledger):
+        assert current_ledger() is ledger
+        assert ledger.lookup("plan", "k1") is None
+        ledger.record("plan", "k1", {"plan": 1}, "raw plan")
+        assert ledger.lookup("content", "k2") is None
+        ledger.record("content", "k2", {"content": 1}, "raw content")
+    assert current_ledger() is None
+
+    with design_ledger_scope(ledger):
+        record = ledger.lookup("plan", "k1")
+        assert record.pydantic == {"plan": 1} and record.raw == "raw plan"
+        assert ledger.lookup("content", "k2-edited") is None
+    assert ledger.stats() == {"runs": 2, "reused": ["plan"], "recomputed": ["content"]}
+
+    # Outputs the last run did not consume are dropped
+    assert ledger.has("k1") and not ledger.has("k2")
+
+
+def test_an_interrupted_run_keeps_the_previous_outputs():
+    ledger = DesignLedger()
+    with design_ledger_scope(ledger):
+        ledger.record("plan", "k1", None, "plan")
+        ledger.record("content", "k2", None, "content")
+    try:
+        with design_ledger_scope(ledger):
+            ledger.record("plan", "k1-new", None, "new plan")
+            raise RuntimeError("run failed")
+    except RuntimeError:
+        pass
+    assert ledger.has("k1") and ledger.has("k2") and ledger.has("k1-new")
+
+
+def test_has_does_not_count_as_reuse():
+    ledger = DesignLedger()
+    ledger.record("plan", "k1", None, "plan")
+    assert ledger.has("k1")
+    assert ledger.stats()["reused"] == []
+
+
+def test_ledger_pickles_for_spilled_sessions():
+    ledger = DesignLedger()
+    with design_ledger_scope(ledger):
+        ledger.record("plan", "k1", {"plan": 1}, "plan")
+    restored = pickle.loads(pickle.dumps(ledger))
+    assert restored.lookup("plan", "k1").pydantic == {"plan": 1}
@@ -0,0 +1,92 @@
+import pytest
+
+from models.models import CourseRequest
+from utils.intent_parser import FieldEdit, apply_edit, parse_edit
+
+
+@pytest.fixture
+def course_request():
+    return CourseRequest(
+        course_title="Introduction to Machine Learning",
+        course_description="Supervised and unsupervised learning with hands-on labs.",
+        course_credits=3,
+        course_duration_weeks=16,
+        course_level="Undergraduate - Introductory",
+        course_expectations="Students build and evaluate models on real datasets.",
+    )
+
+
+@pytest.mark.parametrize("message, edit", [
+    ("make it 12 weeks", FieldEdit("course_duration_weeks", 12)),
+    ("12 weeks please", FieldEdit("course_duration_weeks", 12)),
+    ("make it four credits", FieldEdit("course_credits", 4)),
+    ("set duration = 10", FieldEdit("course_duration_weeks", 10)),
+    ("the duration should be 8 weeks", FieldEdit("course_duration_weeks", 8)),
+    ("credits: 4", FieldEdit("course_credits", 4)),
+    ("change the level to Graduate - Introductory", FieldEdit("course_level", "Graduate - Introductory")),
+    ("the level is advanced undergrad", FieldEdit("course_level", "Undergraduate - Advanced")),
+    ("change the title to \"Applied Machine Learning\"", FieldEdit("course_title", "Applied Machine Learning")),
+    ("please set the course title to \"Deep Learning Foundations\"", FieldEdit("course_title", "Deep Learning Foundations")),
+    ("rename the course to 'Practical Data Science'", FieldEdit("course_title", "Practical Data Science")),
+    ("rename it “Data Science in Practice”", FieldEdit("course_title", "Data Science in Practice")),
+    ("update the description: \"A hands-on tour of modern ML.\"", FieldEdit("course_description", "A hands-on tour of modern ML.")),
+    ("set the expectations to \"Weekly labs and a final project\"",
+     FieldEdit("course_expectations", "Weekly labs and a final project")),
+])
+def test_parse_edit_recognizes_direct_edits(message, edit):
+    assert parse_edit(message) == edit
+
+
+@pytest.mark.parametrize("message", [
+    # Comments about a free-text field are not new values for it
+    "the title is perfect, thanks",
+    "the name is misleading",
+    "title is fine",
+    "the title is good",
+    "description: too long",
+    "make the title into a question",
+    "change the title to be more engaging",
+    "rename it to something catchier",
+    # Free-text values must be quoted; unquoted ones are usually instructions, not values
+    "change the title to Applied Machine Learning",
+    "rename the course to Practical Data Science",
+    "change the expectations to include a final project",
+    "change the description to focus more on ethics",
+    "update the description to mention Python",
+    "change the title to reflect ethics",
+    "change the name to include the word Applied",
+    "change the title to \"include ethics\"",
+    "call it a day",
+    "call it \"Data Science\"",
+    "rename it to AI 101 instead",
+    "rename it to \"AI 101\" instead",
+    # Questions, vague values, compound requests and unclear values go to the LLM
+    "Can you suggest a stronger focus on hands-on projects?",
+    "make it about 12 weeks",
+    "make it 12 weeks and set credits to 4",
+    "the duration is fine",
+    "the level is good",
+    "change the level to graduate",
+    "",
+])
+def test_parse_edit_defers_to_the_llm(message):
+    assert parse_edit(message) is None
+
+
+def test_apply_edit_updates_the_field(course_request):
+    updated, reply = apply_edit(course_request, FieldEdit("course_duration_weeks", 12))
+    assert updated.course_duration_weeks == 12
+    assert updated.course_title == course_request.course_title
+    assert "Updated the **Duration** to **12 weeks**" in reply
+
+
+def test_apply_edit_reports_an_unchanged_value(course_request):
+    updated, reply = apply_edit(course_request, FieldEdit("course_credits", 3))
+    assert updated == course_request
+    assert "already **3**" in reply
+
+
+def test_apply_edit_rejects_an_invalid_value(course_request):
+    updated, reply = apply_edit(course_request, FieldEdit("course_title", "ML"))
+    assert updated is None
+    assert "couldn't set the **Title**" in reply
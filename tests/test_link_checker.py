@@ -0,0 +1,111 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import link_checker
+from utils.link_checker import LinkCache, LinkChecker, public_address
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes: /ok, /missing (404), /nohead (405 on HEAD), /moved (-> /ok), /to-localhost (-> localhost)."""
+    paths = []
+
+    def log_message(self, *args):
+        pass
+
+    def _answer(self, head):
+        type(self).paths.append(self.path)
+        route = self.path.strip("/").split("/")[0]
+        if route in ("moved", "to-localhost"):
+            host = f"localhost:{self.server.server_address[1]}" if route == "to-localhost" else self.headers["Host"]
+            self.send_response(302)
+            self.send_header("Location", f"http://{host}/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if route == "nohead" and head:
+            status = 405
+        else:
+            status = 404 if route == "missing" else 200
+        body = b"" if head else b"stub page"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._answer(head=True)
+
+    def do_GET(self):
+        self._answer(head=False)
+
+
+@pytest.fixture
+def server():
+    StubHandler.paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def loopback_is_public(monkeypatch):
+    """Pretend 127.0.0.1 is a public host, so the stub stands in for an outside server."""
+    resolve = link_checker._resolve
+
+    async def fake_resolve(host, port):
+        return ["93.184.216.34"] if host == "127.0.0.1" else await resolve(host, port)
+
+    monkeypatch.setattr(link_checker, "_resolve", fake_resolve)
+
+
+@pytest.mark.parametrize("address, public", [
+    ("93.184.216.34", True),
+    ("2606:2800:220:1:248:1893:25c8:1946", True),
+    ("127.0.0.1", False),
+    ("10.1.2.3", False),
+    ("172.16.0.1", False),
+    ("192.168.1.1", False),
+    ("169.254.169.254", False),
+    ("0.0.0.0", False),
+    ("::1", False),
+    ("fe80::1%eth0", False),
+    ("::ffff:127.0.0.1", False),
+])
+def test_public_address(address, public):
+    assert public_address(address) is public
+
+
+def test_private_hosts_are_refused_without_a_request(server):
+    results = LinkChecker(allow_private=False).check([f"{server}/ok", "http://169.254.169.254/latest/meta-data/"])
+    assert not any(status.ok for status in results.values())
+    assert all(status.error.startswith("LinkBlocked") for status in results.values())
+    assert StubHandler.paths == []
+
+
+def test_redirects_to_private_hosts_are_refused(server, loopback_is_public):
+    results = LinkChecker(allow_private=False).check([f"{server}/moved", f"{server}/to-localhost"])
+    assert results[f"{server}/moved"].ok
+    blocked = results[f"{server}/to-localhost"]
+    assert not blocked.ok and blocked.error.startswith("LinkBlocked")
+    assert StubHandler.paths.count("/ok") == 1  # only the redirect between public hosts was followed
+
+
+def test_statuses_with_private_hosts_allowed(server, tmp_path):
+    urls = [f"{server}/ok", f"{server}/missing", f"{server}/nohead", f"{server}/moved", "ftp://example.org/file"]
+    checker = LinkChecker(LinkCache(str(tmp_path / "links.db")), allow_private=True)
+    results = checker.check(urls)
+
+    assert results[f"{server}/ok"].ok and results[f"{server}/ok"].status == 200
+    assert not results[f"{server}/missing"].ok and results[f"{server}/missing"].status == 404
+    assert results[f"{server}/nohead"].ok  # HEAD rejected, GET decides
+    assert results[f"{server}/moved"].final_url == f"{server}/ok"
+    assert not results["ftp://example.org/file"].ok
+
+    served = len(StubHandler.paths)
+    again = checker.check(urls)
+    assert all(again[url] == results[url] for url in urls[:4])  # answered from the cache
+    assert len(StubHandler.paths) == served
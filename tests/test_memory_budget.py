@@ -0,0 +1,50 @@
+from utils.memory_budget import MB, MemoryBudget, SessionUsage, deep_sizeof, spill, unspill
+
+
+def usage(session_id, mb, idle, busy=False):
+    return SessionUsage(session_id, int(mb * MB), idle, busy)
+
+
+def test_unlimited_budgets_only_evict_idle_sessions():
+    budget = MemoryBudget(session_budget_mb=0, total_budget_mb=0, idle_seconds=600)
+    assert budget.plan([usage("a", 500, 10), usage("b", 1, 700)]) == {"b": "idle"}
+
+
+def test_idle_timeout_of_zero_never_evicts_for_idleness():
+    budget = MemoryBudget(session_budget_mb=0, total_budget_mb=0, idle_seconds=0)
+    assert budget.plan([usage("a", 1, 10**6)]) == {}
+
+
+def test_sessions_over_their_own_budget_are_evicted():
+    budget = MemoryBudget(session_budget_mb=10, total_budget_mb=0, idle_seconds=600)
+    assert budget.plan([usage("big", 11, 5), usage("small", 9, 5)]) == {"big": "session_budget"}
+
+
+def test_total_budget_evicts_least_recently_used_first():
+    budget = MemoryBudget(session_budget_mb=0, total_budget_mb=25, idle_seconds=0)
+    plan = budget.plan([usage("recent", 10, 1), usage("older", 10, 50), usage("oldest", 10, 100)])
+    assert plan == {"oldest": "total_budget"}
+
+
+def test_already_evicted_sessions_count_towards_the_total():
+    budget = MemoryBudget(session_budget_mb=15, total_budget_mb=25, idle_seconds=600)
+    plan = budget.plan([usage("huge", 20, 1), usage("a", 10, 50), usage("b", 10, 100)])
+    assert plan == {"huge": "session_budget"}  # the remaining 20 MB fit
+
+
+def test_busy_sessions_are_never_evicted():
+    budget = MemoryBudget(session_budget_mb=1, total_budget_mb=1, idle_seconds=1)
+    plan = budget.plan([usage("busy", 100, 10**6, busy=True), usage("idle", 0.5, 0)])
+    assert plan == {"idle": "total_budget"}
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = "x" * 10_000
+    assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
+    assert deep_sizeof({"a": [shared]}) > deep_sizeof(shared)
+
+
+def test_spill_and_unspill_round_trip(tmp_path):
+    spill(str(tmp_path), "s1", "ledger", {"k": [1, 2]})
+    assert unspill(str(tmp_path), "s1", "ledger") == {"k": [1, 2]}
+    assert unspill(str(tmp_path), "s1", "ledger") is None  # removed once loaded
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+from utils.rate_limiter import (
+    BATCH, INTERACTIVE, LimiterQueueFull, LimiterTimeout, ModelLimiter, TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds, limiter=None):
+        self.now += seconds
+        if limiter is not None:  # wake waiters so they re-read the clock
+            with limiter._cond:
+                limiter._cond.notify_all()
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def in_thread(fn):
+    result = {}
+
+    def run():
+        try:
+            result["value"] = fn()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, result
+
+
+def test_token_bucket_refills_with_the_clock():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)  # one token per second
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    assert bucket.wait_time(10) == pytest.approx(10.0)
+    clock.advance(4)
+    assert bucket.wait_time(4) == 0.0
+    assert bucket.wait_time(10) == pytest.approx(6.0)
+    clock.advance(1000)
+    assert bucket.tokens <= bucket.capacity
+    assert bucket.wait_time(500) == 0.0  # amounts above capacity only wait for a full bucket
+
+
+def test_token_bucket_settles_reservations():
+    bucket = TokenBucket(1000, clock=FakeClock())
+    bucket.take(800)
+    bucket.give(300)  # reserved more than was used
+    assert bucket.tokens == pytest.approx(500)
+    bucket.give(-200)  # used more than was reserved
+    assert bucket.tokens == pytest.approx(300)
+
+
+def test_waiting_calls_are_served_by_priority():
+    limiter = ModelLimiter("m", rpm=1000, tpm=10**6, max_concurrency=1)
+    limiter.acquire(1)
+    order = []
+
+    def call(name, priority):
+        limiter.acquire(1, priority)
+        order.append(name)
+        limiter.release(1)
+
+    threads = []
+    for name, priority in [("batch-1", BATCH), ("batch-2", BATCH), ("interactive", INTERACTIVE)]:
+        threads.append(in_thread(lambda name=name, priority=priority: call(name, priority))[0])
+        wait_for(lambda: limiter.queue_depth() == len(threads))
+    limiter.release(1)
+    for thread in threads:
+        thread.join(2)
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+def test_requests_per_minute_wait():
+    clock = FakeClock()
+    limiter = ModelLimiter("m", rpm=2, tpm=10**6, clock=clock)
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) == 0.0
+    thread, result = in_thread(lambda: limiter.acquire(1))
+    wait_for(lambda: limiter.queue_depth() == 1)
+    clock.advance(20, limiter)
+    time.sleep(0.05)
+    assert thread.is_alive()  # one request refills every 30s
+    clock.advance(10, limiter)
+    thread.join(2)
+    assert result["value"] == pytest.approx(30.0)
+    assert limiter.metrics()["max_wait_s"] == pytest.approx(30.0)
+
+
+def test_tokens_per_minute_wait():
+    clock = FakeClock()
+    limiter = ModelLimiter("m", rpm=1000, tpm=1200, clock=clock)
+    limiter.acquire(1200)
+    thread, result = in_thread(lambda: limiter.acquire(600))
+    wait_for(lambda: limiter.queue_depth() == 1)
+    clock.advance(29, limiter)
+    time.sleep(0.05)
+    assert thread.is_alive()
+    clock.advance(1, limiter)  # 600 tokens refill in 30s
+    thread.join(2)
+    assert result["value"] == pytest.approx(30.0)
+
+
+def test_release_returns_unused_tokens():
+    clock = FakeClock()
+    limiter = ModelLimiter("m", rpm=1000, tpm=1000, clock=clock)
+    with limiter.limit(1000) as usage:
+        usage["used_tokens"] = 100
+    assert limiter.metrics()["tokens_available"] == 900
+    assert limiter.acquire(900) == 0.0
+
+
+def test_full_queue_sheds_batch_calls_but_not_interactive_ones():
+    limiter = ModelLimiter("m", rpm=1000, tpm=10**6, max_concurrency=1, max_queue=1)
+    limiter.acquire(1)
+    queued, _ = in_thread(lambda: limiter.acquire(1))
+    wait_for(lambda: limiter.queue_depth() == 1)
+
+    with pytest.raises(LimiterQueueFull):
+        limiter.acquire(1, BATCH)
+    interactive, result = in_thread(lambda: limiter.acquire(1, INTERACTIVE))
+    wait_for(lambda: limiter.queue_depth() == 2)
+    assert limiter.metrics()["rejected"] == 1
+
+    limiter.release(1)
+    interactive.join(2)
+    assert "value" in result
+    limiter.release(1)
+    queued.join(2)
+    assert not queued.is_alive()
+
+
+def test_acquire_times_out_and_leaves_the_queue():
+    limiter = ModelLimiter("m", rpm=1000, tpm=10**6, max_concurrency=1)
+    limiter.acquire(1)
+    started = time.monotonic()
+    with pytest.raises(LimiterTimeout):
+        limiter.acquire(1, timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    metrics = limiter.metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["queue_depth"] == 0
+    limiter.release(1)
+    assert limiter.acquire(1, timeout=0.05) == pytest.approx(0.0, abs=0.05)
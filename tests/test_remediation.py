@@ -0,0 +1,62 @@
+import pytest
+
+from models.models import CourseAuditReport, CourseContentReview, EditFinding
+from utils.remediation import COMPLIANCE_CHECKS, failing_checks, remediation_brief, tasks_to_recheck
+
+
+def review(udl=True, accessible=True, **fields):
+    return CourseContentReview(udl_compliance=udl, accessibility_passed=accessible, **fields)
+
+
+def audit(ethical=True):
+    return CourseAuditReport(ethical_compliance=ethical, notes="  Uses a biased hiring dataset.  ")
+
+
+def test_passing_and_missing_reports_are_not_failures():
+    assert failing_checks(review(), audit()) == []
+    assert failing_checks(None, None) == []
+
+
+@pytest.mark.parametrize("report, verdict, failing", [
+    (review(udl=False), audit(), ["udl_compliance"]),
+    (review(accessible=False), None, ["accessibility_passed"]),
+    (None, audit(ethical=False), ["ethical_compliance"]),
+    (review(False, False), audit(False), ["udl_compliance", "accessibility_passed", "ethical_compliance"]),
+])
+def test_failing_checks(report, verdict, failing):
+    assert failing_checks(report, verdict) == failing
+
+
+def test_every_flag_maps_to_a_recheck_task():
+    assert set(failing_checks(review(False, False), audit(False))) == set(COMPLIANCE_CHECKS)
+
+
+@pytest.mark.parametrize("failing, tasks", [
+    ([], []),
+    (["accessibility_passed", "udl_compliance"], ["content_review_task"]),
+    (["ethical_compliance", "udl_compliance"], ["content_review_task", "ethical_audit_task"]),
+])
+def test_tasks_to_recheck_in_pipeline_order(failing, tasks):
+    assert tasks_to_recheck(failing) == tasks
+
+
+def test_brief_lists_only_the_findings_of_failing_checks():
+    report = review(
+        accessible=False,
+        findings=[EditFinding(area="Week 2", issue="Images lack alt text", recommendation="Add alt text")],
+        accessibility_checks=["alt text", "contrast"],
+    )
+    brief = remediation_brief(["accessibility_passed"], report, audit(ethical=False))
+    assert brief.splitlines()[0] == "Failing checks: accessibility_passed"
+    assert "- [Week 2] Images lack alt text -> Add alt text" in brief
+    assert "- Accessibility checks: alt text, contrast" in brief
+    assert "EthosAi" not in brief  # the audit passed as far as this brief is concerned
+
+
+def test_brief_falls_back_to_the_review_summary_and_audit_notes():
+    brief = remediation_brief(
+        ["udl_compliance", "ethical_compliance"], review(udl=False, summary_markdown=" Needs more options. "),
+        audit(ethical=False),
+    )
+    assert "- Needs more options." in brief
+    assert "EthosAi audit notes:\n- Uses a biased hiring dataset." in brief
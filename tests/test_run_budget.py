@@ -0,0 +1,125 @@
+import pytest
+
+from utils import run_budget
+from utils.run_budget import (
+    COMPACT_CONTEXT, EXHAUSTED, NORMAL, SKIP_OPTIONAL, SMALLER_MODELS, BudgetExceeded, RunBudget, answered_by,
+    budgeted, degraded, run_budget_scope,
+)
+
+
+@pytest.fixture(autouse=True)
+def flat_prices(monkeypatch):
+    """$1 per 1000 tokens, without loading litellm's price map."""
+    monkeypatch.setattr(run_budget, "call_cost", lambda model, prompt, completion: (prompt + completion) / 1000)
+
+
+class FakeLLM:
+    def __init__(self, model, reply="x" * 40):
+        self.model = model
+        self.reply = reply
+        self.calls = 0
+
+    def call(self, messages, *args, **kwargs):
+        self.calls += 1
+        return self.reply
+
+
+def test_stages_follow_the_share_of_the_budget_used():
+    budget = RunBudget(max_tokens=1000, max_cost_usd=0, stages=[0.6, 0.75, 0.9])
+    assert budget.stage() == NORMAL
+    budget.charge("m", 600, 0)
+    assert budget.stage() == SMALLER_MODELS
+    budget.charge("m", 150, 0)
+    assert budget.stage() == COMPACT_CONTEXT
+    budget.charge("m", 150, 0)
+    assert budget.stage() == SKIP_OPTIONAL and budget.at_least(COMPACT_CONTEXT)
+    budget.charge("m", 100, 0)
+    assert budget.stage() == EXHAUSTED
+
+
+def test_the_tighter_limit_decides():
+    budget = RunBudget(max_tokens=10_000, max_cost_usd=1.0, stages=[0.6, 0.75, 0.9])
+    budget.charge("m", 800, 0)  # 8% of the tokens, 80% of the cost
+    assert budget.used() == pytest.approx(0.8)
+    assert budget.stage() == COMPACT_CONTEXT
+
+
+def test_an_unlimited_budget_never_degrades():
+    budget = RunBudget(max_tokens=0, max_cost_usd=0)
+    budget.charge("m", 10**9, 0)
+    assert not budget.limited and not budget.at_least(SMALLER_MODELS)
+
+
+def test_stage_reached_records_the_running_task():
+    budget = RunBudget(max_tokens=1000, max_cost_usd=0, stages=[0.6, 0.75, 0.9])
+    budget.note_task("planning")
+    budget.charge("m", 800, 0)
+    budget.note_task("content")
+    budget.skip("searchai_task")
+    stats = budget.stats()
+    assert stats["stage_reached"] == {"smaller_models": "content", "compact_context": "content"}
+    assert stats["skipped"] == ["searchai_task"]
+
+
+def test_add_merges_another_budgets_spend():
+    run, speculative = RunBudget(max_tokens=0), RunBudget(max_tokens=0)
+    run.charge("big", 100, 50)
+    speculative.charge("big", 10, 5)
+    speculative.charge("small", 20, 0)
+    run.add(speculative)
+    stats = run.stats()
+    assert stats["tokens"] == 185 and stats["calls"] == 3
+    assert stats["by_model"]["big"] == {"calls": 2, "tokens": 165, "cost_usd": 0.165}
+    assert stats["by_model"]["small"]["tokens"] == 20
+
+
+def test_budgeted_charges_calls_in_scope_only():
+    llm = budgeted(FakeLLM("big"))
+    assert budgeted(llm) is llm
+    llm.call("p" * 400)  # outside a run: not charged anywhere
+    budget = RunBudget(max_tokens=0)
+    with run_budget_scope(budget):
+        llm.call("p" * 400)
+    assert budget.stats()["by_model"] == {"big": {"calls": 1, "tokens": 112, "cost_usd": 0.112}}
+
+
+def test_budgeted_moves_to_the_smaller_model_and_then_stops(monkeypatch):
+    small = FakeLLM("small")
+    monkeypatch.setattr(run_budget, "model_limits", lambda model: {"downgrade_model": "small"})
+    monkeypatch.setitem(run_budget._downgrades, "small", small)
+    big = FakeLLM("big")
+    llm = budgeted(big)
+
+    budget = RunBudget(max_tokens=1000, max_cost_usd=0, stages=[0.6, 0.75, 0.9])
+    with run_budget_scope(budget):
+        budget.charge("big", 700, 0)
+        assert degraded(SMALLER_MODELS)
+        llm.call("prompt")
+        assert (big.calls, small.calls) == (0, 1)
+        budget.charge("small", 300, 0)
+        with pytest.raises(BudgetExceeded):
+            llm.call("prompt")
+    assert "exhausted" in budget.stats()["stage_reached"]
+
+
+def test_budgeted_charges_the_model_that_answered():
+    class Hedged(FakeLLM):
+        def call(self, messages, *args, **kwargs):
+            answered_by("hedge")
+            return super().call(messages)
+
+    budget = RunBudget(max_tokens=0)
+    with run_budget_scope(budget):
+        budgeted(Hedged("primary")).call("p" * 400)
+    by_model = budget.stats()["by_model"]
+    assert by_model["primary"]["tokens"] == 101  # the prompt it read
+    assert by_model["hedge"]["tokens"] == 101 + 11  # prompt and reply
+
+
+def test_a_cancelled_budget_refuses_calls():
+    llm = budgeted(FakeLLM("big"))
+    budget = RunBudget(max_tokens=0)
+    budget.cancel()
+    with run_budget_scope(budget), pytest.raises(BudgetExceeded):
+        llm.call("prompt")
+    assert llm.calls == 0
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, flight_key
+
+
+def test_flight_key_depends_on_every_part():
+    assert flight_key("submit", "session-a", "Title", 3) == flight_key("submit", "session-a", "Title", 3)
+    assert flight_key("submit", "session-a", "Title", 3) != flight_key("submit", "session-b", "Title", 3)
+    assert flight_key("submit", "session-a", "Title", 3) != flight_key("submit", "session-a", "Title", 4)
+
+
+def run_concurrently(flight, key, fn, callers):
+    """Start ``callers`` threads on ``key``; the first holds the flight until the others have joined it."""
+    release = threading.Event()
+    results, errors = [], []
+
+    def leader_fn():
+        release.wait(2)
+        return fn()
+
+    def call():
+        try:
+            results.append(flight.do(key, leader_fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while flight.metrics()["coalesced"] < callers - 1 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+    return results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    results, errors = run_concurrently(flight, "k", lambda: calls.append(1) or "result", callers=5)
+    assert results == ["result"] * 5 and errors == []
+    assert len(calls) == 1
+    assert flight.metrics() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_followers_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    results, errors = run_concurrently(flight, "k", fail, callers=3)
+    assert results == []
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+    assert flight.in_flight() == 0
+
+
+def test_sequential_calls_and_other_keys_run_again():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.do("b", lambda: 3) == 3
+    with pytest.raises(KeyError):
+        flight.do("a", lambda: {}["missing"])
+    assert flight.do("a", lambda: 4) == 4  # a failure does not stick to the key
+    assert flight.metrics()["executions"] == 5
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from utils import run_budget
+from utils.run_budget import RunBudget, run_budget_scope
+from utils.speculation import Speculator, claim, speculation_scope, speculation_stats
+
+
+@pytest.fixture(autouse=True)
+def flat_prices(monkeypatch):
+    monkeypatch.setattr(run_budget, "call_cost", lambda model, prompt, completion: 0.0)
+
+
+@pytest.fixture
+def speculator():
+    speculator = Speculator(stable_turns=1, workers=1)
+    yield speculator
+    speculator._pool.shutdown(wait=True)
+
+
+def stats_delta(before):
+    return {key: value - before[key] for key, value in speculation_stats().items()}
+
+
+def spend(tokens, result="plan"):
+    def fn():
+        run_budget.current_budget().charge("m", tokens, 0)
+        return result
+    return fn
+
+
+def test_observe_waits_for_a_stable_request(speculator):
+    assert not speculator.observe("s", "request")
+    assert speculator.observe("s", "request")
+    assert not speculator.observe("s", "edited")  # the count starts over
+
+
+def test_a_claimed_speculation_moves_its_spend_to_the_run(speculator):
+    before = speculation_stats()
+    speculator.start("s", "request", "planning_task", "key", spend(100))
+    budget = RunBudget(max_tokens=0)
+    with run_budget_scope(budget), speculation_scope(speculator.take("s")):
+        assert claim("planning_task", "key") == "plan"
+        assert claim("planning_task", "key") is None  # claimed only once
+    assert budget.stats()["tokens"] == 100
+    delta = stats_delta(before)
+    assert (delta["started"], delta["claimed"], delta["discarded"], delta["tokens"]) == (1, 1, 0, 100)
+
+
+def test_changed_inputs_discard_the_speculation(speculator):
+    before = speculation_stats()
+    speculator.start("s", "request", "planning_task", "key", spend(40))
+    speculation = speculator.take("s")
+    speculation.future.result()
+    with speculation_scope(speculation):
+        assert claim("other_task", "key") is None
+        assert claim("planning_task", "stale key") is None
+    assert speculation.discarded
+    delta = stats_delta(before)
+    assert (delta["claimed"], delta["discarded"], delta["discarded_tokens"]) == (0, 1, 40)
+
+
+def test_a_changed_request_discards_the_running_speculation(speculator):
+    release = threading.Event()
+    speculator.observe("s", "request")
+    speculator.start("s", "request", "planning_task", "key", lambda: release.wait(5))
+    queued_calls = []
+    speculator.start("t", "request", "planning_task", "key", lambda: queued_calls.append(1))
+    queued = speculator._running["t"]
+
+    assert not speculator.observe("s", "edited")
+    assert "s" not in speculator._running
+    speculator.forget("t")  # still queued behind "s" on the single worker
+    release.set()
+    assert queued.future.cancelled() and queued_calls == []
+
+
+def test_a_discarded_speculation_makes_no_more_llm_calls(speculator):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        started.set()
+        release.wait(5)
+        calls.append(run_budget.current_budget().cancelled)
+        return "plan"
+
+    speculator.start("s", "request", "planning_task", "key", fn)
+    started.wait(5)
+    speculator.forget("s")
+    release.set()
+    speculator._pool.shutdown(wait=True)
+    assert calls == [True]  # budgeted LLM wrappers refuse to call under a cancelled budget
@@ -1,6 +1,7 @@
 # tools/accessibility_checker_tool.py
 from crewai.tools import tool
 import re
+from utils.tool_output import compact_json, compact_tool_output
 
 @tool("Accessibility Checker Tool")
 def accessibility_checker_tool(content: str, content_type: str = "text", check_level: str = "AA") -> str:
@@ -139,6 +140,18 @@ def accessibility_checker_tool(content: str, content_type: str = "text", check_l
     udl_scores = [data["score"] for data in udl_analysis.values()]
     overall_score = (text_score + sum(udl_scores) / len(udl_scores)) / 2
     
+    if compact_tool_output():
+        return compact_json({
+            "score": overall_score,
+            "wcag_level": check_level,
+            "issues": text_analysis["issues"],
+            "suggestions": text_analysis["suggestions"],
+            "udl": {
+                principle: {"score": data["score"], "recommendations": data["recommendations"]}
+                for principle, data in udl_analysis.items()
+            },
+        })
+    
     report += f"**Overall Accessibility Score: {overall_score:.1f}/100**\n"
     report += f"**WCAG Level Target: {check_level}**\n\n"
     
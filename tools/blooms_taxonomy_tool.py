@@ -1,5 +1,6 @@
 # tools/blooms_taxonomy_tool.py
 from crewai.tools import tool
+from utils.tool_output import compact_json, compact_tool_output
 
 @tool("Blooms Taxonomy Validator")
 def blooms_taxonomy_tool(content: str, target_level: str = "", course_level: str = "undergraduate") -> str:
@@ -106,6 +107,20 @@ def blooms_taxonomy_tool(content: str, target_level: str = "", course_level: str
     else:
         alignment = {"is_appropriate": False, "current_complexity": 0}
     
+    if compact_tool_output():
+        findings = {"detected_level": current_analysis["level"]}
+        if current_analysis["level"] != "unidentified":
+            findings.update({
+                "complexity": current_analysis["complexity"],
+                "verb": current_analysis.get("verb"),
+                "aligned": alignment["is_appropriate"],
+                "recommended_range": alignment["recommended_range"],
+                "recommended_levels": alignment["recommended_levels"],
+            })
+        if target_level and target_level.lower() in blooms_levels:
+            findings["target_verbs"] = blooms_levels[target_level.lower()]["verbs"][:5]
+        return compact_json(findings)
+
     # Format response
     result = "**Bloom's Taxonomy Analysis**\n\n"
     
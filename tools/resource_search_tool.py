@@ -1,5 +1,6 @@
 # tools/resource_search_tool.py
 from crewai.tools import tool
+from utils.tool_output import compact_json, compact_tool_output
 
 @tool("Resource Search Tool")
 def resource_search_tool(topic: str, resource_type: str = "all", academic_level: str = "undergraduate", max_results: int = 10) -> str:
@@ -184,6 +185,15 @@ def resource_search_tool(topic: str, resource_type: str = "all", academic_level:
     if resource_type in ["all", "activity"]:
         results["resources"]["activities"] = generate_activity_suggestions(topic, academic_level)
     
+    if compact_tool_output():
+        return compact_json({
+            "topic": topic,
+            "resources": {
+                category: [{"title": item["title"], "url": item.get("url")} for item in items[:max_results]]
+                for category, items in results["resources"].items()
+            },
+        })
+    
     # Format results for educational use
     formatted_output = f"# Educational Resources for: {topic.title()}\n\n"
     formatted_output += f"**Academic Level:** {academic_level.title()}\n"
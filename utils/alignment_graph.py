@@ -0,0 +1,367 @@
+# utils/alignment_graph.py
+# Curriculum alignment graph built locally from a CourseContent.
+#
+# Nodes are the course TLOs, their ELOs (``elos_by_tlo``, keyed "TLO 1", ...),
+# the weeks and each week's objectives, activities and assessments; every
+# objective carries its Bloom level. Week objectives are linked to the TLO/ELO
+# they restate, and activities and assessments to the TLOs/ELOs they name, by
+# an explicit "ELO 1.2" reference, the same normalized statement or, failing
+# both, the best word overlap found through an inverted index, so building the
+# graph is linear in the size of the course. An activity or assessment that
+# names no objective counts for every objective its week teaches. The gap
+# queries (unassessed and unpracticed objectives, weeks without PRRR signals,
+# Bloom progression violations) then walk the graph once, and
+# alignment_report() renders them as the short brief EditorAi reviews instead
+# of re-deriving alignment from the whole course.
+
+import re
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from models.models import CourseContent, WeeklyModule
+from utils.settings import env_float, env_int
+
+BLOOM_LEVELS = ("Remember", "Understand", "Apply", "Analyze", "Evaluate", "Create")
+# Older and inflected names of the levels, lower-cased
+BLOOM_ALIASES = {
+    "knowledge": 1, "remembering": 1, "recall": 1,
+    "comprehension": 2, "comprehend": 2, "understanding": 2,
+    "application": 3, "applying": 3,
+    "analyse": 4, "analysis": 4, "analyzing": 4, "analysing": 4,
+    "evaluation": 5, "evaluating": 5, "synthesis": 6, "creating": 6, "creation": 6,
+}
+PRRR_DIMENSIONS = ("personal", "relatable", "relative", "real_world")
+KDKA_DIMENSIONS = ("knowledge", "delivery", "context", "assessment")
+NOT_AVAILABLE = "Not available."
+
+_REFERENCE = re.compile(r"\b([TE])LO[\s\-_]*(\d+(?:\.\d+)?)", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or students student the their to use using "
+    "will with within able learners learner".split()
+)
+
+
+def bloom_rank(level: Optional[str]) -> int:
+    """1 (Remember) to 6 (Create); 0 when the level is missing or not recognized."""
+    if not level:
+        return 0
+    name = level.strip().lower()
+    for rank, canonical in enumerate(BLOOM_LEVELS, start=1):
+        if name.startswith(canonical.lower()):
+            return rank
+    return BLOOM_ALIASES.get(name, 0)
+
+
+def _normalized(text: str) -> str:
+    return " ".join(_WORD.findall(_REFERENCE.sub("", text.lower())))
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(word for word in _normalized(text).split() if word not in _STOPWORDS)
+
+
+class Objective(NamedTuple):
+    """A TLO or ELO node."""
+    id: str  # "TLO 1", "ELO 1.2"
+    statement: str
+    bloom: int
+    tlo: str  # the TLO itself for a TLO
+
+
+class WeekObjective(NamedTuple):
+    """A week's learning objective and the course objective it restates (None when unlinked)."""
+    week: int
+    statement: str
+    bloom: int
+    target: Optional[str]
+
+
+class WeekItem(NamedTuple):
+    """A week's activity or assessment and the TLOs/ELOs it names (empty when it names none)."""
+    week: int
+    text: str
+    targets: Tuple[str, ...]
+
+
+class Violation(NamedTuple):
+    """A Bloom progression violation."""
+    objective: str
+    message: str
+
+
+class AlignmentGraph:
+    """TLO -> ELO links of one CourseContent, and the week objectives, activities and assessments linked to them."""
+
+    def __init__(self, content: CourseContent, match_threshold: Optional[float] = None):
+        self.match_threshold = (
+            env_float("HAILEI_ALIGNMENT_MATCH_THRESHOLD", 0.5) if match_threshold is None else match_threshold
+        )
+        self.objectives: Dict[str, Objective] = {}
+        self.elos: Dict[str, List[str]] = defaultdict(list)  # TLO id -> ELO ids
+        self.weeks: Dict[int, WeeklyModule] = {module.week_number: module for module in content.weekly_modules}
+        self.week_objectives: List[WeekObjective] = []
+        self.taught_in: Dict[str, List[int]] = defaultdict(list)  # objective id -> weeks, in course order
+        self.activities: Dict[int, List[WeekItem]] = {}
+        self.assessments: Dict[int, List[WeekItem]] = {}
+
+        self._add_objectives(content)
+        self._index()
+        for week, module in sorted(self.weeks.items()):
+            self.activities[week] = [self._item(week, text) for text in dict.fromkeys(module.activities)]
+            self.assessments[week] = [
+                self._item(week, text) for text in dict.fromkeys(module.assessments + module.kdka.assessment)
+            ]
+            for objective in module.learning_objectives:
+                target = self._link(objective.statement)
+                self.week_objectives.append(
+                    WeekObjective(week, objective.statement, bloom_rank(objective.bloom_level), target)
+                )
+                if target is not None and week not in self.taught_in[target]:
+                    self.taught_in[target].append(week)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _add_objectives(self, content: CourseContent):
+        for number, tlo in enumerate(content.tlos, start=1):
+            self._add(Objective(f"TLO {number}", tlo.statement, bloom_rank(tlo.bloom_level), f"TLO {number}"))
+        for key, elos in content.elos_by_tlo.items():
+            tlo_id = self._tlo_for_key(key, len(self.elos) + 1)
+            for number, elo in enumerate(elos, start=1):
+                elo_id = f"ELO {tlo_id.split()[-1]}.{number}"
+                self._add(Objective(elo_id, elo.statement, bloom_rank(elo.bloom_level), tlo_id))
+                self.elos[tlo_id].append(elo_id)
+
+    def _add(self, objective: Objective):
+        self.objectives[objective.id] = objective
+
+    def _tlo_for_key(self, key: str, position: int) -> str:
+        """TLO id of an ``elos_by_tlo`` key: "TLO 2", a TLO statement or, failing both, its position."""
+        reference = _REFERENCE.search(key)
+        if reference and reference.group(1).upper() == "T":
+            return f"TLO {reference.group(2)}"
+        normalized = _normalized(key)
+        for objective in self.objectives.values():
+            if objective.id.startswith("TLO") and _normalized(objective.statement) == normalized:
+                return objective.id
+        return f"TLO {position}"
+
+    def _index(self):
+        self._by_statement = {_normalized(o.statement): o.id for o in self.objectives.values()}
+        self._by_word: Dict[str, List[str]] = defaultdict(list)
+        self._word_counts: Dict[str, int] = {}
+        for objective in self.objectives.values():
+            words = _words(objective.statement)
+            self._word_counts[objective.id] = len(words)
+            for word in words:
+                self._by_word[word].append(objective.id)
+
+    def _link(self, statement: str) -> Optional[str]:
+        """The TLO/ELO a week objective restates: explicit reference, same statement, else best word overlap."""
+        for kind, number in _REFERENCE.findall(statement):
+            objective_id = f"{kind.upper()}LO {number}"
+            if objective_id in self.objectives:
+                return objective_id
+        exact = self._by_statement.get(_normalized(statement))
+        if exact is not None:
+            return exact
+
+        words = _words(statement)
+        overlap: Dict[str, int] = defaultdict(int)
+        for word in words:
+            for objective_id in self._by_word.get(word, ()):
+                overlap[objective_id] += 1
+        best, best_score = None, 0.0
+        for objective_id, shared in overlap.items():
+            score = shared / max(1, min(len(words), self._word_counts[objective_id]))
+            # On a tie prefer the ELO, the finer-grained objective
+            if score > best_score or (score == best_score and objective_id.startswith("ELO")):
+                best, best_score = objective_id, score
+        return best if best_score >= self.match_threshold else None
+
+    def _item(self, week: int, text: str) -> WeekItem:
+        """An activity/assessment node linked to every objective it references, else to its best match."""
+        named = [f"{kind.upper()}LO {number}" for kind, number in _REFERENCE.findall(text)]
+        targets = [objective_id for objective_id in named if objective_id in self.objectives]
+        if not targets:
+            target = self._link(text)
+            targets = [target] if target is not None else []
+        return WeekItem(week, text, tuple(dict.fromkeys(targets)))
+
+    # ------------------------------------------------------------------
+    # Gap queries
+    # ------------------------------------------------------------------
+
+    def weeks_teaching(self, objective_id: str) -> List[int]:
+        """Weeks that teach an objective; a TLO is also taught by the weeks teaching its ELOs."""
+        weeks = list(self.taught_in.get(objective_id, ()))
+        for elo_id in self.elos.get(objective_id, ()):
+            weeks.extend(self.taught_in.get(elo_id, ()))
+        return sorted(set(weeks))
+
+    def _uncovered(self, items: Dict[int, List[WeekItem]]) -> Dict[str, List[int]]:
+        """Objectives no item covers, mapped to the weeks that teach them. An item covers the
+        objectives it names (a TLO also through its ELOs); one naming none covers its week's."""
+        named: Set[str] = set()
+        unlinked_weeks: Set[int] = set()
+        for week, week_items in items.items():
+            for item in week_items:
+                named.update(item.targets)
+                if not item.targets:
+                    unlinked_weeks.add(week)
+        gaps = {}
+        for objective_id in self.objectives:
+            weeks = self.weeks_teaching(objective_id)
+            if named.intersection([objective_id, *self.elos.get(objective_id, ())]):
+                continue
+            if not unlinked_weeks.intersection(weeks):
+                gaps[objective_id] = weeks
+        return gaps
+
+    def unassessed_objectives(self) -> Dict[str, List[int]]:
+        """TLOs/ELOs no assessment covers, mapped to the weeks that teach them (empty: not taught)."""
+        return self._uncovered(self.assessments)
+
+    def unpracticed_objectives(self) -> Dict[str, List[int]]:
+        """Taught TLOs/ELOs no activity covers, mapped to the weeks that teach them."""
+        return {objective_id: weeks for objective_id, weeks in self._uncovered(self.activities).items() if weeks}
+
+    def prrr_gaps(self) -> Dict[int, List[str]]:
+        """Weeks missing PRRR dimensions, mapped to the missing ones."""
+        gaps = {}
+        for week, module in sorted(self.weeks.items()):
+            missing = [name for name in PRRR_DIMENSIONS if not (getattr(module.prrr, name) or "").strip()]
+            if missing:
+                gaps[week] = missing
+        return gaps
+
+    def weeks_without_prrr(self) -> List[int]:
+        """Weeks with no PRRR signal at all."""
+        return [week for week, missing in self.prrr_gaps().items() if len(missing) == len(PRRR_DIMENSIONS)]
+
+    def kdka_gaps(self) -> Dict[int, List[str]]:
+        """Weeks missing KDKA elements, mapped to the missing ones."""
+        gaps = {}
+        for week, module in sorted(self.weeks.items()):
+            missing = [name for name in KDKA_DIMENSIONS if not getattr(module.kdka, name)]
+            if missing:
+                gaps[week] = missing
+        return gaps
+
+    def bloom_violations(self, tolerance: Optional[int] = None) -> List[Violation]:
+        """ELOs above their TLO's Bloom level, and weeks that revisit a TLO more than
+        ``tolerance`` levels (HAILEI_BLOOM_REGRESSION_TOLERANCE, default 1) below an earlier week."""
+        tolerance = env_int("HAILEI_BLOOM_REGRESSION_TOLERANCE", 1) if tolerance is None else tolerance
+        violations = []
+        for tlo_id, elo_ids in self.elos.items():
+            tlo = self.objectives.get(tlo_id)
+            if tlo is None or not tlo.bloom:
+                continue
+            for elo_id in elo_ids:
+                elo = self.objectives[elo_id]
+                if elo.bloom > tlo.bloom:
+                    violations.append(Violation(elo_id, (
+                        f"{elo_id} ({BLOOM_LEVELS[elo.bloom - 1]}) is above {tlo_id} ({BLOOM_LEVELS[tlo.bloom - 1]})"
+                    )))
+
+        peak: Dict[str, tuple] = {}  # TLO id -> (highest level so far, week it was reached)
+        for item in self.week_objectives:
+            if item.target is None or not item.bloom:
+                continue
+            tlo_id = self.objectives[item.target].tlo
+            level, week = peak.get(tlo_id, (0, 0))
+            if level - item.bloom > tolerance and item.week > week:
+                violations.append(Violation(tlo_id, (
+                    f"{tlo_id}: week {item.week} is at {BLOOM_LEVELS[item.bloom - 1]} after week {week} "
+                    f"reached {BLOOM_LEVELS[level - 1]}"
+                )))
+            if item.bloom > level:
+                peak[tlo_id] = (item.bloom, item.week)
+        return violations
+
+    def unlinked_week_objectives(self) -> List[WeekObjective]:
+        """Week objectives that restate no TLO/ELO."""
+        return [item for item in self.week_objectives if item.target is None]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tlos": len([o for o in self.objectives if o.startswith("TLO")]),
+            "elos": len([o for o in self.objectives if o.startswith("ELO")]),
+            "weeks": len(self.weeks),
+            "week_objectives": len(self.week_objectives),
+            "activities": sum(len(items) for items in self.activities.values()),
+            "assessments": sum(len(items) for items in self.assessments.values()),
+        }
+
+
+# ----------------------------------------------------------------------------
+# Gap report
+# ----------------------------------------------------------------------------
+
+def _short(text: str, limit: int = 70) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _weeks(weeks) -> str:
+    return ", ".join(str(week) for week in weeks)
+
+
+def _section(title: str, lines: List[str], limit: int) -> List[str]:
+    if not lines:
+        return []
+    section = [f"{title} ({len(lines)}):"] + [f"- {line}" for line in lines[:limit]]
+    if len(lines) > limit:
+        section.append(f"- ... and {len(lines) - limit} more")
+    return section
+
+
+def alignment_report(content: Optional[CourseContent], limit: Optional[int] = None) -> str:
+    """Compact Markdown list of the alignment gaps of ``content``, at most ``limit`` lines per kind
+    (HAILEI_ALIGNMENT_REPORT_ITEMS, default 10)."""
+    if content is None:
+        return NOT_AVAILABLE
+    limit = env_int("HAILEI_ALIGNMENT_REPORT_ITEMS", 10) if limit is None else limit
+    graph = AlignmentGraph(content)
+    stats = graph.stats()
+
+    unassessed = []
+    for objective_id, weeks in graph.unassessed_objectives().items():
+        where = f"taught in week {_weeks(weeks)}, never assessed" if weeks else "not taught in any week"
+        unassessed.append(f'{objective_id} "{_short(graph.objectives[objective_id].statement)}": {where}')
+    unpracticed = [
+        f'{objective_id} "{_short(graph.objectives[objective_id].statement)}": taught in week {_weeks(weeks)}, '
+        "no activity practices it"
+        for objective_id, weeks in graph.unpracticed_objectives().items()
+    ]
+    prrr = [
+        f"week {week}: " + ("no PRRR signals" if len(missing) == len(PRRR_DIMENSIONS) else f"missing {', '.join(missing)}")
+        for week, missing in graph.prrr_gaps().items()
+    ]
+    kdka = [f"week {week}: missing {', '.join(missing)}" for week, missing in graph.kdka_gaps().items()]
+    bloom = [violation.message for violation in graph.bloom_violations()]
+    unleveled = [o.id for o in graph.objectives.values() if not o.bloom]
+    if unleveled:
+        bloom.append(f"no recognized Bloom level: {', '.join(unleveled)}")
+    unlinked = [f'week {item.week}: "{_short(item.statement)}"' for item in graph.unlinked_week_objectives()]
+
+    lines = [
+        f"Alignment graph: {stats['tlos']} TLOs, {stats['elos']} ELOs, {stats['weeks']} weeks, "
+        f"{stats['week_objectives']} week objectives, {stats['activities']} activities, "
+        f"{stats['assessments']} assessments."
+    ]
+    sections = [
+        _section("Unassessed objectives", unassessed, limit),
+        _section("Objectives without activities", unpracticed, limit),
+        _section("Bloom progression violations", bloom, limit),
+        _section("Weeks with PRRR gaps", prrr, limit),
+        _section("Weeks with KDKA gaps", kdka, limit),
+        _section("Week objectives not linked to any TLO/ELO", unlinked, limit),
+    ]
+    if not any(sections):
+        lines.append("No alignment gaps found.")
+    for section in sections:
+        lines.extend(section)
+    return "\n".join(lines)
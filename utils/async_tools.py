@@ -0,0 +1,137 @@
+# utils/async_tools.py
+# Non-blocking execution of the tools in tools/ for async callers.
+#
+# The tools are plain synchronous functions. async_tool() gives a crewai @tool
+# an arun() that runs the call in a shared thread pool (HAILEI_TOOL_WORKERS),
+# in a copy of the caller's context so run-scoped memoization and the output
+# mode still apply, so an event loop serving many sessions is never blocked by
+# a tool. offloaded() additionally sends the body of a CPU-bound tool to a
+# shared process pool when HAILEI_TOOL_POOL=process, so large content analyses
+# run outside the GIL. design_tools() applies these wrappers, with per-run
+# memoization, to the tools the design agents use. scripts/tool_async_bench.py
+# measures the throughput and event-loop lag of each mode.
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from utils.settings import env_int, env_str
+from utils.tool_cache import memoized_tool
+from utils.tool_output import compact_output, compact_tool_output
+
+_pools: Dict[str, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _workers() -> int:
+    return max(1, env_int("HAILEI_TOOL_WORKERS", min(8, os.cpu_count() or 1)))
+
+
+def tool_threads() -> ThreadPoolExecutor:
+    """The thread pool async tool calls run in."""
+    with _pools_lock:
+        if "threads" not in _pools:
+            _pools["threads"] = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="hailei-tool")
+        return _pools["threads"]
+
+
+def tool_processes() -> Optional[ProcessPoolExecutor]:
+    """The process pool for CPU-bound tool bodies, or None unless HAILEI_TOOL_POOL=process."""
+    if env_str("HAILEI_TOOL_POOL", "thread").lower() != "process":
+        return None
+    with _pools_lock:
+        if "processes" not in _pools:
+            # spawn: forking a process that runs threads (limiter, session writer) can deadlock the child
+            _pools["processes"] = ProcessPoolExecutor(
+                max_workers=_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pools["processes"]
+
+
+def _warm(modules):
+    for module in modules:
+        importlib.import_module(module)
+    time.sleep(0.2)  # keep this worker busy so the next warm-up call starts another one
+
+
+def warm_tool_processes(modules=("tools.blooms_taxonomy_tool", "tools.accessibility_checker_tool")):
+    """Start every process pool worker and import the tools there, so no call pays the start-up."""
+    pool = tool_processes()
+    if pool is not None:
+        for future in [pool.submit(_warm, modules) for _ in range(_workers())]:
+            future.result()
+
+
+def shutdown_tool_pools():
+    """Stop the shared pools; they are recreated from the current settings on next use."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+def _call_in_process(module: str, name: str, kwargs: Dict[str, Any], compact: bool) -> Any:
+    tool = getattr(importlib.import_module(module), name)
+    with compact_output(compact):
+        return inspect.unwrap(tool.func)(**kwargs)
+
+
+def offloaded(tool):
+    """Run the tool's body in the shared process pool when one is configured. Safe to call twice.
+
+    Apply before memoized_tool(), so memoization stays in the calling process.
+    """
+    if getattr(tool, "_hailei_offloaded", False):
+        return tool
+    inner = tool.func
+    module, name = inner.__module__, inner.__name__
+
+    @functools.wraps(inner)
+    def func(*args, **kwargs):
+        pool = tool_processes()
+        if pool is None:
+            return inner(*args, **kwargs)
+        kwargs = inspect.signature(inner).bind(*args, **kwargs).arguments
+        return pool.submit(_call_in_process, module, name, dict(kwargs), compact_tool_output()).result()
+
+    tool.func = func
+    object.__setattr__(tool, "_hailei_offloaded", True)
+    return tool
+
+
+def async_tool(tool):
+    """Give a crewai @tool an arun() that does not block the event loop. Safe to call twice."""
+    if getattr(tool, "_hailei_async", False):
+        return tool
+
+    async def arun(*args, **kwargs):
+        call = functools.partial(tool.func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(tool_threads(), contextvars.copy_context().run, call)
+
+    # BaseTool.arun() validates the arguments and awaits _arun().
+    object.__setattr__(tool, "_arun", arun)
+    object.__setattr__(tool, "_hailei_async", True)
+    return tool
+
+
+def design_tools():
+    """The design agents' tools, memoized per run, async and (CPU-bound ones) offloadable. Safe to call twice."""
+    from tools.accessibility_checker_tool import accessibility_checker_tool
+    from tools.blooms_taxonomy_tool import blooms_taxonomy_tool
+    from tools.resource_search_tool import resource_search_tool
+
+    return (
+        async_tool(memoized_tool(offloaded(blooms_taxonomy_tool), case_insensitive=("target_level",))),
+        async_tool(memoized_tool(offloaded(accessibility_checker_tool), case_insensitive=("content_type",))),
+        async_tool(memoized_tool(resource_search_tool, case_insensitive=("resource_type", "academic_level"))),
+    )
@@ -0,0 +1,78 @@
+# utils/config_cache.py
+# Pre-parsed snapshots of config/agents.yaml and config/tasks.yaml.
+#
+# Parsed configs are pickled next to a (mtime, size) key of the source file, so
+# a restart skips YAML parsing unless the file changed. Every call returns a
+# fresh copy because CrewBase mutates the config dicts while wiring agents.
+
+import hashlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import yaml
+
+from utils.log import fields, get_logger
+from utils.settings import env_str
+
+try:  # libyaml is several times faster when available
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _Loader
+
+log = get_logger("config_cache")
+
+_memo: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+_memo_lock = threading.Lock()
+
+
+def _snapshot_path(config_path: Path) -> Path:
+    digest = hashlib.sha1(str(config_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    cache_dir = Path(env_str("HAILEI_CACHE_DIR", ".cache")) / "config"
+    return cache_dir / f"{config_path.stem}-{digest}.pickle"
+
+
+def _parse(config_path: Path) -> Dict[str, Any]:
+    with open(config_path, encoding="utf-8") as file:
+        content = yaml.load(file, Loader=_Loader)
+    return content if isinstance(content, dict) else {}
+
+
+def load_yaml_snapshot(config_path) -> Dict[str, Any]:
+    """Drop-in replacement for CrewBase.load_yaml backed by an mtime-checked snapshot."""
+    config_path = Path(config_path)
+    stat = config_path.stat()  # raises FileNotFoundError like CrewBase.load_yaml
+    key = (stat.st_mtime_ns, stat.st_size)
+    memo_key = str(config_path.resolve())
+
+    with _memo_lock:
+        cached = _memo.get(memo_key)
+    if cached and cached[0] == key:
+        return pickle.loads(cached[1])
+
+    snapshot = _snapshot_path(config_path)
+    payload = None
+    try:
+        with open(snapshot, "rb") as file:
+            stored_key, stored_payload = pickle.load(file)
+        if tuple(stored_key) == key:
+            payload = stored_payload
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        payload = None
+
+    if payload is None:
+        payload = pickle.dumps(_parse(config_path), protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            snapshot.parent.mkdir(parents=True, exist_ok=True)
+            tmp = snapshot.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as file:
+                pickle.dump((key, payload), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, snapshot)
+        except OSError as e:
+            log.warning("Could not write config snapshot", extra=fields(path=str(snapshot), error=str(e)))
+
+    with _memo_lock:
+        _memo[memo_key] = (key, payload)
+    return pickle.loads(payload)
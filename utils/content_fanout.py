@@ -0,0 +1,76 @@
+# utils/content_fanout.py
+# Helpers for authoring CourseContent as one outcomes task plus one task per week.
+#
+# The per-week tasks run in parallel (see HaileiCrew.author_content_fanout);
+# this module only prepares their inputs and merges the results locally.
+
+import json
+from typing import List, Optional
+
+from models.models import (
+    CourseContent,
+    CourseFoundation,
+    CourseOutcomes,
+    CourseRequest,
+    WeeklyModule,
+)
+
+
+def week_plans(foundation: Optional[CourseFoundation], duration_weeks: int) -> List[dict]:
+    """Return one plan per week, mapping IPDAi's modules onto the course weeks.
+
+    When the foundation has fewer (or more) modules than weeks, consecutive weeks
+    share a module so every week still gets a plan.
+    """
+    modules = foundation.modules if foundation else []
+    plans = []
+    for week in range(1, duration_weeks + 1):
+        plan = {"week_number": week, "duration_weeks": duration_weeks}
+        if modules:
+            module = modules[(week - 1) * len(modules) // duration_weeks]
+            plan["module"] = module.model_dump()
+        plans.append(plan)
+    return plans
+
+
+def week_inputs(inputs: dict, plan: dict, outcomes: Optional[CourseOutcomes], draft: str = "Not available.") -> dict:
+    """Inputs for one weekly_module_task run; ``draft`` is a warm-start module for this week."""
+    return dict(
+        inputs,
+        week_number=plan["week_number"],
+        week_plan=json.dumps(plan, indent=2),
+        course_outcomes=outcomes.model_dump_json(indent=2) if outcomes is not None else "Not available.",
+        warm_start_week=draft,
+    )
+
+
+def fallback_week(plan: dict) -> WeeklyModule:
+    """Minimal module built from the week plan when authoring that week failed."""
+    module = plan.get("module") or {}
+    return WeeklyModule(
+        week_number=plan["week_number"],
+        title=module.get("title") or f"Week {plan['week_number']}",
+        overview=module.get("description"),
+        learning_objectives=module.get("learning_objectives") or [],
+    )
+
+
+def merge_course_content(
+    course_request: CourseRequest,
+    foundation: Optional[CourseFoundation],
+    outcomes: Optional[CourseOutcomes],
+    modules: List[WeeklyModule],
+) -> CourseContent:
+    """Assemble and validate the CourseContent from the fan-out results."""
+    outcomes = outcomes or CourseOutcomes()
+    return CourseContent.model_validate({
+        "course_title": foundation.course_title if foundation else course_request.course_title,
+        "course_description": foundation.course_description if foundation else course_request.course_description,
+        "duration_weeks": course_request.course_duration_weeks,
+        "level": foundation.level if foundation else course_request.course_level,
+        "tlos": outcomes.tlos,
+        "elos_by_tlo": outcomes.elos_by_tlo,
+        "weekly_modules": sorted(modules, key=lambda m: m.week_number),
+        "kdka_overview": outcomes.kdka_overview,
+        "prrr_overview": outcomes.prrr_overview,
+    })
@@ -0,0 +1,106 @@
+# utils/context_projection.py
+# Task-specific pruning of the upstream artifacts handed to design tasks.
+#
+# A task in config/tasks.yaml may declare a ``context_projection``: for each
+# upstream input (course_foundation, course_content, ...), the dotted field
+# paths it actually reads, e.g. ``weekly_modules.title``. The projection is
+# computed locally from the typed artifact before prompting, and the token
+# size of each task's context before and after pruning is recorded for the
+# run report.
+
+import contextvars
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from utils.rate_limiter import estimate_tokens
+
+_run_report: contextvars.ContextVar = contextvars.ContextVar("hailei_context_report", default=None)
+
+
+def project(data: Any, paths: List[str]) -> Any:
+    """Keep only ``paths`` (dotted field names) of dumped model data.
+
+    Lists are projected element by element, so ``weekly_modules.title`` keeps
+    the title of every module. A path naming a whole field keeps it unchanged.
+    """
+    if isinstance(data, list):
+        return [project(item, paths) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    nested: Dict[str, List[str]] = {}
+    for path in paths:
+        head, _, rest = path.partition(".")
+        if head in data:
+            children = nested.setdefault(head, [])
+            if rest and children is not None:
+                children.append(rest)
+            elif not rest:
+                nested[head] = None  # whole field wins over sub-paths
+    return {
+        key: data[key] if children is None else project(data[key], children)
+        for key, children in nested.items()
+    }
+
+
+class ContextReport:
+    """Context tokens per design task before and after projection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict[str, int]] = {}
+
+    def record(self, task_name: str, before: int, after: int):
+        with self._lock:
+            row = self._rows.setdefault(task_name, {"runs": 0, "before": 0, "after": 0})
+            row["runs"] += 1
+            row["before"] += before
+            row["after"] += after
+
+    def rows(self) -> Dict[str, Dict[str, int]]:
+        """Per-task totals, largest pruned context first."""
+        with self._lock:
+            return dict(sorted(self._rows.items(), key=lambda item: item[1]["after"], reverse=True))
+
+
+@contextmanager
+def context_report_scope():
+    """Collect context pruning figures for the design tasks run in the enclosed block."""
+    report = ContextReport()
+    token = _run_report.set(report)
+    try:
+        yield report
+    finally:
+        _run_report.reset(token)
+
+
+def projected_inputs(
+    task_name: str,
+    projection: Optional[Dict[str, List[str]]],
+    inputs: dict,
+    artifacts: Dict[str, Any],
+) -> dict:
+    """Inputs for one task with its declared upstream projections applied.
+
+    ``artifacts`` maps input keys to the typed upstream outputs; inputs whose
+    artifact is missing (raw fallback text) are passed through unchanged.
+    """
+    projection = projection or {}
+    task_inputs = dict(inputs)
+    before = after = 0
+    for key in projection:
+        if key not in inputs:
+            continue
+        full = inputs[key]
+        before += estimate_tokens(full)
+        artifact = artifacts.get(key)
+        if artifact is not None:
+            task_inputs[key] = json.dumps(project(artifact.model_dump(mode="json"), projection[key]), indent=2)
+        after += estimate_tokens(task_inputs[key])
+
+    report = _run_report.get()
+    if report is not None and projection:
+        report.record(task_name, before, after)
+    return task_inputs
@@ -0,0 +1,219 @@
+# utils/design_archive.py
+# Local archive of completed course designs with a MinHash similarity index.
+#
+# Every finished design is stored with a MinHash signature of its CourseRequest
+# (character shingles of title, description, level and expectations). LSH
+# banding narrows a lookup to a handful of candidates, whose similarity is then
+# estimated from their signatures, so finding the closest prior design does not
+# scan the whole archive.
+
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, NamedTuple, Optional
+
+from models.models import CourseContent, CourseFoundation, CourseRequest
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: candidates above roughly 0.5 Jaccard similarity
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)  # fixed seed: signatures must be stable across restarts
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    design_id TEXT PRIMARY KEY,
+    course_title TEXT NOT NULL,
+    request_json TEXT NOT NULL,
+    foundation_json TEXT,
+    content_json TEXT,
+    signature TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    design_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets (band, bucket);
+"""
+
+
+class SimilarDesign(NamedTuple):
+    """A prior design close enough to reuse as a warm start."""
+    design_id: str
+    course_title: str
+    similarity: float
+    foundation: Optional[CourseFoundation]
+    content: Optional[CourseContent]
+
+
+# ----------------------------------------------------------------------------
+# MinHash
+# ----------------------------------------------------------------------------
+
+def request_text(course_request: CourseRequest) -> str:
+    """Normalized text of the CourseRequest fields that describe the subject."""
+    text = " ".join([
+        course_request.course_title,
+        course_request.course_description,
+        course_request.course_level,
+        course_request.course_expectations,
+    ])
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]", " ", text.lower())).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(course_request: CourseRequest) -> List[int]:
+    """MinHash signature (NUM_PERM values) of the request's character shingles."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(request_text(course_request))
+    ]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity: the share of permutations with the same minimum."""
+    return sum(a == b for a, b in zip(signature_a, signature_b)) / NUM_PERM
+
+
+def _bands(signature: List[int]) -> List[str]:
+    return [
+        hashlib.blake2b(json.dumps(signature[band * ROWS:(band + 1) * ROWS]).encode(), digest_size=8).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+# ----------------------------------------------------------------------------
+# Archive
+# ----------------------------------------------------------------------------
+
+class DesignArchive:
+    """SQLite archive of completed designs searchable by request similarity."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(
+        self,
+        course_request: CourseRequest,
+        foundation: Optional[CourseFoundation],
+        content: Optional[CourseContent],
+    ) -> str:
+        """Archive a completed design and index it; returns its design ID."""
+        design_id = uuid.uuid4().hex
+        signature = minhash(course_request)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO designs (design_id, course_title, request_json, foundation_json, content_json, "
+                "signature, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    design_id,
+                    course_request.course_title,
+                    course_request.model_dump_json(),
+                    foundation.model_dump_json() if foundation is not None else None,
+                    content.model_dump_json() if content is not None else None,
+                    json.dumps(signature),
+                    time.time(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, design_id) VALUES (?, ?, ?)",
+                [(band, bucket, design_id) for band, bucket in enumerate(_bands(signature))],
+            )
+        return design_id
+
+    def find_similar(self, course_request: CourseRequest, threshold: float = 0.6) -> Optional[SimilarDesign]:
+        """Return the most similar archived design at or above ``threshold``, if any."""
+        signature = minhash(course_request)
+        buckets = list(enumerate(_bands(signature)))
+        clause = " OR ".join(["(band = ? AND bucket = ?)"] * len(buckets))
+        params = [value for pair in buckets for value in pair]
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT d.design_id, d.signature FROM designs d "
+                f"JOIN lsh_buckets b ON b.design_id = d.design_id WHERE {clause}",
+                params,
+            ).fetchall()
+        if not rows:
+            return None
+
+        scored = [(estimate_similarity(signature, json.loads(sig)), design_id) for design_id, sig in rows]
+        similarity, design_id = max(scored)
+        if similarity < threshold:
+            return None
+
+        with self._lock:
+            title, foundation_json, content_json = self._conn.execute(
+                "SELECT course_title, foundation_json, content_json FROM designs WHERE design_id = ?",
+                (design_id,),
+            ).fetchone()
+        return SimilarDesign(
+            design_id=design_id,
+            course_title=title,
+            similarity=similarity,
+            foundation=CourseFoundation.model_validate_json(foundation_json) if foundation_json else None,
+            content=CourseContent.model_validate_json(content_json) if content_json else None,
+        )
+
+
+# ----------------------------------------------------------------------------
+# Warm-start inputs
+# ----------------------------------------------------------------------------
+
+NO_WARM_START = "None. No similar course has been designed before; design from scratch."
+
+
+def warm_start_inputs(match: Optional[SimilarDesign]) -> dict:
+    """Task inputs carrying the prior design as drafts (always present, placeholders need them)."""
+    if match is None:
+        return {
+            "warm_start_foundation": NO_WARM_START,
+            "warm_start_content": NO_WARM_START,
+            "warm_start_outcomes": NO_WARM_START,
+        }
+    content = match.content
+    return {
+        "warm_start_foundation": (
+            match.foundation.model_dump_json(indent=2) if match.foundation is not None else NO_WARM_START
+        ),
+        "warm_start_content": (
+            content.model_dump_json(indent=2, exclude={"syllabus_markdown"}) if content is not None else NO_WARM_START
+        ),
+        "warm_start_outcomes": (
+            content.model_dump_json(indent=2, include={"tlos", "elos_by_tlo", "kdka_overview", "prrr_overview"})
+            if content is not None else NO_WARM_START
+        ),
+    }
+
+
+def warm_start_week(match: Optional[SimilarDesign], week_number: int) -> str:
+    """The prior design's module for ``week_number``, as a draft for weekly_module_task."""
+    if match is None or match.content is None:
+        return NO_WARM_START
+    for module in match.content.weekly_modules:
+        if module.week_number == week_number:
+            return module.model_dump_json(indent=2)
+    return NO_WARM_START
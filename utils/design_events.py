@@ -0,0 +1,135 @@
+# utils/design_events.py
+# Progress events from the design run, rendered progressively in the chat.
+#
+# HaileiCrew emits an event when each design task starts and when it finishes
+# with its typed artifact. Inside design_event_sink(), events go to the given
+# callback; the app publishes them to a per-session ProgressFeed that every
+# open approval request streams from, so the educator sees each section as
+# soon as its task is done instead of waiting for the final summary.
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, NamedTuple
+
+from utils.design_summary import render_partial_sections
+from utils.log import fields, get_logger
+
+TASK_STARTED = "task_started"
+TASK_FINISHED = "task_finished"
+TASK_FAILED = "task_failed"
+WEEK_FINISHED = "week_finished"
+RUN_FAILED = "run_failed"
+
+TASK_LABELS = {
+    "instructional_planning_task": "IPDAi · course foundation",
+    "content_authoring_task": "CAuthAi · course content",
+    "course_outcomes_task": "CAuthAi · course outcomes",
+    "content_revision_task": "CAuthAi · content revision",
+    "technical_design_task": "TFDAi · LMS technical design",
+    "content_review_task": "EditorAi · content review",
+    "ethical_audit_task": "EthosAi · ethical audit",
+    "searchai_task": "SearchAi · resource curation",
+}
+
+log = get_logger("design_events")
+
+_sink: contextvars.ContextVar = contextvars.ContextVar("hailei_design_event_sink", default=None)
+
+
+class DesignEvent(NamedTuple):
+    """One step of the design run; ``output_name`` is the task whose output ``artifact`` is."""
+    kind: str
+    task_name: str = ""
+    output_name: str = ""
+    artifact: Any = None
+    message: str = ""
+    at: float = 0.0
+
+
+@contextmanager
+def design_event_sink(callback: Callable[[DesignEvent], None]):
+    """Send the events of design runs in the enclosed block to ``callback``."""
+    token = _sink.set(callback)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def emit(kind: str, task_name: str = "", artifact: Any = None, message: str = "", output_name: str = ""):
+    """Report a design step to the current sink, if any. Never raises into the run."""
+    callback = _sink.get()
+    if callback is None:
+        return
+    try:
+        callback(DesignEvent(kind, task_name, output_name or task_name, artifact, message, time.time()))
+    except Exception as e:
+        log.warning("Could not deliver design event", extra=fields(kind=kind, task=task_name, error=str(e)))
+
+
+class ProgressFeed:
+    """Append-only event log of one design run that several viewers can follow."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.events: List[DesignEvent] = []
+        self.closed = False
+
+    def publish(self, event: DesignEvent):
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def follow(self) -> Iterator[List[DesignEvent]]:
+        """Yield the events so far each time new ones arrive, until the run is over."""
+        seen = 0
+        while True:
+            with self._cond:
+                while len(self.events) == seen and not self.closed:
+                    self._cond.wait()
+                events, closed = list(self.events), self.closed
+            if len(events) != seen:
+                seen = len(events)
+                yield events
+            if closed:
+                return
+
+
+def render_progress(events: List[DesignEvent]) -> str:
+    """Markdown progress message: task checklist plus the sections finished so far."""
+    status = {}
+    artifacts = {}
+    weeks_done = 0
+    notes = []
+    for event in events:
+        if event.kind == TASK_STARTED:
+            status[event.task_name] = "⏳"
+        elif event.kind == TASK_FINISHED:
+            status[event.task_name] = "✅" if event.artifact is not None else "⚠️"
+            if event.artifact is not None:
+                artifacts[event.output_name] = event.artifact
+        elif event.kind == TASK_FAILED:
+            status[event.task_name] = "⚠️"
+            notes.append(f"- ⚠️ {event.message}")
+        elif event.kind == WEEK_FINISHED:
+            weeks_done += 1
+        elif event.kind == RUN_FAILED:
+            notes.append(f"- ❌ {event.message}")
+
+    lines = ["### ⏳ Course design in progress", ""]
+    for task_name, mark in status.items():
+        label = TASK_LABELS.get(task_name, task_name)
+        if task_name == "content_authoring_task" and mark == "⏳" and weeks_done:
+            label += f" ({weeks_done} weeks authored)"
+        lines.append(f"- {mark} {label}")
+    lines.extend(notes)
+
+    sections = [render_partial_sections(name, artifact) for name, artifact in artifacts.items()]
+    return "\n".join(lines + [""] + [section for section in sections if section])
@@ -0,0 +1,127 @@
+# utils/design_ledger.py
+# Input-hash dependency tracking for incremental re-design.
+#
+# Every design task output is recorded under a hash of exactly what the task
+# consumed: its prompt templates (task description/expected output and agent
+# role/goal/backstory) and the values of the placeholders they reference,
+# including the projected upstream artifacts. When an approved design is run
+# again after an edit, a task whose hash is unchanged replays its recorded
+# output instead of calling the LLM; a changed input invalidates that task and,
+# through its new output, whichever downstream tasks consume it.
+
+import contextvars
+import hashlib
+import json
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_AGENT_TEMPLATES = ("role", "goal", "backstory")
+_TASK_TEMPLATES = ("description", "expected_output")
+
+_ledger: contextvars.ContextVar = contextvars.ContextVar("hailei_design_ledger", default=None)
+
+
+class TaskRecord(NamedTuple):
+    """A recorded task output; shaped like the crew output the callers read (``pydantic``, ``raw``)."""
+    pydantic: Any
+    raw: str
+    task_name: str = ""
+    input_hash: str = ""
+
+
+def input_hash(task_name: str, task_config: Dict[str, Any], agent_config: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+    """Hash of the templates of ``task_name`` and the input values they reference."""
+    templates = [str(task_config.get(key, "")) for key in _TASK_TEMPLATES]
+    templates += [str(agent_config.get(key, "")) for key in _AGENT_TEMPLATES]
+    referenced = sorted({name for text in templates for name in _PLACEHOLDER.findall(text)})
+    payload = json.dumps(
+        [task_name, templates, {name: inputs.get(name) for name in referenced}], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DesignLedger:
+    """Task outputs of the latest design run of one course, keyed by input hash.
+
+    Outputs recorded during a run are kept for the next run; anything the next
+    run does not consume again is dropped when it finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._previous: Dict[str, TaskRecord] = {}
+        self._current: Dict[str, TaskRecord] = {}
+        self.runs = 0
+        self.warm_start = None  # the warm-start match of the first run, reused so inputs stay stable
+        self.reused: List[str] = []
+        self.recomputed: List[str] = []
+
+    def __getstate__(self):
+        # Spilled to disk with idle sessions (utils/memory_budget.py); locks do not pickle.
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        with self._lock:
+            self._current = {}
+            self.reused = []
+            self.recomputed = []
+
+    def finish_run(self, complete: bool = True):
+        with self._lock:
+            # An interrupted run keeps what the previous run recorded as well.
+            self._previous = self._current if complete else {**self._previous, **self._current}
+            self._current = {}
+            self.runs += 1
+
+    def lookup(self, task_name: str, key: str) -> Optional[TaskRecord]:
+        with self._lock:
+            record = self._current.get(key) or self._previous.get(key)
+            if record is None:
+                self.recomputed.append(task_name)
+                return None
+            self._current[key] = record
+            self.reused.append(task_name)
+            return record
+
+    def has(self, key: str) -> bool:
+        """Whether an output for ``key`` is recorded (without counting it as reused)."""
+        with self._lock:
+            return key in self._current or key in self._previous
+
+    def record(self, task_name: str, key: str, artifact: Any, raw: str):
+        with self._lock:
+            self._current[key] = TaskRecord(artifact, raw, task_name, key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"runs": self.runs, "reused": list(self.reused), "recomputed": list(self.recomputed)}
+
+
+@contextmanager
+def design_ledger_scope(ledger: Optional[DesignLedger]):
+    """Replay and record task outputs through ``ledger`` in the enclosed block (and contexts copied from it)."""
+    if ledger is None:
+        yield None
+        return
+    token = _ledger.set(ledger)
+    ledger.start_run()
+    complete = False
+    try:
+        yield ledger
+        complete = True
+    finally:
+        ledger.finish_run(complete)
+        _ledger.reset(token)
+
+
+def current_ledger() -> Optional[DesignLedger]:
+    return _ledger.get()
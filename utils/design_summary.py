@@ -0,0 +1,423 @@
+# utils/design_summary.py
+# Deterministic renderer for the educator-facing HAILEI Course Design Summary.
+#
+# Builds the summary directly from the typed task outputs, following the
+# section order of EXAMPLE_COURSE_DESIGN_SUMMARY, so the design phase no longer
+# needs an LLM turn to re-read and rewrite every upstream artifact.
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.models import (
+    CourseAuditReport,
+    CourseContent,
+    CourseContentReview,
+    CourseFoundation,
+    CourseRequest,
+    CourseSearchReport,
+    CourseTechnicalDesign,
+    LearningObjective,
+)
+from utils.log import fields, get_logger
+
+log = get_logger("design_summary")
+
+NOT_AVAILABLE = "Not available."
+
+OVERVIEW_POLISH_MODEL = "gpt-4o-mini"
+OVERVIEW_POLISH_PROMPT = (
+    "Rewrite the following course overview as one concise, educator-facing paragraph "
+    "(at most 120 words). Keep every fact; do not add new claims, headings or lists.\n\n{overview}"
+)
+
+
+# ----------------------------------------------------------------------------
+# Formatting helpers
+# ----------------------------------------------------------------------------
+
+def _objective(objective: LearningObjective) -> str:
+    if objective.bloom_level:
+        return f"{objective.statement} ({objective.bloom_level})"
+    return objective.statement
+
+
+def _cell(items: Iterable[str], limit: int = 2) -> str:
+    """Join the first few items for a table cell, escaping pipe characters."""
+    values = [item.replace("|", "/").strip() for item in items if item and item.strip()]
+    return "; ".join(values[:limit]) or "—"
+
+
+def _unique(items: Iterable[str]) -> List[str]:
+    seen = []
+    for item in items:
+        if item and item not in seen:
+            seen.append(item)
+    return seen
+
+
+def _section(title: str, lines: List[str]) -> str:
+    body = "\n".join(lines) if lines else NOT_AVAILABLE
+    return f"## {title}\n{body}\n"
+
+
+# ----------------------------------------------------------------------------
+# Sections
+# ----------------------------------------------------------------------------
+
+def _header(course_request, foundation, content) -> str:
+    title = (
+        (foundation and foundation.course_title)
+        or (content and content.course_title)
+        or (course_request and course_request.course_title)
+        or "Untitled course"
+    )
+    credits = foundation.credits if foundation else (course_request.course_credits if course_request else None)
+    weeks = (
+        foundation.duration_weeks if foundation
+        else content.duration_weeks if content
+        else course_request.course_duration_weeks if course_request
+        else None
+    )
+    level = (
+        (foundation and foundation.level)
+        or (content and content.level)
+        or (course_request and course_request.course_level)
+        or None
+    )
+
+    facts = []
+    if credits is not None:
+        facts.append(f"{credits} credits")
+    if weeks is not None:
+        facts.append(f"{weeks} weeks")
+    if level:
+        facts.append(level)
+
+    header = "# HAILEI Course Design Summary\n"
+    header += f"**Course Title:** {title}  \n"
+    header += f"**Credits / Duration / Level:** {' · '.join(facts) or NOT_AVAILABLE}\n"
+    return header
+
+
+def course_overview(course_request=None, foundation=None, content=None) -> Optional[str]:
+    """Return the raw overview paragraph the summary is built around."""
+    if foundation and foundation.course_description:
+        overview = foundation.course_description.strip()
+    elif content and content.course_description:
+        overview = content.course_description.strip()
+    elif course_request:
+        overview = course_request.course_description.strip()
+    else:
+        return None
+
+    expectations = (foundation and foundation.expectations) or (course_request and course_request.course_expectations)
+    if expectations and expectations.strip() not in overview:
+        overview += f" {expectations.strip()}"
+    return overview
+
+
+def _learning_outcomes(foundation, content) -> List[str]:
+    lines = []
+    if content and content.tlos:
+        lines.append("**Terminal Learning Objectives (TLOs):**")
+        for i, tlo in enumerate(content.tlos, 1):
+            lines.append(f"{i}. {_objective(tlo)}")
+        if content.elos_by_tlo:
+            lines.append("")
+            lines.append("**Enabling Learning Objectives (ELOs):**")
+            for tlo_key, elos in content.elos_by_tlo.items():
+                lines.append(f"- For {tlo_key}:")
+                lines.extend(f"  - {_objective(elo)}" for elo in elos)
+    elif foundation and foundation.modules:
+        lines.append("**Module Objectives:**")
+        for module in foundation.modules:
+            for objective in module.learning_objectives:
+                lines.append(f"- {module.title}: {_objective(objective)}")
+    return lines
+
+
+def _prrr_cell(prrr) -> str:
+    signals = [
+        ("Personal", prrr.personal),
+        ("Relatable", prrr.relatable),
+        ("Relative", prrr.relative),
+        ("Real-world", prrr.real_world),
+    ]
+    present = [name for name, value in signals if value]
+    if len(present) == len(signals):
+        return "All PRRR dimensions"
+    return ", ".join(present) or "—"
+
+
+def _weekly_plan(foundation, content) -> List[str]:
+    if content and content.weekly_modules:
+        lines = [
+            "| Week | Theme | Key Activities | Assessments | PRRR Signals |",
+            "|---|---|---|---|---|",
+        ]
+        for module in sorted(content.weekly_modules, key=lambda m: m.week_number):
+            lines.append(
+                f"| {module.week_number} | {_cell([module.title], 1)} | {_cell(module.activities)} "
+                f"| {_cell(module.assessments)} | {_prrr_cell(module.prrr)} |"
+            )
+        return lines
+    if foundation and foundation.modules:
+        lines = ["| Week | Theme | Focus |", "|---|---|---|"]
+        for week, module in enumerate(foundation.modules, 1):
+            lines.append(f"| {week} | {_cell([module.title], 1)} | {_cell([module.description], 1)} |")
+        return lines
+    return []
+
+
+def _kdka(content) -> List[str]:
+    if not content:
+        return []
+    lines = []
+    if content.kdka_overview:
+        lines.append(content.kdka_overview.strip())
+    dimensions = {"Knowledge": [], "Delivery": [], "Context": [], "Assessment": []}
+    for module in content.weekly_modules:
+        dimensions["Knowledge"].extend(module.kdka.knowledge)
+        dimensions["Delivery"].extend(module.kdka.delivery)
+        dimensions["Context"].extend(module.kdka.context)
+        dimensions["Assessment"].extend(module.kdka.assessment)
+    for name, values in dimensions.items():
+        values = _unique(values)
+        if values:
+            lines.append(f"- **{name}:** {', '.join(values[:5])}")
+    return lines
+
+
+def _prrr(content) -> List[str]:
+    if not content:
+        return []
+    lines = []
+    if content.prrr_overview:
+        lines.append(content.prrr_overview.strip())
+    dimensions = {"Personal": [], "Relatable": [], "Relative": [], "Real-world": []}
+    for module in content.weekly_modules:
+        dimensions["Personal"].append(module.prrr.personal)
+        dimensions["Relatable"].append(module.prrr.relatable)
+        dimensions["Relative"].append(module.prrr.relative)
+        dimensions["Real-world"].append(module.prrr.real_world)
+    for name, values in dimensions.items():
+        values = _unique(values)
+        if values:
+            lines.append(f"- **{name}:** {values[0]}")
+    return lines
+
+
+def _lms(technical_design) -> List[str]:
+    if not technical_design:
+        return []
+    lms = technical_design.lms
+    lines = [f"- **Platform:** {lms.lms_platform or NOT_AVAILABLE}"]
+    if lms.navigation_structure:
+        lines.append("- **Structure:**")
+        lines.extend(f"  - {item}" for item in lms.navigation_structure)
+    if lms.feature_mapping:
+        lines.append("- **Feature Mapping:**")
+        lines.extend(f"  - {feature}: {mapping}" for feature, mapping in lms.feature_mapping.items())
+    if lms.integrations:
+        lines.append(f"- **Integrations:** {', '.join(lms.integrations)}")
+    if lms.accessibility_notes:
+        lines.append(f"- **Accessibility Notes:** {lms.accessibility_notes}")
+    if technical_design.timeline_weeks:
+        lines.append("- **Timeline:**")
+        lines.extend(f"  - {item}" for item in technical_design.timeline_weeks)
+    return lines
+
+
+def _lms_platforms(designs: Dict[str, CourseTechnicalDesign]) -> List[str]:
+    lines = []
+    for platform, design in designs.items():
+        lines.extend(["", f"#### {platform}"] + _lms(design))
+    return lines[1:]
+
+
+def _pass_fail(flag: bool) -> str:
+    return "Pass" if flag else "Needs attention"
+
+
+def _editor_review(review) -> List[str]:
+    if not review:
+        return []
+    lines = [
+        f"- **UDL Compliance:** {_pass_fail(review.udl_compliance)}",
+        f"- **Accessibility:** {_pass_fail(review.accessibility_passed)}",
+    ]
+    if review.summary_markdown:
+        lines.append(f"- **Summary:** {review.summary_markdown.strip()}")
+    if review.blooms_alignment_notes:
+        lines.append(f"- **Bloom Alignment:** {review.blooms_alignment_notes.strip()}")
+    if review.findings:
+        lines.append("- **Findings:**")
+        lines.extend(
+            f"  - {finding.area}: {finding.issue} → {finding.recommendation}" for finding in review.findings
+        )
+    if review.accessibility_checks:
+        lines.append(f"- **Accessibility Checks:** {', '.join(review.accessibility_checks)}")
+    return lines
+
+
+def _ethical_audit(audit) -> List[str]:
+    if not audit:
+        return []
+    return [
+        f"- **Compliance:** {_pass_fail(audit.ethical_compliance)}",
+        f"- **Notes:** {audit.notes.strip()}",
+    ]
+
+
+def _resources(search, link_status=None) -> List[str]:
+    if not search:
+        return []
+    link_status = link_status or {}
+    lines = [f"- **Total curated artifacts:** {len(search.resources)}"]
+    for hit in search.resources:
+        entry = f"  - **{hit.title}**"
+        if hit.description:
+            entry += f" – {hit.description}"
+        if hit.url:
+            entry += f" ({hit.url})"
+            status = link_status.get(hit.url.strip())
+            if status is not None and not status.ok:
+                entry += " ⚠️ link unreachable"
+        lines.append(entry)
+    if search.curation_notes:
+        lines.append(f"- **Curation Notes:** {search.curation_notes.strip()}")
+    return lines
+
+
+def _link_check(content, link_status) -> List[str]:
+    broken = [status for status in link_status.values() if not status.ok]
+    lines = [f"- **Links checked:** {len(link_status)} ({len(broken)} unreachable)"]
+    weeks = {}
+    if content:
+        for module in content.weekly_modules:
+            for resource in module.resources:
+                if resource.url:
+                    weeks.setdefault(resource.url.strip(), module.week_number)
+    for status in broken:
+        where = f"Week {weeks[status.url]}" if status.url in weeks else "Resource curation"
+        reason = f"HTTP {status.status}" if status.status else (status.error or "no response")
+        lines.append(f"  - {where}: {status.url} – {reason}")
+    return lines
+
+
+def _appendices(foundation, content, technical_design, review, audit, search) -> List[str]:
+    appendices = [
+        ("A", "Course Foundations (IPDAi)", foundation),
+        ("B", "Instructional Content Pack (CAuthAi)", content),
+        ("C", "LMS Implementation Blueprint (TFDAi)", technical_design),
+        ("D", "Editorial Report (EditorAi)", review),
+        ("E", "Ethical Compliance Report (EthosAi)", audit),
+        ("F", "Curated Resource Library (SearchAi)", search),
+    ]
+    return [
+        f"- Appendix {letter} – {title}: {'Available' if artifact is not None else NOT_AVAILABLE}"
+        for letter, title, artifact in appendices
+    ]
+
+
+# ----------------------------------------------------------------------------
+# Partial sections (progress updates during the design run)
+# ----------------------------------------------------------------------------
+
+def render_partial_sections(output_name: str, artifact) -> str:
+    """Render the summary sections one design task's artifact already supports."""
+    if artifact is None:
+        return ""
+    if output_name == "instructional_planning_task":
+        overview = course_overview(foundation=artifact)
+        sections = [
+            _section("Course Overview", [overview] if overview else []),
+            _section("Weekly Plan", _weekly_plan(artifact, None)),
+        ]
+    elif output_name == "content_authoring_task":
+        sections = [
+            _section("Learning Outcomes", _learning_outcomes(None, artifact)),
+            _section("Weekly Plan", _weekly_plan(None, artifact)),
+            _section("KDKA Alignment (IPDAi)", _kdka(artifact)),
+            _section("PRRR Integration", _prrr(artifact)),
+        ]
+    elif output_name == "technical_design_task":
+        sections = [_section("LMS Implementation (TFDAi)", _lms(artifact))]
+    elif output_name == "content_review_task":
+        sections = [_section("Editorial Enhancements (EditorAi)", _editor_review(artifact))]
+    elif output_name == "ethical_audit_task":
+        sections = [_section("Ethical Audit (EthosAi)", _ethical_audit(artifact))]
+    elif output_name == "searchai_task":
+        sections = [_section("Resource Curation (SearchAi)", _resources(artifact))]
+    else:
+        return ""
+    return "\n".join(sections)
+
+
+# ----------------------------------------------------------------------------
+# Optional overview polish
+# ----------------------------------------------------------------------------
+
+def polish_overview(overview: str, model: str = OVERVIEW_POLISH_MODEL) -> str:
+    """Ask a small LLM to tighten the overview paragraph; fall back to the raw text on failure."""
+    try:
+        from litellm import completion
+
+        response = completion(
+            model=model,
+            messages=[{"role": "user", "content": OVERVIEW_POLISH_PROMPT.format(overview=overview)}],
+            max_tokens=250,
+            temperature=0.2,
+        )
+        polished = response.choices[0].message.content
+    except Exception as e:
+        log.warning("Could not polish course overview", extra=fields(error=str(e)))
+        return overview
+    return polished.strip() if polished and polished.strip() else overview
+
+
+# ----------------------------------------------------------------------------
+# Public renderer
+# ----------------------------------------------------------------------------
+
+def render_course_design_summary(
+    course_request: Optional[CourseRequest] = None,
+    foundation: Optional[CourseFoundation] = None,
+    content: Optional[CourseContent] = None,
+    technical_design: Optional[CourseTechnicalDesign] = None,
+    review: Optional[CourseContentReview] = None,
+    audit: Optional[CourseAuditReport] = None,
+    search: Optional[CourseSearchReport] = None,
+    polish: bool = False,
+    lms_designs: Optional[Dict[str, CourseTechnicalDesign]] = None,
+    link_status: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Render the HAILEI Course Design Summary as Markdown from typed task outputs.
+
+    Missing artifacts keep their section heading with a one-line "Not available."
+    When ``polish`` is True, only the overview paragraph is sent to a small LLM.
+    ``lms_designs`` maps LMS platform to its technical design when the course was
+    designed for several platforms; each gets its own LMS Implementation block.
+    ``link_status`` (URL -> LinkStatus from utils.link_checker) flags unreachable
+    resource links and adds a Link Check section.
+    """
+    overview = course_overview(course_request, foundation, content)
+    if overview and polish:
+        overview = polish_overview(overview)
+
+    sections = [
+        _header(course_request, foundation, content),
+        _section("Course Overview", [overview] if overview else []),
+        _section("Learning Outcomes", _learning_outcomes(foundation, content)),
+        _section("Weekly Plan", _weekly_plan(foundation, content)),
+        _section("KDKA Alignment (IPDAi)", _kdka(content)),
+        _section("PRRR Integration", _prrr(content)),
+        _section("LMS Implementation (TFDAi)", _lms_platforms(lms_designs) if lms_designs else _lms(technical_design)),
+        _section("Editorial Enhancements (EditorAi)", _editor_review(review)),
+        _section("Ethical Audit (EthosAi)", _ethical_audit(audit)),
+        _section("Resource Curation (SearchAi)", _resources(search, link_status)),
+        _section("Appendices (per-agent deliverables)",
+                 _appendices(foundation, content, technical_design, review, audit, search)),
+    ]
+    if link_status:
+        sections.append(_section("Link Check", _link_check(content, link_status)))
+    return "\n".join(sections)
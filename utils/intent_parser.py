@@ -0,0 +1,224 @@
+# utils/intent_parser.py
+# Local fast path for mechanical coordinator edits ("make it 12 weeks").
+#
+# parse_edit() recognizes a message that does nothing but set one CourseRequest
+# field (free-text fields only to a quoted value), and apply_edit() validates the new value against the model's
+# constraints and answers with a templated reply, so such turns skip the
+# coordinator LLM entirely. Anything else (questions, several requests in one
+# message, unknown fields, vague values) returns None and goes to the LLM.
+
+import re
+from typing import NamedTuple, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models.models import CourseRequest
+
+COURSE_LEVELS = [
+    "Undergraduate - Introductory",
+    "Undergraduate - Advanced",
+    "Graduate - Introductory",
+    "Graduate - Advanced",
+    "Professional Certificate",
+]
+
+FIELD_ALIASES = {
+    "course_title": ["course title", "title", "course name", "name"],
+    "course_description": ["course description", "description"],
+    "course_credits": ["number of credits", "credit hours", "credits"],
+    "course_duration_weeks": ["number of weeks", "duration", "length"],
+    "course_level": ["course level", "level"],
+    "course_expectations": ["course expectations", "expectations"],
+}
+
+FIELD_LABELS = {
+    "course_title": "Title",
+    "course_description": "Description",
+    "course_credits": "Credits",
+    "course_duration_weeks": "Duration",
+    "course_level": "Level",
+    "course_expectations": "Expectations",
+}
+
+NUMBER_WORDS = {
+    word: number for number, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen "
+        "fifteen sixteen seventeen eighteen nineteen twenty".split()
+    )
+}
+
+_ALIAS_TO_FIELD = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+_ALIAS_PATTERN = "|".join(sorted(map(re.escape, _ALIAS_TO_FIELD), key=len, reverse=True))
+_NUMBER = r"(\d{1,3}|" + "|".join(NUMBER_WORDS) + r")"
+_POLITE = r"(?:(?:please|pls|can you|could you|let's|lets)\s+)*"
+
+# "change the title to X", "set duration = 12", "update the course level: Graduate - Advanced"
+_SET_FIELD = re.compile(
+    rf"^{_POLITE}(?P<verb>change|set|update|rename|make|switch)\s+(?:the\s+)?(?:course(?:'s)?\s+)?"
+    rf"(?P<alias>{_ALIAS_PATTERN})\s*(?P<sep>to|=|:|as|into)\s*(?P<value>.+?)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# "credits: 4", "the duration should be 12 weeks" (numeric and level fields only: "the title is
+# perfect" is a comment, not a new title)
+_FIELD_IS = re.compile(
+    rf"^(?:the\s+)?(?:course\s+)?(?P<alias>{_ALIAS_PATTERN})\s*(?::|=|should\s+be|is)\s*(?P<value>.+?)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# "rename the course to X", "retitle it X"
+_RENAME = re.compile(
+    rf"^{_POLITE}(?:rename|retitle)\s+(?:it|the\s+course|this\s+course)\s*(?:to|as)?\s*(?P<value>.+?)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# "make it 12 weeks (long)", "12 weeks please", "make it 4 credits"
+_NUMERIC = re.compile(
+    rf"^{_POLITE}(?:(?:make|set|change)\s+(?:it|the\s+course|this\s+course)\s+(?:to\s+)?)?"
+    rf"(?P<value>{_NUMBER})[\s-]+(?P<unit>weeks?|credits?|credit\s+hours?)(?:\s+long)?(?:\s+please)?$",
+    re.IGNORECASE,
+)
+
+# Words that signal a compound or open-ended request the LLM should handle, checked
+# against the whole message, free-text values included ("rename it to 'AI 101' instead").
+_VAGUE = re.compile(r"\b(also|but|instead|maybe|perhaps|or so|about|around|roughly|approximately|suggest|"
+                    r"something like|what|why|how|could|should we)\b", re.IGNORECASE)
+_FREE_TEXT = ("course_title", "course_description", "course_expectations")
+# Free-text fields are only set by an explicit verb and separator with a quoted value
+# ("change the title to \"X\"")...
+_FREE_TEXT_VERBS = ("change", "set", "update", "rename")
+_FREE_TEXT_SEPARATORS = ("to", "=", ":")
+_QUOTES = {'"': '"', "'": "'", "“": "”", "‘": "’", "`": "`"}
+# ...and not when the "value" describes the change instead ("change the title to be more engaging").
+_DESCRIBED_CHANGE = re.compile(
+    r"^(?:be|sound|something|more|less|shorter|longer|better|clearer|simpler|include|mention|reflect|focus|"
+    r"emphasi[sz]e|cover|add|remove|drop|say)\b",
+    re.IGNORECASE,
+)
+_SECOND_EDIT = re.compile(r"(?:\band|\bthen|,|;)\s+(?:please\s+)?(?:make|set|change|update|rename|add|remove)\b",
+                          re.IGNORECASE)
+
+
+class FieldEdit(NamedTuple):
+    """A direct update of one CourseRequest field."""
+    field: str
+    value: object
+
+
+def _strip_value(value: str) -> str:
+    value = value.strip().rstrip(".!").strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'“”‘’`":
+        value = value[1:-1].strip()
+    return value.strip("“”‘’")
+
+
+def _number(value: str) -> Optional[int]:
+    match = re.fullmatch(rf"{_NUMBER}(?:\s*(?:weeks?|credits?|credit\s+hours?))?(?:\s+long)?", value, re.IGNORECASE)
+    if not match:
+        return None
+    token = match.group(1).lower()
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+def _level(value: str) -> Optional[str]:
+    """Map free text onto one of COURSE_LEVELS, or None when it is not clear which."""
+    text = value.lower()
+    for level in COURSE_LEVELS:
+        if text == level.lower():
+            return level
+    if "certificate" in text or "professional" in text:
+        return "Professional Certificate"
+    if re.search(r"\bundergrad(uate)?\b", text):
+        tier = "Undergraduate"
+    elif re.search(r"\b(grad(uate)?|masters?|postgrad(uate)?)\b", text):
+        tier = "Graduate"
+    else:
+        return None
+    intro = bool(re.search(r"\b(intro(ductory)?|beginner|foundational)\b", text))
+    advanced = bool(re.search(r"\badvanced\b", text))
+    if intro == advanced:
+        return None
+    return f"{tier} - {'Introductory' if intro else 'Advanced'}"
+
+
+def _coerce(field: str, raw: str):
+    value = _strip_value(raw)
+    if not value:
+        return None
+    if field in ("course_credits", "course_duration_weeks"):
+        return _number(value)
+    if field == "course_level":
+        return _level(value)
+    return value
+
+
+def _quoted(value: str) -> bool:
+    value = value.strip().rstrip(".!").strip()
+    return len(value) >= 2 and _QUOTES.get(value[0]) == value[-1]
+
+
+def _explicit_set(match: re.Match) -> bool:
+    """Whether a free-text field edit is an explicit instruction with a quoted literal value
+    ("change the title to \"X\"", "rename it 'X'"), rather than a comment ("the title is perfect")
+    or a described change ("change the description to focus more on ethics")."""
+    if match.re is _FIELD_IS:
+        return False
+    if match.re is _SET_FIELD and (
+        match.group("verb").lower() not in _FREE_TEXT_VERBS or match.group("sep").lower() not in _FREE_TEXT_SEPARATORS
+    ):
+        return False
+    raw = match.group("value")
+    return _quoted(raw) and not _DESCRIBED_CHANGE.match(_strip_value(raw))
+
+
+def parse_edit(message: str) -> Optional[FieldEdit]:
+    """Return the single field edit ``message`` asks for, or None to defer to the LLM."""
+    text = (message or "").strip()
+    if not text or "\n" in text or "?" in text:
+        return None
+
+    match = _NUMERIC.match(text)
+    if match:
+        if _VAGUE.search(text):
+            return None
+        field = "course_duration_weeks" if match.group("unit").lower().startswith("week") else "course_credits"
+        value = _coerce(field, match.group("value"))
+        return FieldEdit(field, value) if value is not None else None
+
+    match = _SET_FIELD.match(text) or _FIELD_IS.match(text)
+    if match:
+        field = _ALIAS_TO_FIELD[match.group("alias").lower()]
+    else:
+        match = _RENAME.match(text)
+        if not match:
+            return None
+        field = "course_title"
+    if field in _FREE_TEXT and not _explicit_set(match):
+        return None
+
+    raw = match.group("value")
+    if _VAGUE.search(text):
+        return None
+    # Another edit verb, or a second field, in the value usually means two edits in one message.
+    if _SECOND_EDIT.search(raw) or (field not in _FREE_TEXT[1:] and re.search(
+        rf"\b(?:and|,)\s+(?:the\s+)?(?:{_ALIAS_PATTERN})\b", raw, re.IGNORECASE
+    )):
+        return None
+    value = _coerce(field, raw)
+    return FieldEdit(field, value) if value is not None else None
+
+
+def apply_edit(course_request: CourseRequest, edit: FieldEdit) -> Tuple[Optional[CourseRequest], str]:
+    """Validate ``edit`` against CourseRequest; return the updated request (None if invalid) and the reply."""
+    label = FIELD_LABELS[edit.field]
+    try:
+        updated = CourseRequest.model_validate({**course_request.model_dump(), edit.field: edit.value})
+    except ValidationError as e:
+        reason = e.errors()[0]["msg"]
+        return None, f"⚠️ I couldn't set the **{label}** to **{edit.value}**: {reason}. Please try another value."
+
+    shown = f"{edit.value} weeks" if edit.field == "course_duration_weeks" else edit.value
+    previous = getattr(course_request, edit.field)
+    if previous == edit.value:
+        return updated, f"The **{label}** is already **{shown}**. Anything else you'd like to adjust?"
+    return updated, (
+        f"✅ Updated the **{label}** to **{shown}**.\n\n"
+        "Anything else you'd like to adjust? When everything looks right, click **Approve** to start the design."
+    )
@@ -0,0 +1,233 @@
+# utils/link_checker.py
+# Concurrent validation of the resource URLs in a course design.
+#
+# Every SearchHit.url and ModuleResource.url of a design is checked in one
+# asyncio pass over a pooled httpx.AsyncClient, with at most
+# HAILEI_LINK_PER_HOST requests in flight per host. A HEAD request is tried
+# first; servers that reject or mishandle HEAD get a GET whose body is not
+# read. Results are cached on disk (SQLite) for HAILEI_LINK_TTL_S, failures for
+# a shorter HAILEI_LINK_FAILURE_TTL_S, so a re-run does not re-check links.
+#
+# The URLs come from LLM output, so the server must not be steered into its own
+# network: every host is resolved before it is requested, redirects are followed
+# one hop at a time under the same check, and hosts resolving to loopback,
+# private, link-local or otherwise non-public addresses are refused unless
+# HAILEI_LINK_ALLOW_PRIVATE=1.
+
+import asyncio
+import ipaddress
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.settings import env_flag, env_float, env_int
+
+USER_AGENT = "HAILEI-LinkChecker/1.0 (+course design resource validation)"
+# HEAD answers that say more about the server's HEAD support than about the link.
+HEAD_UNRELIABLE = {400, 403, 405, 406, 429, 500, 501, 502, 503}
+_REQUEST_ERRORS = (httpx.HTTPError, httpx.InvalidURL)
+MAX_REDIRECTS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    ok INTEGER NOT NULL,
+    status INTEGER,
+    final_url TEXT,
+    error TEXT,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class LinkBlocked(Exception):
+    """Raised for a URL (or redirect target) whose host is not a public address."""
+
+
+def public_address(address: str) -> bool:
+    """Whether ``address`` is a globally routable IP (not loopback, private, link-local, ...)."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # drop an IPv6 zone id
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def _resolve(host: str, port: int) -> List[str]:
+    """Every address ``host`` resolves to."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+class LinkStatus(NamedTuple):
+    """Outcome of checking one URL; ``status`` is None when no HTTP response was received."""
+    url: str
+    ok: bool
+    status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+
+class LinkCache:
+    """Link check results on disk, valid for ``ttl`` seconds (``failure_ttl`` for broken links)."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None, failure_ttl: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = env_float("HAILEI_LINK_TTL_S", 86400.0) if ttl is None else ttl
+        self.failure_ttl = env_float("HAILEI_LINK_FAILURE_TTL_S", 3600.0) if failure_ttl is None else failure_ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        urls = list(urls)
+        if not urls:
+            return {}
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, ok, status, final_url, error, checked_at FROM links "
+                f"WHERE url IN ({','.join('?' * len(urls))})",
+                urls,
+            ).fetchall()
+        fresh = {}
+        for url, ok, status, final_url, error, checked_at in rows:
+            if now - checked_at < (self.ttl if ok else self.failure_ttl):
+                fresh[url] = LinkStatus(url, bool(ok), status, final_url, error, checked_at)
+        return fresh
+
+    def put_many(self, results: Iterable[LinkStatus]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO links (url, ok, status, final_url, error, checked_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(r.url, int(r.ok), r.status, r.final_url, r.error, r.checked_at) for r in results],
+            )
+
+
+class LinkChecker:
+    """Check many URLs concurrently over one connection pool."""
+
+    def __init__(
+        self,
+        cache: Optional[LinkCache] = None,
+        timeout: Optional[float] = None,
+        per_host: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        allow_private: Optional[bool] = None,
+    ):
+        self.cache = cache
+        self.timeout = env_float("HAILEI_LINK_TIMEOUT_S", 8.0) if timeout is None else timeout
+        self.per_host = env_int("HAILEI_LINK_PER_HOST", 4) if per_host is None else per_host
+        self.max_connections = env_int("HAILEI_LINK_MAX_CONNECTIONS", 32) if max_connections is None else max_connections
+        self.allow_private = env_flag("HAILEI_LINK_ALLOW_PRIVATE") if allow_private is None else allow_private
+
+    @staticmethod
+    def _status(url: str, response: httpx.Response) -> LinkStatus:
+        return LinkStatus(url, response.status_code < 400, response.status_code, str(response.url),
+                          checked_at=time.time())
+
+    async def _check_host(self, url: httpx.URL):
+        """Raise LinkBlocked unless every address of ``url``'s host is public (or private ones are allowed)."""
+        if self.allow_private:
+            return
+        if url.scheme not in ("http", "https") or not url.host:
+            raise LinkBlocked(f"not an http(s) URL: {url}")
+        try:
+            addresses = await _resolve(url.host, url.port or (443 if url.scheme == "https" else 80))
+        except (socket.gaierror, UnicodeError) as e:
+            raise httpx.ConnectError(f"cannot resolve {url.host}: {e}") from e
+        blocked = [address for address in addresses if not public_address(address)]
+        if blocked or not addresses:
+            raise LinkBlocked(f"{url.host} resolves to a non-public address ({', '.join(blocked) or 'none'})")
+
+    async def _send(self, client: httpx.AsyncClient, method: str, url: str) -> httpx.Response:
+        """Send ``method``, following redirects one checked hop at a time; the body is never read."""
+        request = client.build_request(method, url)
+        for _ in range(MAX_REDIRECTS + 1):
+            await self._check_host(request.url)
+            response = await client.send(request, stream=True, follow_redirects=False)
+            await response.aclose()  # status and headers are enough
+            if response.next_request is None:
+                return response
+            request = response.next_request
+        raise httpx.TooManyRedirects(f"more than {MAX_REDIRECTS} redirects", request=request)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> LinkStatus:
+        try:
+            try:
+                response = await self._send(client, "HEAD", url)
+                if response.status_code not in HEAD_UNRELIABLE:
+                    return self._status(url, response)
+            except _REQUEST_ERRORS:
+                pass  # some servers drop HEAD requests; GET decides
+            return self._status(url, await self._send(client, "GET", url))
+        except (LinkBlocked, *_REQUEST_ERRORS) as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            return LinkStatus(url, False, error=error, checked_at=time.time())
+
+    async def check_async(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        """Check each distinct URL once; cached results are reused."""
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        results = self.cache.get_many(urls) if self.cache is not None else {}
+        pending = []
+        for url in urls:
+            if url in results:
+                continue
+            if urlsplit(url).scheme not in ("http", "https") or not urlsplit(url).netloc:
+                results[url] = LinkStatus(url, False, error="not an http(s) URL", checked_at=time.time())
+            else:
+                pending.append(url)
+
+        if pending:
+            host_slots: Dict[str, asyncio.Semaphore] = {}
+
+            async def check_one(client, url):
+                slots = host_slots.setdefault(urlsplit(url).netloc.lower(), asyncio.Semaphore(self.per_host))
+                async with slots:
+                    return await self._fetch(client, url)
+
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            async with httpx.AsyncClient(
+                limits=limits, timeout=self.timeout, headers={"User-Agent": USER_AGENT}
+            ) as client:
+                checked = await asyncio.gather(*(check_one(client, url) for url in pending))
+            if self.cache is not None:
+                self.cache.put_many(checked)
+            results.update((status.url, status) for status in checked)
+        return {url: results[url] for url in urls}
+
+    def check(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        """Synchronous wrapper around check_async (runs its own event loop in this thread)."""
+        return asyncio.run(self.check_async(list(urls)))
+
+
+def design_urls(content=None, search=None) -> List[str]:
+    """Every ModuleResource.url of ``content`` and SearchHit.url of ``search``, in order."""
+    urls = []
+    if content is not None:
+        for module in content.weekly_modules:
+            urls.extend(resource.url for resource in module.resources if resource.url)
+    if search is not None:
+        urls.extend(hit.url for hit in search.resources if hit.url)
+    return urls
+
+
+def link_report(results: Dict[str, LinkStatus]) -> Dict[str, object]:
+    """Counts and the broken links, for logs and the summary."""
+    broken = [status for status in results.values() if not status.ok]
+    return {
+        "checked": len(results),
+        "broken": len(broken),
+        "broken_links": [
+            {"url": status.url, "status": status.status, "error": status.error} for status in broken
+        ],
+    }
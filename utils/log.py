@@ -0,0 +1,186 @@
+# utils/log.py
+# Structured, leveled logging with a background writer and an in-memory ring buffer.
+#
+# Components log through get_logger("crew"), get_logger("app"), ... with
+# structured fields passed as keyword arguments to fields(). Records go through
+# a QueueHandler, so the calling thread only enqueues; formatting and console /
+# file output happen on a listener thread. Large field values are sampled:
+# most are cut to a short preview, one in HAILEI_LOG_PAYLOAD_SAMPLE_EVERY is
+# kept whole. The last HAILEI_LOG_RING_SIZE records stay in memory for
+# debugging (recent_logs()).
+#
+# Settings (read once, when the first logger is created; app.py loads .env before that):
+#   HAILEI_LOG_LEVEL          default level for all components (INFO)
+#   HAILEI_LOG_LEVELS         per-component overrides, e.g. "crew=DEBUG,crew.agents=DEBUG,app=WARNING"
+#   HAILEI_LOG_FORMAT         "text" (default) or "json"
+#   HAILEI_LOG_FILE           also write records to this file
+#   HAILEI_LOG_RING_SIZE      records kept in memory (2000)
+#   HAILEI_LOG_PAYLOAD_LIMIT  characters above which a field value is sampled (2000)
+#   HAILEI_LOG_PAYLOAD_SAMPLE_EVERY  keep every Nth large value whole (100)
+#
+# CrewAI's own console output (verbose=True) is enabled per component only when
+# that component logs at DEBUG, e.g. HAILEI_LOG_LEVELS="crew.agents=DEBUG".
+
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from utils.settings import env_int, env_str
+
+ROOT = "hailei"
+
+_configured = False
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_ring: deque = deque(maxlen=2000)
+
+
+def fields(**values: Any) -> Dict[str, Any]:
+    """Structured fields for a log call: ``log.info("Warm start", extra=fields(similarity=0.8))``."""
+    return {"fields": values}
+
+
+class PayloadSampler(logging.Filter):
+    """Cut large field values to a preview, keeping every Nth one whole."""
+
+    def __init__(self, limit: int, sample_every: int):
+        super().__init__()
+        self.limit = limit
+        self.sample_every = max(1, sample_every)
+        self._counter = itertools.count(1)
+
+    def _sample(self, value: Any) -> Any:
+        text = value if isinstance(value, str) else None
+        if text is None:
+            if isinstance(value, (int, float, bool)) or value is None:
+                return value
+            text = repr(value)
+        if len(text) <= self.limit or next(self._counter) % self.sample_every == 0:
+            return value
+        return f"{text[:200]}... <{type(value).__name__}, {len(text)} chars, sampled out>"
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        values = getattr(record, "fields", None)
+        if values:
+            record.fields = {key: self._sample(value) for key, value in values.items()}
+        if record.args:
+            record.args = tuple(self._sample(arg) for arg in record.args) if isinstance(record.args, tuple) else record.args
+        return True
+
+
+def _record_dict(record: logging.LogRecord) -> Dict[str, Any]:
+    entry = {
+        "ts": round(record.created, 3),
+        "level": record.levelname,
+        "component": record.name[len(ROOT) + 1:] if record.name.startswith(ROOT + ".") else record.name,
+        "msg": record.getMessage(),
+    }
+    for key, value in (getattr(record, "fields", None) or {}).items():
+        entry[f"field_{key}" if key in entry else key] = value  # never clobber the record's own keys
+    if record.exc_info:
+        entry["exc"] = logging.Formatter().formatException(record.exc_info)
+    return entry
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(_record_dict(record), default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = _record_dict(record)
+        stamp = time.strftime("%H:%M:%S", time.localtime(entry.pop("ts")))
+        level, component, msg = entry.pop("level"), entry.pop("component"), entry.pop("msg")
+        exc = entry.pop("exc", None)
+        line = f"{stamp} {level:<7} {component}: {msg}"
+        if entry:
+            line += " " + " ".join(f"{key}={value}" for key, value in entry.items())
+        return f"{line}\n{exc}" if exc else line
+
+
+class RingBufferHandler(logging.Handler):
+    """Keep the most recent records (as dicts) in memory."""
+
+    def __init__(self, buffer: deque):
+        super().__init__()
+        self.buffer = buffer
+
+    def emit(self, record: logging.LogRecord):
+        self.buffer.append(_record_dict(record))
+
+
+def _component_levels(spec: str) -> Dict[str, int]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def configure_logging():
+    """Install the queue handler, listener and ring buffer once per process."""
+    global _configured, _listener, _ring
+    with _configure_lock:
+        if _configured:
+            return
+        root = logging.getLogger(ROOT)
+        root.setLevel(logging.getLevelName(env_str("HAILEI_LOG_LEVEL", "INFO").upper()))
+        root.propagate = False
+        for name, level in _component_levels(env_str("HAILEI_LOG_LEVELS")).items():
+            if isinstance(level, int):
+                logging.getLogger(f"{ROOT}.{name}").setLevel(level)
+
+        formatter = JsonFormatter() if env_str("HAILEI_LOG_FORMAT", "text") == "json" else TextFormatter()
+        _ring = deque(maxlen=env_int("HAILEI_LOG_RING_SIZE", 2000))
+        handlers: List[logging.Handler] = [logging.StreamHandler(), RingBufferHandler(_ring)]
+        log_file = env_str("HAILEI_LOG_FILE")
+        if log_file:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in handlers[:1] + handlers[2:]:
+            handler.setFormatter(formatter)
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(PayloadSampler(
+            env_int("HAILEI_LOG_PAYLOAD_LIMIT", 2000), env_int("HAILEI_LOG_PAYLOAD_SAMPLE_EVERY", 100)
+        ))
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        import atexit
+
+        atexit.register(_listener.stop)  # drain queued records on exit
+        _configured = True
+
+
+def get_logger(component: str) -> logging.Logger:
+    """Logger for one component ("app", "crew", "crew.agents", "session_store", ...)."""
+    configure_logging()
+    return logging.getLogger(f"{ROOT}.{component}")
+
+
+def verbose(component: str) -> bool:
+    """Whether CrewAI console output (verbose=True) is on for ``component``: its level is DEBUG."""
+    return get_logger(component).isEnabledFor(logging.DEBUG)
+
+
+def recent_logs(limit: int = 200, level: str = "DEBUG", component: str = "") -> List[Dict[str, Any]]:
+    """The most recent records from the ring buffer, optionally filtered by level and component prefix."""
+    threshold = logging.getLevelName(level.upper())
+    threshold = threshold if isinstance(threshold, int) else logging.DEBUG
+    records = [
+        entry for entry in list(_ring)
+        if logging.getLevelName(entry["level"]) >= threshold and entry["component"].startswith(component)
+    ]
+    return records[-limit:]
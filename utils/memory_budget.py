@@ -0,0 +1,209 @@
+# utils/memory_budget.py
+# Memory accounting for a long-running app process.
+#
+# Per-session footprints are estimated by walking each session's objects
+# (CoordinatorState, design ledger, progress feed) with sys.getsizeof; the app
+# evicts sessions that are idle, over the per-session budget or, least
+# recently used first, over the global budget. Evicted sessions are already in
+# the session store; their design ledgers are spilled to disk and reloaded on
+# the next design run. With HAILEI_TRACEMALLOC=1, tracemalloc snapshots report
+# the top allocators and the growth since a baseline, to find leaks.
+
+import os
+import pickle
+import sys
+import threading
+import tracemalloc
+import types
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from utils.settings import env_flag, env_float, env_int
+
+MB = 1024 * 1024
+_NOT_OWNED = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType, threading.Thread)
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate bytes held by ``obj`` and everything it references (shared objects counted once)."""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _NOT_OWNED):
+            continue
+        seen.add(id(item))
+        try:
+            total += sys.getsizeof(item)
+        except TypeError:
+            continue
+        if isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        if hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        for slot in getattr(type(item), "__slots__", ()):
+            if isinstance(slot, str) and hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
+
+
+class SessionUsage(NamedTuple):
+    """Estimated footprint of one in-memory session."""
+    session_id: str
+    bytes: int
+    idle_seconds: float
+    busy: bool
+
+
+class MemoryBudget:
+    """Per-session and global memory budgets, and which sessions to evict to meet them.
+
+    Budgets of 0 are unlimited. Busy sessions (a turn or design run in
+    progress) are never evicted.
+    """
+
+    def __init__(
+        self,
+        session_budget_mb: Optional[float] = None,
+        total_budget_mb: Optional[float] = None,
+        idle_seconds: Optional[float] = None,
+    ):
+        self.session_budget = (env_float("HAILEI_SESSION_MEMORY_MB", 0.0) if session_budget_mb is None else session_budget_mb) * MB
+        self.total_budget = (env_float("HAILEI_MEMORY_BUDGET_MB", 0.0) if total_budget_mb is None else total_budget_mb) * MB
+        self.idle_seconds = env_float("HAILEI_SESSION_IDLE_SECONDS", 3600.0) if idle_seconds is None else idle_seconds
+        self.evictions: Dict[str, int] = {"idle": 0, "session_budget": 0, "total_budget": 0}
+
+    def plan(self, usage: Iterable[SessionUsage]) -> Dict[str, str]:
+        """Session ID -> reason, for the sessions to evict."""
+        usage = list(usage)
+        idle = [row for row in usage if not row.busy]
+        evict = {}
+        for row in idle:
+            if self.idle_seconds and row.idle_seconds >= self.idle_seconds:
+                evict[row.session_id] = "idle"
+            elif self.session_budget and row.bytes > self.session_budget:
+                evict[row.session_id] = "session_budget"
+
+        if self.total_budget:
+            total = sum(row.bytes for row in usage if row.session_id not in evict)
+            for row in sorted(idle, key=lambda row: row.idle_seconds, reverse=True):
+                if total <= self.total_budget:
+                    break
+                if row.session_id not in evict:
+                    evict[row.session_id] = "total_budget"
+                    total -= row.bytes
+        return evict
+
+
+# ----------------------------------------------------------------------------
+# Spill to disk
+# ----------------------------------------------------------------------------
+
+def spill(directory: str, session_id: str, name: str, obj: Any):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{session_id}.{name}.pkl")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def unspill(directory: str, session_id: str, name: str) -> Any:
+    """Load and remove a spilled object; None if there is none."""
+    path = os.path.join(directory, f"{session_id}.{name}.pkl")
+    try:
+        with open(path, "rb") as file:
+            obj = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    os.remove(path)
+    return obj
+
+
+# ----------------------------------------------------------------------------
+# tracemalloc snapshots
+# ----------------------------------------------------------------------------
+
+_baseline: Optional[tracemalloc.Snapshot] = None
+_baseline_lock = threading.Lock()
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+
+
+def start_tracing():
+    """Start tracemalloc when HAILEI_TRACEMALLOC is set (it slows allocation-heavy code noticeably)."""
+    global _baseline
+    if env_flag("HAILEI_TRACEMALLOC") and not tracemalloc.is_tracing():
+        tracemalloc.start(env_int("HAILEI_TRACEMALLOC_FRAMES", 1))
+        with _baseline_lock:
+            _baseline = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def reset_baseline():
+    """Make the current heap the reference for growth reports."""
+    global _baseline
+    if tracemalloc.is_tracing():
+        with _baseline_lock:
+            _baseline = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def _stat_row(stat) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    return {
+        "where": f"{frame.filename}:{frame.lineno}",
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+
+
+def top_allocators(limit: int = 20) -> Dict[str, Any]:
+    """Largest allocation sites now and the ones that grew most since the baseline."""
+    if not tracemalloc.is_tracing():
+        return {"tracing": False, "hint": "set HAILEI_TRACEMALLOC=1 to record allocations"}
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    current, peak = tracemalloc.get_traced_memory()
+    with _baseline_lock:
+        baseline = _baseline
+    growth = snapshot.compare_to(baseline, "lineno") if baseline is not None else []
+    return {
+        "tracing": True,
+        "traced_mb": round(current / MB, 1),
+        "peak_mb": round(peak / MB, 1),
+        "top": [_stat_row(stat) for stat in snapshot.statistics("lineno")[:limit]],
+        "growth_since_baseline": [
+            {**_stat_row(stat), "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+            for stat in growth[:limit] if stat.size_diff > 0
+        ],
+    }
+
+
+def process_rss_mb() -> Optional[float]:
+    """Resident set size of this process, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / MB, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak, KiB on Linux, bytes on macOS
+        return round(peak / (MB if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        return None
+
+
+def usage_rows(usage: List[SessionUsage], limit: int = 20) -> List[Dict[str, Any]]:
+    """Largest sessions first, for the operations API."""
+    return [
+        {"session_id": row.session_id, "kb": round(row.bytes / 1024, 1),
+         "idle_s": round(row.idle_seconds), "busy": row.busy}
+        for row in sorted(usage, key=lambda row: row.bytes, reverse=True)[:limit]
+    ]
+
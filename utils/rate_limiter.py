@@ -0,0 +1,294 @@
+# utils/rate_limiter.py
+# Process-wide LLM concurrency limiter with token-bucket rate limiting.
+#
+# Every LLM used by an agent is routed through one ModelLimiter per model name,
+# shared by all sessions and design runs. Each limiter enforces requests/minute
+# and tokens/minute buckets plus a cap on calls in flight, and serves waiting
+# calls by priority so interactive coordinator turns go ahead of batch design
+# tasks. When too many calls are already queued, new ones are rejected
+# (backpressure) instead of piling up behind provider rate limits.
+
+import contextvars
+import functools
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Priorities: lower values are served first.
+INTERACTIVE = 0
+BATCH = 10
+SPECULATIVE = 20  # work that may be thrown away (utils/speculation.py)
+
+LIMITS_CONFIG = Path(__file__).resolve().parent.parent / "config" / "llm_limits.yaml"
+COMPLETION_TOKEN_RESERVE = 1000  # tokens reserved for the reply until the real size is known
+CHARS_PER_TOKEN = 4
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("hailei_llm_priority", default=BATCH)
+_on_admission: contextvars.ContextVar = contextvars.ContextVar("hailei_llm_on_admission", default=None)
+
+
+class LimiterQueueFull(RuntimeError):
+    """Raised when a model's wait queue is full and the call is shed."""
+
+
+class LimiterTimeout(TimeoutError):
+    """Raised when a call waited longer than its timeout for capacity."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (amounts above capacity wait for a full bucket)."""
+        self._refill()
+        needed = min(amount, self.capacity) - self.tokens
+        if needed <= 0:
+            return 0.0
+        return needed / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def give(self, amount: float):
+        """Return (or, with a negative amount, charge) tokens after the real usage is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelLimiter:
+    """Priority-ordered admission control for one model."""
+
+    def __init__(
+        self,
+        model: str,
+        rpm: float,
+        tpm: float,
+        max_concurrency: int = 8,
+        max_queue: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._clock = clock
+        self._requests = TokenBucket(rpm, clock=clock)
+        self._tokens = TokenBucket(tpm, clock=clock)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+
+        # Metrics
+        self._granted = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._max_depth = 0
+
+    def acquire(self, tokens: int, priority: int = BATCH, timeout: Optional[float] = None) -> float:
+        """Block until the call may start; returns the time spent waiting in seconds."""
+        started = self._clock()
+        deadline = started + timeout if timeout is not None else None
+        with self._cond:
+            # Interactive turns are never shed; backpressure applies to batch work.
+            if priority > INTERACTIVE and len(self._queue) >= self.max_queue:
+                self._rejected += 1
+                raise LimiterQueueFull(f"{self.model}: {len(self._queue)} calls already waiting")
+
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._queue, entry)
+            self._max_depth = max(self._max_depth, len(self._queue))
+            try:
+                while True:
+                    wait = None
+                    if self._queue[0] == entry and self._in_flight < self.max_concurrency:
+                        wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+                        if wait <= 0:
+                            break
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise LimiterTimeout(f"{self.model}: no capacity within {timeout:.1f}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._in_flight += 1
+
+            waited = self._clock() - started
+            self._granted += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._cond.notify_all()
+            return waited
+
+    def release(self, reserved_tokens: int, used_tokens: Optional[int] = None):
+        """Finish a call, settling the token reservation against the real usage."""
+        with self._cond:
+            self._in_flight -= 1
+            if used_tokens is not None:
+                self._tokens.give(reserved_tokens - used_tokens)
+            self._cond.notify_all()
+
+    @contextmanager
+    def limit(self, tokens: int, priority: Optional[int] = None, timeout: Optional[float] = None):
+        """Hold a slot for the duration of one call; yields a dict to report ``used_tokens``."""
+        self.acquire(tokens, _priority.get() if priority is None else priority, timeout)
+        usage = {"used_tokens": None}
+        try:
+            yield usage
+        finally:
+            self.release(tokens, usage["used_tokens"])
+
+    def queue_depth(self) -> int:
+        """Calls currently waiting for capacity."""
+        with self._cond:
+            return len(self._queue)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "model": self.model,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_depth,
+                "in_flight": self._in_flight,
+                "granted": self._granted,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_wait_s": round(self._wait_total / self._granted, 3) if self._granted else 0.0,
+                "max_wait_s": round(self._wait_max, 3),
+                "requests_available": round(self._requests.tokens, 1),
+                "tokens_available": round(self._tokens.tokens),
+            }
+
+
+# ----------------------------------------------------------------------------
+# Registry and integration
+# ----------------------------------------------------------------------------
+
+_limiters: Dict[str, ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+_limits_config: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def model_limits(model: str) -> Dict[str, Any]:
+    """Settings for ``model`` from config/llm_limits.yaml, over the ``default`` section."""
+    global _limits_config
+    if _limits_config is None:
+        from utils.config_cache import load_yaml_snapshot
+
+        try:
+            _limits_config = load_yaml_snapshot(LIMITS_CONFIG)
+        except FileNotFoundError:
+            _limits_config = {}
+    limits = dict(_limits_config.get("default", {}))
+    limits.update(_limits_config.get(model, {}))
+    return limits
+
+
+def get_limiter(model: str) -> ModelLimiter:
+    """Return the shared limiter for ``model``, creating it from config/llm_limits.yaml."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limits = model_limits(model)
+            limiter = ModelLimiter(
+                model,
+                rpm=limits.get("rpm", 500),
+                tpm=limits.get("tpm", 150000),
+                max_concurrency=limits.get("max_concurrency", 8),
+                max_queue=limits.get("max_queue", 64),
+            )
+            _limiters[model] = limiter
+        return limiter
+
+
+def limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Queue depth, in-flight calls and wait statistics for every model seen so far."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.model: limiter.metrics() for limiter in limiters}
+
+
+@contextmanager
+def on_admission(callback: Callable[[], None]):
+    """Call ``callback`` when an enclosed rate-limited call is admitted, i.e. leaves the queue."""
+    token = _on_admission.set(callback)
+    try:
+        yield
+    finally:
+        _on_admission.reset(token)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run the enclosed LLM calls at ``priority`` (e.g. INTERACTIVE for coordinator turns)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(value: Any) -> int:
+    """Cheap token estimate (~4 characters per token) for prompts and replies."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value) // CHARS_PER_TOKEN + 1
+    if isinstance(value, dict):
+        return estimate_tokens(value.get("content"))
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value)
+    return estimate_tokens(str(value))
+
+
+def rate_limited(llm):
+    """Route ``llm.call`` through the shared limiter for its model. Safe to call twice."""
+    if llm is None or getattr(llm, "_hailei_rate_limited", False):
+        return llm
+
+    limiter = get_limiter(getattr(llm, "model", "default"))
+    inner = llm.call
+
+    @functools.wraps(inner)
+    def call(messages, *args, **kwargs):
+        reserved = estimate_tokens(messages) + COMPLETION_TOKEN_RESERVE
+        with limiter.limit(reserved) as usage:
+            admitted = _on_admission.get()
+            if admitted is not None:
+                admitted()
+            response = inner(messages, *args, **kwargs)
+            usage["used_tokens"] = estimate_tokens(messages) + estimate_tokens(response)
+            return response
+
+    # BaseLLM falls back to object.__setattr__ for non-field attributes.
+    setattr(llm, "call", call)
+    setattr(llm, "_hailei_rate_limited", True)
+    return llm
@@ -0,0 +1,69 @@
+# utils/remediation.py
+# Rule-based checks that decide when CAuthAi must revise the course content.
+#
+# The design phase used to rely on the hierarchical manager reading the review
+# and audit outputs to decide whether to re-engage CAuthAi. These rules are the
+# same ones written in the coordinator backstory, evaluated in code instead.
+
+from typing import List, Optional
+
+from models.models import CourseAuditReport, CourseContentReview
+
+# Compliance flag -> task that has to re-check the revised content
+COMPLIANCE_CHECKS = {
+    "udl_compliance": "content_review_task",
+    "accessibility_passed": "content_review_task",
+    "ethical_compliance": "ethical_audit_task",
+}
+
+
+def failing_checks(
+    review: Optional[CourseContentReview],
+    audit: Optional[CourseAuditReport],
+) -> List[str]:
+    """Return the compliance flags that are False. Missing reports are not treated as failures."""
+    failing = []
+    if review is not None:
+        if not review.udl_compliance:
+            failing.append("udl_compliance")
+        if not review.accessibility_passed:
+            failing.append("accessibility_passed")
+    if audit is not None and not audit.ethical_compliance:
+        failing.append("ethical_compliance")
+    return failing
+
+
+def tasks_to_recheck(failing: List[str]) -> List[str]:
+    """Return the review/audit tasks to re-run after a revision, in pipeline order."""
+    tasks = []
+    for flag in failing:
+        task_name = COMPLIANCE_CHECKS[flag]
+        if task_name not in tasks:
+            tasks.append(task_name)
+    return sorted(tasks, key=list(COMPLIANCE_CHECKS.values()).index)
+
+
+def remediation_brief(
+    failing: List[str],
+    review: Optional[CourseContentReview],
+    audit: Optional[CourseAuditReport],
+) -> str:
+    """Build the targeted list of issues CAuthAi must fix, limited to the failing checks."""
+    lines = [f"Failing checks: {', '.join(failing)}"]
+
+    if review is not None and ("udl_compliance" in failing or "accessibility_passed" in failing):
+        lines.append("")
+        lines.append("EditorAi findings:")
+        for finding in review.findings:
+            lines.append(f"- [{finding.area}] {finding.issue} -> {finding.recommendation}")
+        if review.accessibility_checks:
+            lines.append(f"- Accessibility checks: {', '.join(review.accessibility_checks)}")
+        if not review.findings and review.summary_markdown:
+            lines.append(f"- {review.summary_markdown.strip()}")
+
+    if audit is not None and "ethical_compliance" in failing:
+        lines.append("")
+        lines.append("EthosAi audit notes:")
+        lines.append(f"- {audit.notes.strip()}")
+
+    return "\n".join(lines)
@@ -0,0 +1,261 @@
+# utils/run_budget.py
+# Per-run token and cost budget with graceful degradation.
+#
+# Inside run_budget_scope(), every LLM call made by an agent (and every hedged
+# duplicate) is charged to the run's RunBudget: estimated prompt and completion
+# tokens, and their cost from litellm's bundled price map. As the budget is
+# used up the run degrades in steps instead of overspending:
+#
+#   SMALLER_MODELS   calls go to the model's ``downgrade_model`` (config/llm_limits.yaml)
+#   COMPACT_CONTEXT  tools return compact JSON and warm-start drafts are dropped
+#   SKIP_OPTIONAL    optional work (``optional: true`` tasks, content revisions,
+#                    extra LMS platforms) is skipped
+#   EXHAUSTED        no further LLM calls; the run stops with what it has
+#
+# The stage thresholds are fractions of the budget (HAILEI_BUDGET_STAGES).
+
+import contextvars
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from utils.rate_limiter import estimate_tokens, model_limits, rate_limited
+from utils.settings import env_float, env_str
+
+NORMAL = 0
+SMALLER_MODELS = 1
+COMPACT_CONTEXT = 2
+SKIP_OPTIONAL = 3
+EXHAUSTED = 4
+
+STAGE_NAMES = ["normal", "smaller_models", "compact_context", "skip_optional", "exhausted"]
+
+RECENT_RUNS = 20  # design runs kept for run_metrics()
+
+_budget: contextvars.ContextVar = contextvars.ContextVar("hailei_run_budget", default=None)
+_recent_runs = deque(maxlen=RECENT_RUNS)
+_recent_runs_lock = threading.Lock()
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised instead of an LLM call once the run's budget is used up."""
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost of a call from litellm's price map; 0.0 for models it does not know."""
+    try:
+        from litellm import cost_per_token
+
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return 0.0
+
+
+class RunBudget:
+    """Token and cost accounting for one design run. Limits of 0 are unlimited."""
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost_usd: Optional[float] = None,
+                 stages: Optional[List[float]] = None):
+        self.max_tokens = env_float("HAILEI_RUN_TOKEN_BUDGET", 1_000_000) if max_tokens is None else max_tokens
+        self.max_cost = env_float("HAILEI_RUN_COST_BUDGET_USD", 0.0) if max_cost_usd is None else max_cost_usd
+        if stages is None:
+            stages = [float(value) for value in env_str("HAILEI_BUDGET_STAGES", "0.6,0.75,0.9").split(",")]
+        self.stages = sorted(stages)[:3] + [1.0]
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.calls = 0
+        self.by_model: Dict[str, Dict[str, float]] = {}
+        self.stage_reached: Dict[str, str] = {}  # stage name -> task running when it was reached
+        self._task = ""
+        self.skipped: List[str] = []
+        self.cancelled = False
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.max_tokens or self.max_cost)
+
+    def used(self) -> float:
+        """Fraction of the tighter of the two limits used so far."""
+        with self._lock:
+            fractions = []
+            if self.max_tokens:
+                fractions.append((self.prompt_tokens + self.completion_tokens) / self.max_tokens)
+            if self.max_cost:
+                fractions.append(self.cost / self.max_cost)
+        return max(fractions, default=0.0)
+
+    def stage(self) -> int:
+        used = self.used()
+        return sum(used >= threshold for threshold in self.stages)
+
+    def at_least(self, stage: int) -> bool:
+        return self.limited and self.stage() >= stage
+
+    def charge(self, model: str, prompt_tokens: int, completion_tokens: int):
+        cost = call_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += cost
+            self.calls += 1
+            row = self.by_model.setdefault(model, {"calls": 0, "tokens": 0, "cost_usd": 0.0})
+            row["calls"] += 1
+            row["tokens"] += prompt_tokens + completion_tokens
+            row["cost_usd"] += cost
+
+    def add(self, other: "RunBudget"):
+        """Charge everything ``other`` was charged (e.g. a speculative task this run adopts) to this budget."""
+        with other._lock:
+            rows = {model: dict(row) for model, row in other.by_model.items()}
+            totals = (other.prompt_tokens, other.completion_tokens, other.cost, other.calls)
+        with self._lock:
+            self.prompt_tokens += totals[0]
+            self.completion_tokens += totals[1]
+            self.cost += totals[2]
+            self.calls += totals[3]
+            for model, row in rows.items():
+                mine = self.by_model.setdefault(model, {"calls": 0, "tokens": 0, "cost_usd": 0.0})
+                for name, value in row.items():
+                    mine[name] += value
+
+    def cancel(self):
+        """Refuse further calls: the work this budget pays for is no longer wanted."""
+        self.cancelled = True
+
+    def note_task(self, task_name: str):
+        """Mark the start of a design task, for reporting where each stage was reached."""
+        with self._lock:
+            self._task = task_name
+        self.note_stage(self.stage() if self.limited else NORMAL)
+
+    def note_stage(self, stage: int):
+        with self._lock:
+            for reached in range(SMALLER_MODELS, stage + 1):
+                self.stage_reached.setdefault(STAGE_NAMES[reached], self._task)
+
+    def skip(self, what: str):
+        with self._lock:
+            self.skipped.append(what)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_tokens": self.max_tokens,
+                "max_cost_usd": self.max_cost,
+                "tokens": self.prompt_tokens + self.completion_tokens,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cost_usd": round(self.cost, 4),
+                "calls": self.calls,
+                "by_model": {model: {**row, "cost_usd": round(row["cost_usd"], 4)} for model, row in self.by_model.items()},
+                "stage_reached": dict(self.stage_reached),
+                "skipped": list(self.skipped),
+            }
+
+
+@contextmanager
+def run_budget_scope(budget: RunBudget):
+    """Charge LLM calls made in the enclosed block (and contexts copied from it) to ``budget``."""
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def current_budget() -> Optional[RunBudget]:
+    return _budget.get()
+
+
+def degraded(stage: int) -> bool:
+    """Whether the current run's budget has reached ``stage``."""
+    budget = _budget.get()
+    return budget is not None and budget.at_least(stage)
+
+
+def record_run(**stats: Any):
+    """Keep one finished design run's statistics (budget, tool calls, context tokens) for run_metrics()."""
+    with _recent_runs_lock:
+        _recent_runs.append(stats)
+
+
+def run_metrics() -> List[Dict[str, Any]]:
+    """Statistics of the most recent design runs, oldest first, for the operations API."""
+    with _recent_runs_lock:
+        return list(_recent_runs)
+
+
+_answered_by: contextvars.ContextVar = contextvars.ContextVar("hailei_answered_by", default=None)
+
+
+def answered_by(model: str):
+    """Record that the current call's response came from ``model`` (e.g. a hedge), for budgeted()."""
+    _answered_by.set(model)
+
+
+def charge(model: str, prompt_tokens: int, completion_tokens: int):
+    """Charge a call to the current run's budget, if any."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.charge(model, prompt_tokens, completion_tokens)
+
+
+_downgrades: Dict[str, Any] = {}
+_downgrades_lock = threading.Lock()
+
+
+def _downgrade_llm(llm):
+    model = getattr(llm, "model", "default")
+    smaller = model_limits(model).get("downgrade_model")
+    if not smaller:
+        return None
+    with _downgrades_lock:
+        if smaller not in _downgrades:
+            from crewai import LLM
+
+            _downgrades[smaller] = rate_limited(LLM(model=smaller, temperature=getattr(llm, "temperature", None)))
+        return _downgrades[smaller]
+
+
+def budgeted(llm):
+    """Charge ``llm.call`` to the current run's budget and degrade as it runs low. Safe to call twice."""
+    if llm is None or getattr(llm, "_hailei_budgeted", False):
+        return llm
+    inner = llm.call
+
+    @functools.wraps(inner)
+    def call(messages, *args, **kwargs):
+        budget = _budget.get()
+        if budget is None:
+            return inner(messages, *args, **kwargs)
+        if budget.cancelled:
+            raise BudgetExceeded("the run was cancelled")
+        stage = budget.stage() if budget.limited else NORMAL
+        budget.note_stage(stage)
+        if stage >= EXHAUSTED:
+            raise BudgetExceeded("the run's token/cost budget is used up")
+
+        target = _downgrade_llm(llm) if stage >= SMALLER_MODELS else None
+        model = getattr(target or llm, "model", "default")
+        token = _answered_by.set(None)
+        try:
+            response = (target.call if target is not None else inner)(messages, *args, **kwargs)
+            answering = _answered_by.get() or model
+        finally:
+            _answered_by.reset(token)
+        prompt_tokens, completion_tokens = estimate_tokens(messages), estimate_tokens(response)
+        if answering != model:
+            budget.charge(model, prompt_tokens, 0)  # the model called still read the prompt
+        budget.charge(answering, prompt_tokens, completion_tokens)
+        return response
+
+    setattr(llm, "call", call)
+    setattr(llm, "_hailei_budgeted", True)
+    return llm
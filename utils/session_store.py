@@ -0,0 +1,185 @@
+# utils/session_store.py
+# SQLite-backed persistence for coordinator sessions and their chat history.
+#
+# Writes are batched in memory and flushed by a background thread
+# (write-behind), so a chat turn never waits on disk. Reads flush pending
+# writes first, so a session can always be resumed from what was saved.
+#
+# A resumed session loads its whole conversation history, not one page of it:
+# the coordinator prompt (CoordinatorState.formatted_history) is built from
+# every turn, so the history must be in memory anyway. "Load older messages"
+# in the UI pages through that in-memory history; the memory budget
+# (utils.memory_budget) is what bounds long sessions.
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from models.models import CoordinatorState, Message
+from utils.log import fields, get_logger
+
+log = get_logger("session_store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    state_json TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+"""
+
+
+class SessionStore:
+    """Persist CoordinatorState and messages per session ID with write-behind batching."""
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_batch: int = 200):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+
+        # Pending writes: latest state per session, new messages in order, and
+        # sessions whose stored history must be replaced (e.g. after a reset).
+        self._lock = threading.Lock()
+        self._pending_states: Dict[str, str] = {}
+        self._pending_messages: List[Tuple[str, int, str, str, float]] = []
+        self._pending_truncates: set = set()
+        self._queued_counts: Dict[str, int] = {}
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def save(self, session_id: str, state: CoordinatorState):
+        """Queue the state and any messages not yet persisted for this session."""
+        now = time.time()
+        history = state.conversation_history
+        with self._lock:
+            self._pending_states[session_id] = state.model_dump_json(exclude={"conversation_history"})
+
+            start = self._queued_counts.get(session_id)
+            if start is None:
+                start = self._stored_count(session_id)
+            if len(history) < start:
+                # History was reset or shortened: rewrite it from scratch.
+                self._pending_truncates.add(session_id)
+                self._pending_messages = [m for m in self._pending_messages if m[0] != session_id]
+                start = 0
+            for seq in range(start, len(history)):
+                message = history[seq]
+                self._pending_messages.append((session_id, seq, message.role, message.content, now))
+            self._queued_counts[session_id] = len(history)
+            backlog = len(self._pending_messages) + len(self._pending_states)
+
+        if backlog >= self.max_batch:
+            self._wake.set()
+
+    def forget(self, session_id: str):
+        """Drop in-memory bookkeeping for a session evicted from the app's cache; its data stays stored."""
+        self.flush()
+        with self._lock:
+            if session_id not in self._pending_states:
+                self._queued_counts.pop(session_id, None)
+
+    def flush(self):
+        """Write every pending change in a single transaction."""
+        with self._lock:
+            states, self._pending_states = self._pending_states, {}
+            messages, self._pending_messages = self._pending_messages, []
+            truncates, self._pending_truncates = self._pending_truncates, set()
+        if not (states or messages or truncates):
+            return
+
+        now = time.time()
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM messages WHERE session_id = ?", [(sid,) for sid in truncates]
+            )
+            self._conn.executemany(
+                "INSERT INTO sessions (session_id, state_json, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET state_json = excluded.state_json, "
+                "updated_at = excluded.updated_at",
+                [(sid, state_json, now) for sid, state_json in states.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (session_id, seq, role, content, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                messages,
+            )
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                log.warning("Session store flush failed", extra=fields(error=str(e)))
+
+    def close(self):
+        """Flush pending writes and stop the background writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _stored_count(self, session_id: str) -> int:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0]
+
+    def load_state(self, session_id: str) -> Optional[CoordinatorState]:
+        """Resume a session: its saved state plus the full conversation history.
+
+        The history is not paged with LIMIT/OFFSET because the coordinator prompt needs all of it.
+        """
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT state_json FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+
+        state = CoordinatorState.model_validate_json(row[0])
+        state.conversation_history = [Message(role=role, content=content) for role, content in rows]
+        with self._lock:
+            self._queued_counts[session_id] = len(rows)
+        return state
@@ -0,0 +1,39 @@
+# utils/settings.py
+# Runtime switches read from the environment (.env is loaded by app.py).
+#
+# Values are read on every call rather than at import time so that settings
+# loaded by load_dotenv() after import are still honoured.
+
+import os
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Return a boolean switch such as HAILEI_POLISH_OVERVIEW=1."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def env_int(name: str, default: int) -> int:
+    """Return an integer setting, falling back to ``default`` when unset or invalid."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Return a float setting, falling back to ``default`` when unset or invalid."""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_str(name: str, default: str = "") -> str:
+    """Return a string setting with surrounding whitespace removed."""
+    value = os.getenv(name)
+    return value.strip() if value and value.strip() else default
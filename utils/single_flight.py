@@ -0,0 +1,62 @@
+# utils/single_flight.py
+# Single-flight deduplication of identical in-flight requests.
+#
+# The first caller for a key runs the work; callers that arrive with the same
+# key while it is still running wait for that execution and receive its result
+# (or its exception) instead of starting a duplicate LLM pipeline.
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+
+def flight_key(*parts: Any) -> str:
+    """Stable hash of the request parts (session ID, handler name, inputs)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": len(self._calls), "executions": self.executions, "coalesced": self.coalesced}
@@ -0,0 +1,203 @@
+# utils/speculation.py
+# Speculative instructional planning while the coordinator chat is still going.
+#
+# Once a session's course request has stayed the same for
+# HAILEI_SPECULATE_AFTER_TURNS coordinator turns, approval is usually near, so
+# (with HAILEI_SPECULATIVE_PLANNING=1) instructional_planning_task is started
+# in the background on that request. A speculation is keyed on the task's input
+# hash (utils.design_ledger.input_hash): on approval, kickoff_task claims it if
+# the hash still matches, waiting for it if it is still running, and discards
+# it otherwise. A request that changes mid-chat discards it at once. Speculative
+# LLM calls queue behind design runs (SPECULATIVE priority) and are charged to
+# the speculation's own RunBudget: a claimed speculation's spend moves to the
+# design run's budget, a discarded one is cancelled if it has not started and
+# makes no further LLM calls if it has. Speculative tokens, and how many of
+# them were thrown away, are reported by speculation_stats().
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.log import fields, get_logger
+from utils.rate_limiter import SPECULATIVE, llm_priority
+from utils.run_budget import RunBudget, current_budget, run_budget_scope
+from utils.settings import env_int
+
+log = get_logger("speculation")
+
+_speculation: contextvars.ContextVar = contextvars.ContextVar("hailei_speculation", default=None)
+_stats_lock = threading.Lock()
+_stats = {"started": 0, "claimed": 0, "discarded": 0, "failed": 0, "tokens": 0, "discarded_tokens": 0}
+
+
+def _count(outcome: str, amount: int = 1):
+    with _stats_lock:
+        _stats[outcome] += amount
+
+
+def speculation_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+class Speculation:
+    """One task started ahead of approval: its name, input hash and the request it was started for."""
+
+    def __init__(self, task_name: str, key: str, request_key: str):
+        self.task_name = task_name
+        self.key = key
+        self.request_key = request_key
+        self.future: Future = Future()
+        self.claimed = False
+        self.discarded = False
+        self.budget = RunBudget()
+        self._run: Optional[Future] = None  # the pool's future, to cancel while still queued
+        self._lock = threading.Lock()
+        self._finished = False
+        self._settled = False
+
+    def discard(self):
+        """Drop the speculation: cancel it if it has not started, else stop its remaining LLM calls."""
+        with self._lock:
+            if self.discarded:
+                return
+            self.discarded = True
+            run = self._run
+        _count("discarded")
+        self.budget.cancel()
+        if run is not None and run.cancel():
+            self.future.cancel()
+        self._settle()
+
+    def finish(self):
+        """Record the speculation's spend once its task has ended."""
+        with self._lock:
+            self._finished = True
+        _count("tokens", self.tokens())
+        self._settle()
+
+    def tokens(self) -> int:
+        return self.budget.stats()["tokens"]
+
+    def _settle(self):
+        # Tokens of a discarded speculation are counted once, whichever of discard/finish comes last.
+        with self._lock:
+            if self._settled or not (self._finished and self.discarded):
+                return
+            self._settled = True
+        _count("discarded_tokens", self.tokens())
+
+
+class Speculator:
+    """Per-session speculative tasks: started once the request is stable, dropped when it changes."""
+
+    def __init__(self, stable_turns: Optional[int] = None, workers: Optional[int] = None):
+        self.stable_turns = env_int("HAILEI_SPECULATE_AFTER_TURNS", 1) if stable_turns is None else stable_turns
+        workers = env_int("HAILEI_SPECULATION_WORKERS", 2) if workers is None else workers
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="hailei-speculate")
+        self._lock = threading.Lock()
+        self._seen: Dict[str, Tuple[str, int]] = {}  # session_id -> (request key, turns it stayed unchanged)
+        self._running: Dict[str, Speculation] = {}
+
+    def observe(self, session_id: str, request_key: str) -> bool:
+        """Note the request after a coordinator turn; True when a speculation should start for it."""
+        with self._lock:
+            previous, stable = self._seen.get(session_id, (None, 0))
+            stable = stable + 1 if request_key == previous else 0
+            self._seen[session_id] = (request_key, stable)
+            current = self._running.get(session_id)
+            if current is not None and current.request_key != request_key:
+                del self._running[session_id]
+                current.discard()
+                current = None
+                log.debug("Discarded a speculation: the request changed", extra=fields(session=session_id))
+            return current is None and stable >= self.stable_turns
+
+    def start(self, session_id: str, request_key: str, task_name: str, key: str, fn: Callable[[], Any]):
+        """Run ``fn`` (the task with inputs hashing to ``key``) in the background for this session."""
+        speculation = Speculation(task_name, key, request_key)
+
+        def run():
+            try:
+                with llm_priority(SPECULATIVE), run_budget_scope(speculation.budget):
+                    return fn()
+            finally:
+                speculation.finish()
+
+        # Submitted before it is published, so whoever discards it can still cancel the queued run.
+        speculation._run = self._pool.submit(run)
+        speculation._run.add_done_callback(lambda done: _chain(done, speculation.future))
+        with self._lock:
+            self._running[session_id] = speculation
+        _count("started")
+        log.info("Started a speculative task", extra=fields(session=session_id, task=task_name))
+
+    def take(self, session_id: str) -> Optional[Speculation]:
+        """Hand the session's speculation (if any) to the design run that is starting."""
+        with self._lock:
+            self._seen.pop(session_id, None)
+            return self._running.pop(session_id, None)
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._seen.pop(session_id, None)
+            speculation = self._running.pop(session_id, None)
+        if speculation is not None:
+            speculation.discard()
+
+
+def _chain(source: Future, target: Future):
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+@contextmanager
+def speculation_scope(speculation: Optional[Speculation]):
+    """Let kickoff_task claim ``speculation`` in the enclosed block; it is discarded if unclaimed."""
+    token = _speculation.set(speculation)
+    try:
+        yield speculation
+    finally:
+        _speculation.reset(token)
+        if speculation is not None and not speculation.claimed:
+            speculation.discard()
+
+
+def speculating() -> bool:
+    """Whether a speculation may be claimed in this context."""
+    return _speculation.get() is not None
+
+
+def claim(task_name: str, key: Optional[str]):
+    """The speculative result for ``task_name`` if it was started on inputs hashing to ``key``, else None.
+
+    Waits for a speculation that is still running. A failed speculation returns
+    None, so the task runs as usual.
+    """
+    speculation = _speculation.get()
+    if speculation is None or speculation.task_name != task_name or speculation.claimed:
+        return None
+    speculation.claimed = True
+    if speculation.key != key:
+        speculation.discard()
+        log.info("Discarded a speculation: task inputs changed", extra=fields(task=task_name))
+        return None
+    try:
+        result = speculation.future.result()
+    except Exception as e:
+        _count("failed")
+        log.warning("Speculative task failed; running it now", extra=fields(task=task_name, error=str(e)))
+        return None
+    finally:
+        budget = current_budget()
+        if budget is not None and speculation.future.done():
+            budget.add(speculation.budget)  # the design run pays for the speculation it waited on
+    _count("claimed")
+    log.info("Used the speculative result", extra=fields(task=task_name))
+    return result
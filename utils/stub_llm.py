@@ -0,0 +1,127 @@
+# utils/stub_llm.py
+# Offline stand-in for a provider LLM, used to exercise the rate limiter and
+# load-test the app (agent_llm() plugs it into real CrewAI agents) without
+# network access or API keys.
+
+import functools
+import random
+import threading
+import time
+import typing
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StubLLM:
+    """Answers every call with a canned reply after a configurable latency."""
+
+    def __init__(
+        self,
+        model: str = "stub",
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        reply: Optional[str] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.model = model
+        self.latency = latency
+        self.jitter = jitter
+        self.reply = reply or "Thought: I now know the final answer\nFinal Answer: OK"
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def call(self, messages: Any, *args, **kwargs) -> str:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.failure_rate
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{self.model}: simulated provider error")
+        return self.reply
+
+
+def agent_llm(stub: StubLLM, model: str):
+    """A CrewAI LLM named ``model`` whose calls are answered by ``stub``, so real crews run offline.
+
+    Replies are ReAct final answers. When the calling task declares an
+    ``output_pydantic`` (or CrewAI asks for a ``response_model``), the answer is
+    sample_output() of that model as JSON, so the task's typed output parses.
+    """
+    return _agent_llm_class()(model=model, stub=stub)
+
+
+@functools.lru_cache(maxsize=None)
+def _agent_llm_class():
+    from crewai.llms.base_llm import BaseLLM  # only the load test needs crewai here
+
+    class StubAgentLLM(BaseLLM):
+        stub: Any = Field(default=None, exclude=True)
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+                 from_agent=None, response_model=None):
+            reply = self.stub.call(messages)
+            output_model = response_model or getattr(from_task, "output_pydantic", None)
+            if output_model is None:
+                return reply
+            return f"Thought: I now know the final answer\nFinal Answer: {sample_output(output_model).model_dump_json()}"
+
+    return StubAgentLLM
+
+
+FILLER = (
+    "students apply the week's core concepts to an authentic case, compare approaches with peers, "
+    "and reflect on how the evidence supports their conclusions before the next module"
+).split()
+
+
+def _sample_text(name: str, words: int) -> str:
+    text = f"Sample {name.replace('_', ' ')}"
+    if words:
+        text += ": " + " ".join(FILLER[i % len(FILLER)] for i in range(words))
+    return text
+
+
+def _sample_value(annotation: Any, name: str, items: int = 1, words: int = 0) -> Any:
+    origin = typing.get_origin(annotation)
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if origin is typing.Union:
+        return _sample_value(args[0], name, items, words) if args else None
+    if origin is typing.Literal:
+        return args[0]
+    if origin in (list, tuple, set):
+        return [_sample_value(args[0], name, items, words) for _ in range(items)] if args else []
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _sample_model(annotation, items, words, {})
+    if annotation is bool:
+        return True
+    if annotation is int:
+        return 1
+    if annotation is float:
+        return 1.0
+    return _sample_text(name, words)
+
+
+def _sample_model(model: type, items: int, words: int, overrides: dict) -> BaseModel:
+    values = {
+        name: _sample_value(field.annotation, name, items, words)
+        for name, field in model.model_fields.items()
+        if name not in overrides
+    }
+    return model.model_validate({**values, **overrides})
+
+
+def sample_output(model: type, **overrides: Any) -> BaseModel:
+    """A valid instance of ``model`` with placeholder values, standing in for a task's typed output."""
+    return _sample_model(model, 1, 0, overrides)
+
+
+def representative_output(model: type, items: int = 4, words: int = 20, **overrides: Any) -> BaseModel:
+    """Like sample_output, but sized like a real artifact: ``items`` per list, ``words`` per text field."""
+    return _sample_model(model, items, words, overrides)
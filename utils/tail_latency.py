@@ -0,0 +1,277 @@
+# utils/tail_latency.py
+# Tail-latency control for design runs: per-task deadlines and hedged LLM calls.
+#
+# Deadlines bound how long one design task may run (``deadline_seconds`` in
+# config/tasks.yaml); a task that misses it is abandoned and the run continues
+# without its artifact. Hedging targets single slow LLM responses: when a call
+# is still running after the model's observed p95 latency, a duplicate is sent
+# to the alternate ``hedge_model`` from config/llm_limits.yaml and the first
+# valid response wins. Latency is measured from the moment the rate limiter
+# admits the call, so time spent queued neither counts towards the p95 nor
+# triggers a hedge, and no hedge is sent while either model's limiter has
+# calls waiting. Both keep metrics so the extra calls can be weighed against
+# the p99 they save.
+
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from utils.rate_limiter import estimate_tokens, get_limiter, model_limits, on_admission, rate_limited
+from utils.run_budget import answered_by, charge
+from utils.settings import env_flag
+
+LATENCY_WINDOW = 200  # recent calls per model used for the percentiles
+MIN_SAMPLES = 20  # below this, hedge after hedge_after_s instead of the observed p95
+DEFAULT_HEDGE_AFTER_S = 60.0
+
+_pool = ThreadPoolExecutor(max_workers=64, thread_name_prefix="hailei-hedge")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a design task runs past its deadline."""
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+# ----------------------------------------------------------------------------
+# Hedged LLM calls
+# ----------------------------------------------------------------------------
+
+class HedgeStats:
+    """Latency windows and hedging counters for one primary model."""
+
+    def __init__(self, model: str, hedge_model: str, hedge_after_s: float):
+        self.model = model
+        self.hedge_model = hedge_model
+        self.hedge_after_s = hedge_after_s
+        self._lock = threading.Lock()
+        self._primary = deque(maxlen=LATENCY_WINDOW)  # primary call latency, whether or not it won
+        self._effective = deque(maxlen=LATENCY_WINDOW)  # latency the caller actually saw
+        self.calls = 0
+        self.hedged = 0
+        self.hedges_suppressed = 0
+        self.hedge_wins = 0
+        self.hedge_tokens = 0
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            if len(self._primary) < MIN_SAMPLES:
+                return self.hedge_after_s
+            # A slow spell can inflate the p95; never wait longer than hedge_after_s.
+            return min(percentile(self._primary, 95), self.hedge_after_s)
+
+    def record_primary(self, seconds: float):
+        with self._lock:
+            self._primary.append(seconds)
+
+    def record_call(self, seconds: float, hedged: bool, hedge_won: bool, hedge_tokens: int = 0,
+                    suppressed: bool = False):
+        with self._lock:
+            self._effective.append(seconds)
+            self.calls += 1
+            self.hedged += hedged
+            self.hedges_suppressed += suppressed
+            self.hedge_wins += hedge_won
+            self.hedge_tokens += hedge_tokens
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            primary_p99 = percentile(self._primary, 99)
+            effective_p99 = percentile(self._effective, 99)
+            return {
+                "model": self.model,
+                "hedge_model": self.hedge_model,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedges_suppressed": self.hedges_suppressed,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": round(self.hedged / self.calls, 3) if self.calls else 0.0,
+                "hedge_tokens_est": self.hedge_tokens,
+                "primary_p50_s": round(percentile(self._primary, 50), 2),
+                "primary_p95_s": round(percentile(self._primary, 95), 2),
+                "primary_p99_s": round(primary_p99, 2),
+                "effective_p99_s": round(effective_p99, 2),
+                "p99_saved_s": round(primary_p99 - effective_p99, 2),
+            }
+
+
+_hedge_stats: Dict[str, HedgeStats] = {}
+_hedge_lock = threading.Lock()
+
+
+def hedge_metrics() -> Dict[str, Dict[str, Any]]:
+    """Hedging counters and primary vs effective latency percentiles per model."""
+    with _hedge_lock:
+        stats = list(_hedge_stats.values())
+    return {s.model: s.metrics() for s in stats}
+
+
+def _valid(response: Any) -> bool:
+    if isinstance(response, str):
+        return bool(response.strip())
+    return response is not None
+
+
+def hedged(llm):
+    """Hedge ``llm.call`` to the model's configured ``hedge_model``. Safe to call twice.
+
+    Apply it over rate_limited(), so the primary call is timed from its
+    admission rather than from when it joined the queue. Models without a
+    ``hedge_model`` in config/llm_limits.yaml are left as they are;
+    HAILEI_HEDGE_LLM_CALLS=0 turns hedging off.
+    """
+    if llm is None or getattr(llm, "_hailei_hedged", False) or not env_flag("HAILEI_HEDGE_LLM_CALLS", True):
+        return llm
+    model = getattr(llm, "model", "default")
+    limits = model_limits(model)
+    hedge_model = limits.get("hedge_model")
+    if not hedge_model:
+        return llm
+
+    with _hedge_lock:
+        stats = _hedge_stats.setdefault(
+            model, HedgeStats(model, hedge_model, limits.get("hedge_after_s", DEFAULT_HEDGE_AFTER_S))
+        )
+    inner = llm.call
+    alternate = {}
+    alternate_lock = threading.Lock()
+
+    def alternate_call(*args, **kwargs):
+        with alternate_lock:
+            if "llm" not in alternate:
+                from crewai import LLM
+
+                alternate["llm"] = rate_limited(LLM(model=hedge_model, temperature=getattr(llm, "temperature", None)))
+        return alternate["llm"].call(*args, **kwargs)
+
+    def backed_up() -> bool:
+        return get_limiter(model).queue_depth() > 0 or get_limiter(hedge_model).queue_depth() > 0
+
+    @functools.wraps(inner)
+    def call(messages, *args, **kwargs):
+        admitted = []  # monotonic time the limiter let the primary call through
+        ready = threading.Event()
+
+        def admit():
+            admitted.append(time.monotonic())
+            ready.set()
+
+        def run_primary():
+            with on_admission(admit):
+                return inner(messages, *args, **kwargs)
+
+        if not getattr(llm, "_hailei_rate_limited", False):
+            admit()
+        primary = _pool.submit(contextvars.copy_context().run, run_primary)
+        primary.add_done_callback(lambda _: ready.set())
+        primary.add_done_callback(lambda _: admitted and stats.record_primary(time.monotonic() - admitted[0]))
+
+        ready.wait()
+        if not admitted:  # failed before the limiter admitted it (e.g. shed from a full queue)
+            return primary.result()
+        started = admitted[0]
+        done, _ = wait([primary], timeout=max(0.0, stats.hedge_delay() - (time.monotonic() - started)))
+        if done or backed_up():
+            # A queue means the models are saturated: a hedge would only add load and wait its turn.
+            response = primary.result()
+            stats.record_call(time.monotonic() - started, hedged=False, hedge_won=False, suppressed=not done)
+            return response
+
+        hedge = _pool.submit(contextvars.copy_context().run, alternate_call, messages, *args, **kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and _valid(future.result()):
+                    hedge_won = future is hedge
+                    hedge_tokens = estimate_tokens(messages) + (estimate_tokens(future.result()) if hedge_won else 0)
+                    stats.record_call(time.monotonic() - started, hedged=True, hedge_won=hedge_won,
+                                      hedge_tokens=hedge_tokens)
+                    if hedge_won:
+                        answered_by(hedge_model)  # budgeted() charges the reply to the hedge model
+                    else:
+                        charge(hedge_model, estimate_tokens(messages), 0)
+                    return future.result()
+
+        # Neither response was usable: surface the primary outcome.
+        stats.record_call(time.monotonic() - started, hedged=True, hedge_won=False,
+                          hedge_tokens=estimate_tokens(messages))
+        charge(hedge_model, estimate_tokens(messages), 0)
+        return primary.result()
+
+    setattr(llm, "call", call)
+    setattr(llm, "_hailei_hedged", True)
+    return llm
+
+
+# ----------------------------------------------------------------------------
+# Task deadlines
+# ----------------------------------------------------------------------------
+
+_deadline_lock = threading.Lock()
+_deadline_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def deadline_metrics() -> Dict[str, Dict[str, Any]]:
+    """Runs, deadline misses and duration percentiles per design task."""
+    with _deadline_lock:
+        return {
+            name: {
+                "deadline_s": row["deadline_s"],
+                "runs": row["runs"],
+                "missed": row["missed"],
+                "p50_s": round(percentile(row["durations"], 50), 2),
+                "p95_s": round(percentile(row["durations"], 95), 2),
+                "p99_s": round(percentile(row["durations"], 99), 2),
+            }
+            for name, row in sorted(_deadline_stats.items())
+        }
+
+
+def _record_deadline(name: str, deadline: Optional[float], seconds: float, missed: bool):
+    with _deadline_lock:
+        row = _deadline_stats.setdefault(
+            name, {"deadline_s": deadline, "runs": 0, "missed": 0, "durations": deque(maxlen=LATENCY_WINDOW)}
+        )
+        row["runs"] += 1
+        row["missed"] += missed
+        row["durations"].append(seconds)
+
+
+def call_with_deadline(name: str, fn: Callable[[], Any], deadline: Optional[float]) -> Any:
+    """Run ``fn`` and raise DeadlineExceeded if it takes longer than ``deadline`` seconds.
+
+    Python threads cannot be cancelled, so a task past its deadline keeps running
+    in the background; its result is discarded.
+    """
+    started = time.monotonic()
+    if not deadline:
+        try:
+            return fn()
+        finally:
+            _record_deadline(name, deadline, time.monotonic() - started, missed=False)
+
+    future: Future = Future()
+    context = contextvars.copy_context()
+
+    def run():
+        try:
+            future.set_result(context.run(fn))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"hailei-task-{name}", daemon=True).start()
+    done, _ = wait([future], timeout=deadline)
+    _record_deadline(name, deadline, time.monotonic() - started, missed=not done)
+    if not done:
+        raise DeadlineExceeded(f"{name} exceeded its {deadline:g}s deadline")
+    return future.result()
@@ -0,0 +1,128 @@
+# utils/tool_cache.py
+# Run-scoped memoization of the deterministic tools in tools/.
+#
+# Within one design run, agents often call the Bloom's, accessibility and
+# resource search tools repeatedly with the same arguments. Inside a
+# tool_run_scope(), each distinct call (keyed by the tool name, its normalized
+# arguments and the output mode) runs once; repeats, including concurrent ones
+# from the per-week fan-out, get the stored result. Outside a scope tools run
+# uncached.
+
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.tool_output import compact_tool_output
+
+_run_cache: contextvars.ContextVar = contextvars.ContextVar("hailei_tool_run_cache", default=None)
+
+
+class ToolRunCache:
+    """Results of the tool calls made during one design run, with hit counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: Dict[str, Future] = {}
+        self._calls: Dict[str, int] = {}
+        self._hits: Dict[str, int] = {}
+
+    def call(self, tool_name: str, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._calls[tool_name] = self._calls.get(tool_name, 0) + 1
+            future = self._results.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._results[key] = future
+            else:
+                self._hits[tool_name] = self._hits.get(tool_name, 0) + 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            # Failures are not cached: the next identical call tries again.
+            with self._lock:
+                self._results.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Calls, cache hits and hit rate per tool."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "hits": self._hits.get(name, 0),
+                    "hit_rate": round(self._hits.get(name, 0) / calls, 3),
+                }
+                for name, calls in sorted(self._calls.items())
+            }
+
+
+@contextmanager
+def tool_run_scope():
+    """Memoize tool calls made in the enclosed block (and contexts copied from it)."""
+    cache = ToolRunCache()
+    token = _run_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _run_cache.reset(token)
+
+
+def current_run_cache() -> Optional[ToolRunCache]:
+    return _run_cache.get()
+
+
+def _normalize(value: Any, casefold: bool) -> Any:
+    if isinstance(value, str):
+        value = value.replace("\r\n", "\n").strip()
+        return value.lower() if casefold else value
+    return value
+
+
+def memoized_tool(tool, case_insensitive: Iterable[str] = ()):
+    """Memoize a crewai @tool per design run. Safe to call twice.
+
+    Arguments are bound to the signature (so defaults and keyword order do not
+    matter), stripped of surrounding whitespace and, for ``case_insensitive``
+    parameters, lower-cased. The tool always runs with the normalized
+    arguments, so every call with the same key yields the same result.
+    """
+    if getattr(tool, "_hailei_memoized", False):
+        return tool
+
+    inner = tool.func
+    signature = inspect.signature(inner)
+    case_insensitive = set(case_insensitive)
+
+    @functools.wraps(inner)
+    def func(*args, **kwargs):
+        cache = _run_cache.get()
+        if cache is None:
+            return inner(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {
+            name: _normalize(value, name in case_insensitive) for name, value in bound.arguments.items()
+        }
+        payload = json.dumps([tool.name, arguments, compact_tool_output()], sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return cache.call(tool.name, key, lambda: inner(**arguments))
+
+    # Tool._run calls self.func; BaseModel allows plain attribute assignment here.
+    tool.func = func
+    object.__setattr__(tool, "_hailei_memoized", True)
+    return tool
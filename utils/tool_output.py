@@ -0,0 +1,51 @@
+# utils/tool_output.py
+# Opt-in compact output mode for the tools in tools/.
+#
+# With HAILEI_COMPACT_TOOL_OUTPUT=1 the tools return minified JSON holding only
+# their computed findings and scores instead of a Markdown report with fixed
+# guidance and links, so each tool call adds far fewer tokens to the agent's
+# context. scripts/tool_output_bench.py measures the savings per tool.
+
+import contextvars
+import json
+from contextlib import contextmanager
+from typing import Any
+
+from utils.run_budget import COMPACT_CONTEXT, degraded
+from utils.settings import env_flag
+
+_forced: contextvars.ContextVar = contextvars.ContextVar("hailei_compact_tool_output", default=None)
+
+
+def compact_tool_output() -> bool:
+    """Whether tools should return compact JSON (read per call); also when the run's budget runs low."""
+    forced = _forced.get()
+    if forced is not None:
+        return forced
+    return env_flag("HAILEI_COMPACT_TOOL_OUTPUT") or degraded(COMPACT_CONTEXT)
+
+
+@contextmanager
+def compact_output(compact: bool):
+    """Fix the output mode in the enclosed block, e.g. in a worker process that cannot see the run's state."""
+    token = _forced.set(compact)
+    try:
+        yield
+    finally:
+        _forced.reset(token)
+
+
+def _prune(value: Any) -> Any:
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_prune(item) for item in value]
+    if isinstance(value, float):
+        return round(value, 1)
+    return value
+
+
+def compact_json(data: dict) -> str:
+    """Minified JSON of ``data`` without empty fields."""
+    return json.dumps(_prune(data), separators=(",", ":"), ensure_ascii=False)